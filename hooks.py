@@ -19,21 +19,38 @@ Processes source files during build:
 1. Resolve relative $ref to absolute URLs (using $id from referenced files)
 2. Rewrite all ucp.dev/schemas/ URLs to include version for proper resolution
 3. Copy to site directory based on $id path
+4. Write minified, gzipped and bundled variants of the schemas
+   (scripts/schema_artifacts.py)
+5. Record each output in site/publish-manifest.json, so a rebuild into the
+   same site (`mkdocs serve`, `--dirty`) only republishes changed files
+6. List every published schema ($id, path, sha256, size, direct $refs) in
+   site/schemas/index.json for client-side caching
+
+Environment:
+  UCP_DOCS_PUBLISH_WORKERS=N   publish worker processes (default: CPU
+                               count; 0 or 1 publishes in-process)
 
 Mike handles deployment to /{version}/ paths, so output paths exclude version
 but $id/$ref URLs include it for correct resolution after deployment.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import functools
+import hashlib
 import json
 import logging
+import os
+import pickle
 import re
 import shutil
-import os
 from datetime import date
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urldefrag, urljoin, urlparse
 from mkdocs.structure.files import Files
 
+from scripts import publish_manifest, schema_artifacts
+
 log = logging.getLogger("mkdocs")
 
 # URL prefix for UCP schemas that need version injection
@@ -42,87 +59,182 @@ UCP_SCHEMA_PREFIX = "https://ucp.dev/schemas/"
 DATE_VERSION_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 
-def _process_refs(data, current_file_dir, url_version=None):
-  """Recursively resolve relative $ref paths to absolute URLs.
+class _SourceIndex:
+  """Resolved path -> `$id` of every JSON file under a source tree.
 
-  Reads referenced file's $id to construct the absolute URL.
-  Only processes relative refs (not # fragments or http URLs).
-  """
-  if isinstance(data, dict):
-    for key, value in data.items():
-      if (
-        key == "$ref"
-        and isinstance(value, str)
-        and not value.startswith(("#", "http"))
-      ):
-        ref_parts = value.split("#", 1)
-        relative_path = ref_parts[0]
-        fragment = f"#{ref_parts[1]}" if len(ref_parts) > 1 else ""
+  Built in one pass at the start of on_post_build: each file is read
+  once, hashed, its `$id` recorded for $ref resolution and the document
+  handed to the publishing loop via take(). Targets outside the tree are
+  read on first use and remembered. Problems with a target (missing,
+  unreadable, no `$id`) are recorded once in `problems`, however many
+  $refs point at it, for the caller to log.
 
-        if not relative_path:
-          continue
+  Pickles without the parsed documents, for publish worker processes.
+  """
 
-        ref_file_path = (current_file_dir / relative_path).resolve()
+  def __init__(self, root):
+    self._ids = {}
+    self._errors = {}
+    self._docs = {}
+    self.hashes = {}
+    self.problems = {}
+    for path in root.rglob("*.json"):
+      self._index(path.resolve())
 
-        try:
-          with ref_file_path.open("r", encoding="utf-8") as f:
-            ref_data = json.load(f)
+  def __getstate__(self):
+    return {**self.__dict__, "_docs": {}}
 
-          if "$id" in ref_data:
-            ref_id = ref_data["$id"]
-            if url_version and ref_id.startswith(UCP_SCHEMA_PREFIX):
-              versioned_prefix = f"https://ucp.dev/{url_version}/schemas/"
-              ref_id = ref_id.replace(UCP_SCHEMA_PREFIX, versioned_prefix, 1)
-            data[key] = ref_id + fragment
-          else:
-            log.warning(
-              f"No '$id' found in {ref_file_path}. "
-              f"Keeping original '$ref': {value}"
-            )
-        except FileNotFoundError:
-          log.error(
-            f"Referenced file not found: {ref_file_path}. "
-            f"Keeping original '$ref': {value}"
-          )
-        except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
-          log.error(
-            f"Failed to read referenced file {ref_file_path}: {e}. "
-            f"Keeping original '$ref': {value}"
-          )
+  def _index(self, path):
+    """Read, hash and parse `path`, recording its `$id` or read error."""
+    try:
+      raw = path.read_bytes()
+      self.hashes[path] = hashlib.sha256(raw).hexdigest()
+      data = json.loads(raw.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
+      self._docs[path] = e
+      if isinstance(e, FileNotFoundError):
+        self._errors[path] = f"Referenced file not found: {path}"
       else:
-        _process_refs(value, current_file_dir, url_version)
-  elif isinstance(data, list):
-    for item in data:
-      _process_refs(item, current_file_dir, url_version)
+        self._errors[path] = f"Failed to read referenced file {path}: {e}"
+      return
+    self._docs[path] = data
+    self._ids[path] = data.get("$id") if isinstance(data, dict) else None
+
+  def fingerprint(self):
+    """Return a hash of every indexed `$id`, for the publish manifest."""
+    ids = [[str(path), value] for path, value in sorted(self._ids.items())]
+    return hashlib.sha256(json.dumps(ids).encode()).hexdigest()
+
+  def digest(self, path):
+    """Return the sha256 of an indexed file, or None if it was unreadable."""
+    return self.hashes.get(path.resolve())
+
+  def take(self, path):
+    """Return (and forget) the parsed document; raises its read error."""
+    path = path.resolve()
+    if path not in self._docs:
+      self._index(path)
+    data = self._docs.pop(path)
+    if isinstance(data, Exception):
+      raise data
+    return data
+
+  def lookup(self, ref_file_path, value):
+    """Return the `$id` for a resolved $ref target, or None.
+
+    The first failed lookup of each target is recorded in `problems` as
+    (logging level, message).
+    """
+    if ref_file_path not in self._ids and ref_file_path not in self._errors:
+      self._index(ref_file_path)
+      self._docs.pop(ref_file_path, None)
+    result = self._ids.get(ref_file_path)
+    if isinstance(result, str):
+      return result
+    if ref_file_path in self.problems:
+      return None
+    keep = f". Keeping original '$ref': {value}"
+    if ref_file_path in self._errors:
+      problem = (logging.ERROR, self._errors[ref_file_path] + keep)
+    elif result is None:
+      problem = (logging.WARNING, f"No '$id' found in {ref_file_path}{keep}")
+    else:
+      problem = (
+        logging.ERROR,
+        f"Failed to read referenced file {ref_file_path}: {result}{keep}",
+      )
+    self.problems[ref_file_path] = problem
+    return None
 
 
-def _rewrite_version_urls(data, url_version):
-  """Recursively rewrite ucp.dev/schemas/ URLs to include version.
+# --- JSON TRANSFORMS ---
+# Every source JSON document is rewritten in one traversal. A rule is a
+# function (value, doc) -> value registered for the keys whose string
+# values it rewrites; rules for the same key run in registration order,
+# each seeing the previous one's result. Document rules see the whole
+# document once. Adding a rewrite means registering a rule, not another
+# walk over the tree.
 
-  Transforms: https://ucp.dev/schemas/X
-  -> https://ucp.dev/{url_version}/schemas/X
+_RULES = {}
+_DOCUMENT_RULES = []
 
-  This ensures $id matches the deployed URL and $ref resolves correctly.
-  Applied to both $id and $ref fields.
-  """
-  versioned_prefix = f"https://ucp.dev/{url_version}/schemas/"
+# Bump when a rule's output changes, so a dirty build republishes every
+# file (registering or removing a rule already does).
+TRANSFORM_VERSION = 1
+
+
+class _Document:
+  """What rules may need to know about the document being transformed."""
+
+  def __init__(self, src_dir, ids, schema_version=None, url_version=None):
+    self.src_dir = src_dir
+    self.ids = ids
+    self.schema_version = schema_version
+    self.url_version = url_version
+    # Final $ref values, in document order (see _collect_ref).
+    self.refs = []
+
+
+def _rule(*keys):
+  """Register the decorated function as a rule for string values of `keys`."""
+
+  def register(fn):
+    for key in keys:
+      _RULES.setdefault(key, []).append(fn)
+    return fn
+
+  return register
 
-  if isinstance(data, dict):
-    for key, value in data.items():
-      if (
-        key in ("$id", "$ref")
-        and isinstance(value, str)
-        and value.startswith(UCP_SCHEMA_PREFIX)
-      ):
-        data[key] = value.replace(UCP_SCHEMA_PREFIX, versioned_prefix, 1)
-      else:
-        _rewrite_version_urls(value, url_version)
-  elif isinstance(data, list):
-    for item in data:
-      _rewrite_version_urls(item, url_version)
 
+def _document_rule(fn):
+  """Register the decorated function as a whole-document rule."""
+  _DOCUMENT_RULES.append(fn)
+  return fn
 
-def _set_schema_version(data, version):
+
+def _transform(data, doc):
+  """Apply every registered rule to `data` in place, in a single walk.
+
+  The walk is iterative and visits nodes in document order, so deep
+  schemas cannot hit the recursion limit.
+  """
+  for rule in _DOCUMENT_RULES:
+    rule(data, doc)
+  # (parent, key, value); parent is None for list items and the root.
+  stack = [(None, None, data)]
+  while stack:
+    parent, key, value = stack.pop()
+    if isinstance(value, dict):
+      stack.extend((value, k, v) for k, v in reversed(value.items()))
+    elif isinstance(value, list):
+      stack.extend((None, None, v) for v in reversed(value))
+    elif parent is not None and isinstance(value, str) and key in _RULES:
+      for rule in _RULES[key]:
+        value = rule(value, doc)
+      parent[key] = value
+
+
+@_rule("$ref")
+def _absolutize_ref(value, doc):
+  """Resolve a relative $ref path to an absolute URL.
+
+  Looks up the referenced file's $id in `doc.ids` (a _SourceIndex) to
+  construct the absolute URL. Only processes relative refs (not #
+  fragments or http URLs).
+  """
+  if value.startswith(("#", "http")):
+    return value
+  relative_path, _, fragment = value.partition("#")
+  if not relative_path:
+    return value
+  ref_id = doc.ids.lookup((doc.src_dir / relative_path).resolve(), value)
+  if ref_id is None:
+    return value
+  return ref_id + (f"#{fragment}" if "#" in value else "")
+
+
+@_document_rule
+def _set_schema_version(data, doc):
   """Set version field for named entities (capabilities, services, handlers).
 
   Named entities (schemas with top-level 'name' field) require version per
@@ -131,18 +243,248 @@ def _set_schema_version(data, version):
   Additionally, for OpenAPI and OpenRPC transport specifications, set the
   required info.version field.
   """
+  if not doc.schema_version:
+    return
   if "name" in data:
-    data["version"] = version
+    data["version"] = doc.schema_version
 
   if ("openapi" in data or "openrpc" in data) and isinstance(
     data["info"], dict
   ):
-    data["info"]["version"] = version
+    data["info"]["version"] = doc.schema_version
+
+
+@_rule("$id", "$ref")
+def _version_url(value, doc):
+  """Rewrite a ucp.dev/schemas/ URL to include the version.
+
+  Transforms: https://ucp.dev/schemas/X
+  -> https://ucp.dev/{url_version}/schemas/X
+
+  This ensures $id matches the deployed URL and $ref resolves correctly.
+  Runs after _absolutize_ref, so resolved refs are versioned too.
+  """
+  if not doc.url_version or not value.startswith(UCP_SCHEMA_PREFIX):
+    return value
+  versioned_prefix = f"https://ucp.dev/{doc.url_version}/schemas/"
+  return value.replace(UCP_SCHEMA_PREFIX, versioned_prefix, 1)
+
+
+@_rule("$ref")
+def _collect_ref(value, doc):
+  """Record the final $ref value for the schema index. Registered last."""
+  doc.refs.append(value)
+  return value
+
+
+# --- PUBLISHING ---
+# on_post_build decides which source files need publishing (see
+# scripts/publish_manifest.py) and runs _publish over them, in a process
+# pool when there are enough. Workers return their log records instead of
+# logging, so the build log is the same however the work was split.
+
+# Fewer changed files than this are published inline: starting the pool
+# costs more than it saves.
+_POOL_MIN_JOBS = 256
+
+
+def _rules_key():
+  """Return what identifies the transform's behaviour in the manifest."""
+  names = {fn.__name__ for fns in _RULES.values() for fn in fns}
+  names.update(fn.__name__ for fn in _DOCUMENT_RULES)
+  return [TRANSFORM_VERSION, *sorted(names)]
+
+
+def _write_artifacts(site_dir, output, data, raw):
+  """Write the minified and gzipped forms of a published schema.
+
+  Returns their site-relative paths mapped to their sha256.
+  """
+  derived = {}
+  for path, content in (
+    (schema_artifacts.min_path(output), schema_artifacts.minify(data)),
+    (schema_artifacts.gz_path(output), schema_artifacts.compress(raw)),
+  ):
+    (site_dir / path).write_bytes(content)
+    derived[path] = hashlib.sha256(content).hexdigest()
+  return derived
+
+
+def _write_bundles(site_dir, outputs, url_version):
+  """Write a bundle (and its .gz) for every published named entity.
+
+  Bundles are built from the published documents, so they carry the same
+  versioned $ids and $refs. Returns the outputs that were bundled.
+  """
+  prefix = "https://ucp.dev/" + (f"{url_version}/" if url_version else "")
+
+  @functools.cache
+  def load(url):
+    if not url.startswith(prefix):
+      return None
+    try:
+      path = site_dir / url.removeprefix(prefix)
+      return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+      return None
+
+  bundled = set()
+  for output in outputs:
+    data = load(prefix + output) if output.endswith(".json") else None
+    if not schema_artifacts.is_bundle_root(data):
+      continue
+    raw = schema_artifacts.minify(schema_artifacts.bundle(data, load))
+    path = schema_artifacts.bundle_path(output)
+    (site_dir / path).write_bytes(raw)
+    (site_dir / schema_artifacts.gz_path(path)).write_bytes(
+      schema_artifacts.compress(raw)
+    )
+    bundled.add(output)
+  return bundled
+
+
+def _index_entry(data, refs, raw):
+  """Return what schemas/index.json lists about a published schema.
+
+  The path and sha256 come from the manifest entry; this adds the `$id`,
+  byte size and the documents it references directly. None for JSON
+  without a `$id`.
+  """
+  if not isinstance(data, dict) or not isinstance(data.get("$id"), str):
+    return None
+  base = urldefrag(data["$id"])[0]
+  deps = {
+    urldefrag(urljoin(base, ref))[0] for ref in refs if not ref.startswith("#")
+  }
+  deps.discard(base)
+  return {"$id": data["$id"], "size": len(raw), "refs": sorted(deps)}
+
+
+def _write_schema_index(site_dir, files, bundles, url_version, artifacts):
+  """Write schemas/index.json: every published schema and its hash.
+
+  Lets clients refresh only what changed between builds and fetch a
+  schema's dependency closure (or its bundle) up front.
+  """
+  schemas = []
+  for entry in files.values():
+    meta = entry.get("meta")
+    if not meta:
+      continue
+    item = {
+      "$id": meta["$id"],
+      "path": entry["output"],
+      "sha256": entry["output_sha256"],
+      "size": meta["size"],
+      "refs": meta["refs"],
+    }
+    if entry["output"] in bundles:
+      item["bundle"] = schema_artifacts.bundle_path(entry["output"])
+    schemas.append(item)
+  schemas.sort(key=lambda item: item["$id"])
+  index = {"version": url_version, "schemas": schemas}
+  raw = (json.dumps(index, indent=2, ensure_ascii=False) + "\n").encode()
+  path = site_dir / "schemas" / "index.json"
+  path.parent.mkdir(exist_ok=True, parents=True)
+  path.write_bytes(raw)
+  if artifacts:
+    path.with_name("index.json.gz").write_bytes(schema_artifacts.compress(raw))
+  return len(schemas)
+
+
+def _publish(job, site_dir, ids, schema_version, url_version, artifacts):
+  """Publish one source file into the site.
+
+  `job` is (source file, its path relative to the source tree, output
+  path relative to site_dir, parsed JSON document or None to copy the
+  file verbatim). JSON that cannot be written is copied verbatim to the
+  source-relative path instead; JSON that is written also gets its
+  derived artifacts when `artifacts` is set. Returns the output path, its
+  sha256, the derived artifacts (path -> sha256), its schema index entry
+  (or None) and the log records as (problem key or None, level,
+  message); records with a key are logged once per build.
+  """
+  src_file, source, output, data = job
+  records = []
+  if data is not None:
+    known = set(ids.problems)
+    doc = _Document(src_file.parent, ids, schema_version, url_version)
+    _transform(data, doc)
+    records.extend(
+      (path, *problem)
+      for path, problem in ids.problems.items()
+      if path not in known
+    )
+    dest_file = site_dir / output
+    try:
+      dest_file.parent.mkdir(exist_ok=True, parents=True)
+      with dest_file.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+      records.append(
+        (
+          None,
+          logging.ERROR,
+          f"Failed to process JSON file {src_file}, copying as-is: {e}",
+        )
+      )
+      # Fallback to copying if processing fails
+      output = source
+    else:
+      records.append(
+        (None, logging.INFO, f"Processed and copied {src_file} to {dest_file}")
+      )
+      raw = dest_file.read_bytes()
+      derived = {}
+      if artifacts:
+        derived = _write_artifacts(site_dir, output, data, raw)
+      meta = _index_entry(data, doc.refs, raw)
+      return output, hashlib.sha256(raw).hexdigest(), derived, meta, records
+  dest_file = site_dir / output
+  dest_file.parent.mkdir(exist_ok=True, parents=True)
+  shutil.copy2(src_file, dest_file)
+  records.append((None, logging.INFO, f"Copied {src_file} to {dest_file}"))
+  return output, publish_manifest.sha256_file(dest_file), {}, None, records
+
+
+def _publish_all(publish, jobs):
+  """Return publish(job) for every job, in order."""
+  workers = int(os.environ.get("UCP_DOCS_PUBLISH_WORKERS", os.cpu_count() or 1))
+  if workers > 1 and len(jobs) >= _POOL_MIN_JOBS:
+    try:
+      with ProcessPoolExecutor(workers) as pool:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(pool.map(publish, jobs, chunksize=chunksize))
+    except (BrokenProcessPool, pickle.PicklingError, OSError) as e:
+      log.info("Publishing in-process (worker pool unavailable: %s)", e)
+  return [publish(job) for job in jobs]
+
+
+class _Settings:
+  """Build settings from the environment, resolved once per build."""
+
+  def __init__(self):
+    self.mode = os.environ.get("DOCS_MODE", "root")
+    self.site_url = os.environ.get("SITE_URL", "https://ucp.dev/")
+    # Base path for links (e.g. / or /ucp/)
+    self.base_path = urlparse(self.site_url).path
+    if not self.base_path.endswith("/"):
+      self.base_path += "/"
+
+
+_settings = None
+
+
+def _current_settings():
+  """Return the settings resolved by on_config (or resolve them now)."""
+  return _settings or _Settings()
 
 
 def on_config(config):
   """Adjust configuration based on DOCS_MODE."""
-  mode = os.environ.get("DOCS_MODE", "root")
+  global _settings
+  _settings = _Settings()
+  mode = _settings.mode
 
   # Update site_url from environment if set (e.g. for forks/CI)
   # This ensures plugins like mkdocs-site-urls use the correct base URL.
@@ -158,12 +500,9 @@ def on_config(config):
         f"Updated site_url to {config['site_url']} based on SITE_URL env var"
       )
 
-  # Calculate base path for links (e.g. / or /ucp/)
-  # Do not use config.get("site_url") as mike appends the version directory
-  site_url = os.environ.get("SITE_URL", "https://ucp.dev/")
-  base_path = urlparse(site_url).path
-  if not base_path.endswith("/"):
-    base_path += "/"
+  # Do not use config.get("site_url") for links as mike appends the
+  # version directory
+  base_path = _settings.base_path
 
   # --- Adjust Nav (Config Phase) ---
   # Modifying config['nav'] prevents validation errors for missing files.
@@ -252,7 +591,7 @@ def on_config(config):
 
 def on_files(files, config):
   """Filter files based on DOCS_MODE (spec or root)."""
-  mode = os.environ.get("DOCS_MODE", "root")
+  mode = _current_settings().mode
   new_files = []
   for f in files:
     if mode == "spec":
@@ -270,74 +609,46 @@ def on_files(files, config):
   return Files(new_files)
 
 
-def on_page_markdown(markdown, page, config, files):
-  """Rewrite links to excluded pages (e.g. spec in root mode)."""
-  mode = os.environ.get("DOCS_MODE", "root")
-
-  if mode == "root":
-    # Rewrite relative links to specification/ to absolute URLs
-    # pointing to latest spec.
-    site_url = os.environ.get("SITE_URL", "https://ucp.dev/")
-    base_path = urlparse(site_url).path
-    if not base_path.endswith("/"):
-      base_path += "/"
-
-    target_base = f"{base_path}latest/specification/"
-
-    def replace_link(match):
-      path = match.group(1)
-      if path.endswith("index.md"):
-        path = path[:-8]
-      elif path.endswith(".md"):
-        path = path[:-3] + "/"
-      return f"({target_base}{path})"
-
-    # Pattern matches: (  prefix  specification/  path  )
-    # We capture the path AFTER specification/
-    # Matches: (../specification/foo.md) or (specification/foo.md)
-    pattern = r"\((?:(?:\.\./)+|\./)?specification/([^)]+)\)"
-
-    markdown = re.sub(pattern, replace_link, markdown)
+# Relative links from root pages to pages and assets the root site does
+# not build: (../specification/foo.md) and "../assets/foo.png".
+_EXCLUDED_LINK = re.compile(
+  r"\((?:(?:\.\./)+|\./)?specification/(?P<spec>[^)]+)\)"
+  r"|\"(?:(?:\.\./)+|\./)?assets/(?P<asset>[^)\"]+)\""
+)
 
-    # Rewrite relative links to assets/ to absolute URLs
-    # pointing to served assets folder.
-    markdown = _root_pages_asset_link_rewrite(markdown, base_path)
 
-  return markdown
-
-
-def _root_pages_asset_link_rewrite(markdown, base_path):
-  """Rewrite asset references in the root/overview to absolute links.
-
-  Uses regex to find and replace asset links with root based links.
-  """
-  # Targeting the assets
-  target_base = f"{base_path}assets/"
-
-  def replace_link(match):
-    path = match.group(1)
+def on_page_markdown(markdown, page, config, files):
+  """Rewrite links to excluded pages (e.g. spec in root mode)."""
+  settings = _current_settings()
+  if settings.mode != "root":
+    return markdown
+  if "specification/" not in markdown and "assets/" not in markdown:
+    return markdown
+  return _EXCLUDED_LINK.sub(
+    functools.partial(_rewrite_excluded_link, settings), markdown
+  )
+
+
+def _rewrite_excluded_link(settings, match):
+  """Point a relative spec or asset link at where the spec site serves it."""
+  path = match.group("spec")
+  if path is None:
     # Including quotes back into the rendered new URL
-    output = f'"{target_base}{path}"'
-    return output
-
-  # Pattern matches: (  prefix  assets/  path  )
-  # We capture the path AFTER assets/
-  # Matches: (../assets/foo.img) or (assets/foo.img) excluding quotes
-  pattern = r"\"(?:(?:\.\./)+|\./)?assets/([^)\"]+)\""
-  markdown = re.sub(pattern, replace_link, markdown)
-
-  return markdown
+    return f'"{settings.base_path}assets/{match.group("asset")}"'
+  if path.endswith("index.md"):
+    path = path[:-8]
+  elif path.endswith(".md"):
+    path = path[:-3] + "/"
+  return f"({settings.base_path}latest/specification/{path})"
 
 
 def on_post_build(config):
   """Copy and process source files into the site directory."""
   # --- Redirects for excluded pages (Spec Mode) ---
-  mode = os.environ.get("DOCS_MODE", "root")
+  settings = _current_settings()
+  mode = settings.mode
   if mode == "spec":
-    site_url = os.environ.get("SITE_URL", "https://ucp.dev/")
-    base_path = urlparse(site_url).path
-    if not base_path.endswith("/"):
-      base_path += "/"
+    base_path = settings.base_path
 
     docs_dir = Path(config["docs_dir"])
     site_dir = Path(config["site_dir"])
@@ -401,57 +712,94 @@ def on_post_build(config):
     log.warning("Source directory not found: %s", base_src_path)
     return
 
+  # Every source JSON file, parsed once up front; $refs resolve against
+  # the recorded $ids instead of re-reading their targets.
+  ids = _SourceIndex(base_src_path)
+
+  site_dir = Path(config["site_dir"])
+  artifacts = schema_artifacts.enabled()
+  manifest = publish_manifest.Manifest.load(
+    site_dir,
+    {
+      "rules": _rules_key(),
+      "schema_version": schema_version,
+      "url_version": url_version,
+      "ids": ids.fingerprint(),
+      "artifacts": artifacts,
+    },
+  )
+
+  jobs = []
+  digests = []
   for src_file in base_src_path.rglob("*"):
     if not src_file.is_file():
       continue
     rel_path = src_file.relative_to(base_src_path).as_posix()
+    is_json = src_file.name.endswith(".json")
 
-    if not src_file.name.endswith(".json"):
-      dest_file = Path(config["site_dir"]) / rel_path
-      dest_dir = dest_file.parent
-      dest_dir.mkdir(exist_ok=True, parents=True)
-      shutil.copy2(src_file, dest_file)
-      log.info("Copied %s to %s", src_file, dest_file)
+    if is_json:
+      digest = ids.digest(src_file)
+    else:
+      digest = publish_manifest.sha256_file(src_file)
+    if digest is not None and manifest.fresh(rel_path, digest):
       continue
+    digests.append(digest)
 
-    # Process JSON files
-    try:
-      with src_file.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-      # Determine output path from ORIGINAL $id (before version rewrite).
-      # Mike deploys site/ to /{version}/, so we exclude version from path.
-      file_id = data.get("$id")
-      if file_id and file_id.startswith("https://ucp.dev"):
-        file_rel_path = file_id.removeprefix("https://ucp.dev").lstrip("/")
-      else:
-        file_rel_path = rel_path
-
-      # Step 1: Resolve relative $ref to absolute URLs
-      _process_refs(data, src_file.parent)
-
-      # Step 2: Inject version field for named entities
-      if schema_version:
-        _set_schema_version(data, schema_version)
-
-      # Step 3: Rewrite URLs to include version
-      if url_version:
-        _rewrite_version_urls(data, url_version)
-
-      dest_file = Path(config["site_dir"]) / file_rel_path
-      dest_dir = dest_file.parent
-
-      dest_dir.mkdir(exist_ok=True, parents=True)
-      with dest_file.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-      log.info("Processed and copied %s to %s", src_file, dest_file)
+    if not is_json:
+      jobs.append((src_file, rel_path, rel_path, None))
+      continue
 
+    try:
+      data = ids.take(src_file)
     except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
       log.error(
         "Failed to process JSON file %s, copying as-is: %s", src_file, e
       )
       # Fallback to copying if processing fails
-      dest_file = Path(config["site_dir"]) / rel_path
-      dest_dir = dest_file.parent
-      dest_dir.mkdir(exist_ok=True, parents=True)
-      shutil.copy2(src_file, dest_file)
+      jobs.append((src_file, rel_path, rel_path, None))
+      continue
+
+    # Determine output path from ORIGINAL $id (before version rewrite).
+    # Mike deploys site/ to /{version}/, so we exclude version from path.
+    file_id = data.get("$id")
+    if file_id and file_id.startswith("https://ucp.dev"):
+      file_rel_path = file_id.removeprefix("https://ucp.dev").lstrip("/")
+    else:
+      file_rel_path = rel_path
+    jobs.append((src_file, rel_path, file_rel_path, data))
+
+  # Resolve relative $refs, inject the version field for named entities
+  # and version ucp.dev URLs, then write each file out.
+  publish = functools.partial(
+    _publish,
+    site_dir=site_dir,
+    ids=ids,
+    schema_version=schema_version,
+    url_version=url_version,
+    artifacts=artifacts,
+  )
+  logged = set()
+  for job, digest, (output, output_digest, derived, meta, records) in zip(
+    jobs, digests, _publish_all(publish, jobs), strict=True
+  ):
+    for key, level, message in records:
+      if key is None or key not in logged:
+        logged.add(key)
+        log.log(level, message)
+    if digest is not None:
+      manifest.record(job[1], digest, output, output_digest, derived, meta)
+  manifest.write()
+  log.info(
+    "Published %d changed source file(s); %d unchanged",
+    len(jobs),
+    len(manifest.files) - len(jobs),
+  )
+  bundles = set()
+  if artifacts:
+    outputs = [entry["output"] for entry in manifest.files.values()]
+    bundles = _write_bundles(site_dir, outputs, url_version)
+    log.info("Wrote %d bundled schema(s)", len(bundles))
+  count = _write_schema_index(
+    site_dir, manifest.files, bundles, url_version, artifacts
+  )
+  log.info("Indexed %d schema(s) in schemas/index.json", count)
@@ -20,10 +20,35 @@ to automatically generate Markdown tables for API request and response
 bodies.
 """
 
+import ast
+from collections.abc import Callable, Hashable
+from concurrent.futures import (
+  FIRST_COMPLETED,
+  Future,
+  ThreadPoolExecutor,
+  as_completed,
+  wait,
+)
+import contextlib
+import functools
+import hashlib
 import json
-import subprocess
+import logging
+import os
 from pathlib import Path
-from typing import Any
+import re
+import threading
+from typing import Any, NamedTuple
+
+from scripts import (
+  build_profile,
+  schema_cache,
+  schema_resolver,
+  schema_table,
+  ucp_schema_pool,
+)
+
+log = logging.getLogger("mkdocs")
 
 # --- CONFIGURATION ---
 # Base directories for schema resolution
@@ -35,9 +60,15 @@ COMMON_TYPES_DIR = COMMON_SCHEMAS_DIR / "types"
 UCP_SCHEMA_PATH = SCHEMAS_DIR / "ucp.json"
 
 
+# Retained for call sites that reference shopping specifically (e.g.
+# auto_generate_schema_reference default, create_link redirect logic).
+SHOPPING_SCHEMAS_DIR = SCHEMAS_DIR / "shopping"
+SHOPPING_TYPES_DIR = SHOPPING_SCHEMAS_DIR / "types"
+
+
 # common/ is the protocol namespace; every other immediate subdir of
-# source/schemas/ is a vertical. Discovered at module load so adding a
-# vertical requires zero config changes here.
+# source/schemas/ is a vertical. Discovered on first use (see
+# schema_layout) so adding a vertical requires zero config changes here.
 def _discover_vertical_dirs() -> list[Path]:
   if not SCHEMAS_DIR.exists():
     return []
@@ -46,25 +77,7 @@ def _discover_vertical_dirs() -> list[Path]:
   )
 
 
-VERTICAL_DIRS = _discover_vertical_dirs()
-VERTICAL_TYPES_DIRS = [
-  v / "types" for v in VERTICAL_DIRS if (v / "types").exists()
-]
-# Retained for call sites that reference shopping specifically (e.g.
-# auto_generate_schema_reference default, create_link redirect logic).
-SHOPPING_SCHEMAS_DIR = SCHEMAS_DIR / "shopping"
-SHOPPING_TYPES_DIR = SHOPPING_SCHEMAS_DIR / "types"
-SCHEMAS_DIRS = [
-  HANDLERS_GOOGLE_PAY_DIR,
-  SCHEMAS_DIR,
-  COMMON_SCHEMAS_DIR,
-  COMMON_TYPES_DIR,
-  *VERTICAL_DIRS,
-  *VERTICAL_TYPES_DIRS,
-]
-
-
-def _validate_common_namespace_exclusivity() -> None:
+def _validate_common_namespace_exclusivity(vertical_dirs: list[Path]) -> None:
   """Fail fast if any vertical schema shadows a common-namespace filename.
 
   The docs macro system resolves schemas by basename across SCHEMAS_DIRS
@@ -82,7 +95,7 @@ def _validate_common_namespace_exclusivity() -> None:
     for p in d.glob("*.json"):
       common_names[p.name] = p
 
-  for v in VERTICAL_DIRS:
+  for v in vertical_dirs:
     for sub in (v, v / "types"):
       if not sub.exists():
         continue
@@ -99,24 +112,565 @@ def _validate_common_namespace_exclusivity() -> None:
           )
 
 
-_validate_common_namespace_exclusivity()
+class SchemaLayout(NamedTuple):
+  """The schema directories, as discovered for one tree fingerprint."""
+
+  fingerprint: str
+  vertical_dirs: list[Path]
+  vertical_types_dirs: list[Path]
+  schemas_dirs: list[Path]
+
+
+def _layout_fingerprint() -> str:
+  """Hash of the names and mtimes of every directory discovery reads.
+
+  A directory's mtime moves when entries are added, removed or renamed
+  in it, which is all discovery and the shadowing check depend on.
+  """
+  dirs = [SCHEMAS_DIR]
+  if SCHEMAS_DIR.is_dir():
+    for sub in sorted(SCHEMAS_DIR.iterdir()):
+      if sub.is_dir():
+        dirs += [sub, sub / "types"]
+  entries = []
+  for d in dirs:
+    try:
+      entries.append((d.as_posix(), d.stat().st_mtime_ns))
+    except OSError:
+      entries.append((d.as_posix(), None))
+  return hashlib.sha256(json.dumps(entries).encode()).hexdigest()
+
+
+_layout: SchemaLayout | None = None
+
+
+def schema_layout() -> SchemaLayout:
+  """Return the schema directory layout, discovering it on first use.
+
+  Re-discovered whenever the tree's fingerprint changes. The shadowing
+  check runs only for fingerprints not validated before: in this process,
+  or by an earlier build when the disk cache is enabled (recorded in
+  _layout_store, kept apart from the resolve cache).
+  """
+  global _layout
+  fingerprint = _layout_fingerprint()
+  if _layout is not None and _layout.fingerprint == fingerprint:
+    return _layout
+
+  vertical_dirs = _discover_vertical_dirs()
+  if _layout_store is None or _layout_store.get(fingerprint) is None:
+    _validate_common_namespace_exclusivity(vertical_dirs)
+    if _layout_store is not None:
+      _layout_store.put(fingerprint, {"validated": True})
+
+  vertical_types_dirs = [
+    v / "types" for v in vertical_dirs if (v / "types").exists()
+  ]
+  _layout = SchemaLayout(
+    fingerprint,
+    vertical_dirs,
+    vertical_types_dirs,
+    [
+      HANDLERS_GOOGLE_PAY_DIR,
+      SCHEMAS_DIR,
+      COMMON_SCHEMAS_DIR,
+      COMMON_TYPES_DIR,
+      *vertical_dirs,
+      *vertical_types_dirs,
+    ],
+  )
+  return _layout
+
+
+_LAYOUT_ATTRIBUTES = {
+  "VERTICAL_DIRS": "vertical_dirs",
+  "VERTICAL_TYPES_DIRS": "vertical_types_dirs",
+  "SCHEMAS_DIRS": "schemas_dirs",
+}
+
+
+def __getattr__(name: str) -> Any:
+  """Serve the layout-derived constants without discovery at import."""
+  if name in _LAYOUT_ATTRIBUTES:
+    return getattr(schema_layout(), _LAYOUT_ATTRIBUTES[name])
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Cache for resolved schemas to avoid repeated subprocess calls
-_resolved_schema_cache: dict[str, dict] = {}
+# Keyed by (schema path, direction, operation, bundle). Plain dict reads and
+# writes are atomic; misses go through _resolve_flight.
+_resolved_schema_cache: dict[tuple[str, str, str, bool], dict] = {}
+
+# Persistent cache shared across builds (mkdocs build, mike deploy, serve
+# restarts). None when disabled via UCP_SCHEMA_CACHE=0.
+_disk_cache = schema_cache.from_env()
+
+# Fingerprints of schema layouts that passed the shadowing check (see
+# schema_layout), in a store of their own next to the resolve cache.
+_layout_store = (
+  None
+  if _disk_cache is None
+  else schema_cache.SchemaCache(
+    _disk_cache.root.with_name(f"{_disk_cache.root.name}-layout"), 1024 * 1024
+  )
+)
 
+# Build instrumentation; None (and nothing wrapped) unless UCP_DOCS_PROFILE
+# is set. See scripts/build_profile.py.
+_profile = build_profile.from_env()
 
-# --- HELPER FUNCTIONS ---
-# These are thin wrappers; actual schema resolution is done by ucp-schema CLI.
 
+# --- CONCURRENCY ---
+class SingleFlight:
+  """Run each key's computation once, however many threads ask at once.
 
-def _load_json(path: str | Path) -> dict[str, Any] | None:
-  """Load JSON file, returns None on error."""
-  try:
-    with Path(path).open(encoding="utf-8") as f:
-      return json.load(f)
-  except (json.JSONDecodeError, OSError):
-    return None
+  The first caller for a key computes it; callers arriving while it runs
+  wait for and share its result (or exception). Callers check their own
+  cache first: once the computation finishes the key is forgotten.
+  """
+
+  def __init__(self) -> None:
+    """Initialize with nothing in flight."""
+    self._lock = threading.Lock()
+    self._calls: dict[Hashable, Future] = {}
+
+  def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+    """Return fn(), or the result of the in-flight call for `key`."""
+    with self._lock:
+      future = self._calls.get(key)
+      owner = future is None
+      if owner:
+        future = self._calls[key] = Future()
+    if not owner:
+      return future.result()
+    try:
+      result = fn()
+    except BaseException as e:
+      future.set_exception(e)
+      raise
+    else:
+      future.set_result(result)
+      return result
+    finally:
+      with self._lock:
+        del self._calls[key]
+
+
+# --- SCHEMA REGISTRY ---
+class SchemaRegistry:
+  """Entity name -> schema path -> parsed document, built once per build.
+
+  Entity names resolve exactly as a first-match probe of each directory
+  in order would ('buyer', 'types/buyer', '../common/types/buyer'), but
+  plain basenames come from a directory index built up front and every
+  other name is probed once and remembered. Parsed documents are cached
+  per path and re-read only when the file's mtime changes, so
+  `mkdocs serve` picks up edits; refresh() re-indexes when a directory
+  itself changes (files added, removed or renamed).
+
+  `generation` increases when the index changes or a document is found
+  changed mid-build, so caches derived from schema content (rendered
+  tables, resolved variants) know to drop every entry. Edits between
+  builds are handled more precisely by the DependencyGraph.
+
+  Documents are shared between callers and must not be mutated. Lookups
+  are safe from any thread; concurrent first reads of a file parse it once.
+  """
+
+  def __init__(self, dirs: list[Path]) -> None:
+    """Index the *.json files directly under each of `dirs`."""
+    self.dirs = [Path(d) for d in dirs]
+    self._dir_mtimes: list[int | None] = []
+    self._paths: dict[str, Path | None] = {}
+    self._docs: dict[Path, tuple[int, Any]] = {}
+    self._lock = threading.Lock()
+    self._parses = SingleFlight()
+    self.generation = 0
+    self.bytes_parsed = 0
+    self._index()
+
+  def _snapshot(self) -> list[int | None]:
+    mtimes = []
+    for d in self.dirs:
+      try:
+        mtimes.append(d.stat().st_mtime_ns)
+      except OSError:
+        mtimes.append(None)
+    return mtimes
+
+  def _index(self) -> None:
+    self._dir_mtimes = self._snapshot()
+    self._paths = {}
+    for d in self.dirs:
+      if not d.is_dir():
+        continue
+      for path in sorted(d.glob("*.json")):
+        self._paths.setdefault(path.stem, path)
+
+  def refresh(self) -> bool:
+    """Pick up changes on disk since the last build.
+
+    Drops parses whose file changed or disappeared, and re-indexes if any
+    schema directory changed. Returns True (and bumps `generation`) only
+    for the latter: which files were added or removed is unknown, so
+    derived caches must be dropped wholesale.
+    """
+    with self._lock:
+      for path, (mtime, _) in list(self._docs.items()):
+        if not path.exists() or path.stat().st_mtime_ns != mtime:
+          del self._docs[path]
+      if self._snapshot() == self._dir_mtimes:
+        return False
+      self._index()
+      self.generation += 1
+      return True
+
+  def find(self, entity_name: str) -> Path | None:
+    """Return the first directory's `<entity_name>.json`, if any."""
+    if entity_name in self._paths:
+      return self._paths[entity_name]
+    path = None
+    if "/" in entity_name:
+      for d in self.dirs:
+        candidate = d / (entity_name + ".json")
+        if candidate.is_file():
+          path = candidate
+          break
+    with self._lock:
+      self._paths[entity_name] = path
+    return path
+
+  def document(self, path: str | Path) -> Any:
+    """Parse `path`, reusing the cached parse while its mtime is unchanged.
+
+    Raises FileNotFoundError / json.JSONDecodeError like open + json.load.
+    """
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+    cached = self._docs.get(path)
+    if cached is None or cached[0] != mtime:
+      cached = self._parses.do((path, mtime), lambda: self._parse(path, mtime))
+    _deps.record(path, mtime)
+    return cached[1]
+
+  def _parse(self, path: Path, mtime: int) -> tuple[int, Any]:
+    raw = path.read_bytes()
+    data = json.loads(raw)
+    with self._lock:
+      previous = self._docs.get(path)
+      if previous is not None and previous[0] != mtime:
+        self.generation += 1
+      self.bytes_parsed += len(raw)
+      self._docs[path] = (mtime, data)
+    return mtime, data
+
+  def load(self, entity_name: str) -> Any:
+    """Return the parsed document for an entity name (None if no match)."""
+    path = self.find(entity_name)
+    if path is None:
+      return None
+    try:
+      return self.document(path)
+    except FileNotFoundError:
+      return None
+
+
+_registry: SchemaRegistry | None = None
+
+
+def _schemas(layout: SchemaLayout | None = None) -> SchemaRegistry:
+  """Return the process-wide SchemaRegistry over SCHEMAS_DIRS.
+
+  Passing the current `layout` rebuilds the registry if its directories
+  changed (a vertical was added or removed).
+  """
+  global _registry
+  if _registry is None:
+    _registry = SchemaRegistry((layout or schema_layout()).schemas_dirs)
+  elif layout is not None and _registry.dirs != layout.schemas_dirs:
+    generation = _registry.generation
+    _registry = SchemaRegistry(layout.schemas_dirs)
+    _registry.generation = generation + 1
+  return _registry
+
+
+# --- DEPENDENCIES ---
+class DependencyGraph:
+  """Which schema files each page, and each cached entry, was built from.
+
+  Every registry read and every _resolve_schema call records the file(s)
+  involved — for resolves, the schema's whole relative-$ref closure, since
+  the resolver reads all of it. Records go to every collector active on
+  the current thread: one per page (on_pre/on_post_page_macros) and one
+  per table being rendered, so cached tables carry their own dependency
+  sets.
+
+  The mtime of every recorded file is remembered. On the next build,
+  changed() reports the files edited since, and define_env evicts only
+  the cache entries built from them.
+  """
+
+  def __init__(self) -> None:
+    """Initialize an empty graph."""
+    self.pages: dict[str, frozenset[str]] = {}
+    self._mtimes: dict[str, int | None] = {}
+    self._closures: dict[str, frozenset[str]] = {}
+    self._lock = threading.Lock()
+    self._local = threading.local()
+
+  @staticmethod
+  def _key(path: str | Path) -> str:
+    return os.path.realpath(path)
+
+  def _active(self) -> list[set[str]]:
+    if not hasattr(self._local, "stack"):
+      self._local.stack = []
+    return self._local.stack
+
+  def closure(self, path: str | Path) -> frozenset[str]:
+    """`path` plus every file it reaches through relative $refs."""
+    key = self._key(path)
+    closure = self._closures.get(key)
+    if closure is None:
+      closure = frozenset(
+        self._key(p) for p in schema_cache.ref_closure(path)
+      ) | {key}
+      for member in closure:
+        self._remember(member)
+      with self._lock:
+        self._closures[key] = closure
+    return closure
+
+  def _remember(self, key: str, mtime: int | None = None) -> None:
+    if key in self._mtimes:
+      return
+    if mtime is None:
+      try:
+        mtime = Path(key).stat().st_mtime_ns
+      except OSError:
+        mtime = None
+    with self._lock:
+      self._mtimes.setdefault(key, mtime)
+
+  def record(self, path: str | Path, mtime: int | None = None) -> None:
+    """Record a read of the single file `path`."""
+    key = self._key(path)
+    self._remember(key, mtime)
+    for deps in self._active():
+      deps.add(key)
+
+  def record_closure(self, path: str | Path) -> None:
+    """Record a read of `path` and its $ref closure (a schema resolve)."""
+    closure = self.closure(path)
+    for deps in self._active():
+      deps.update(closure)
+
+  def record_all(self, keys: frozenset[str]) -> None:
+    """Record a previously collected dependency set (a cache hit)."""
+    for deps in self._active():
+      deps.update(keys)
+
+  def begin(self) -> set[str]:
+    """Start collecting on this thread; returns the set being filled."""
+    deps: set[str] = set()
+    self._active().append(deps)
+    return deps
+
+  def end(self, deps: set[str]) -> frozenset[str]:
+    """Stop collecting into `deps` (as returned by begin())."""
+    stack = self._active()
+    # Match by identity: nested collectors are often equal (both empty, or
+    # both holding the same files) and `list.remove` would drop the outer.
+    for i in range(len(stack) - 1, -1, -1):
+      if stack[i] is deps:
+        del stack[i]
+        break
+    return frozenset(deps)
+
+  @contextlib.contextmanager
+  def collect(self):
+    """Collect the files read inside the block into the yielded set."""
+    deps = self.begin()
+    try:
+      yield deps
+    finally:
+      self.end(deps)
+
+  def changed(self) -> set[str]:
+    """Files whose mtime moved since they were recorded (then re-baseline).
+
+    Closures that contain a changed file are forgotten, as the edit may
+    have added or removed $refs.
+    """
+    changed = set()
+    with self._lock:
+      for key, mtime in self._mtimes.items():
+        try:
+          current = Path(key).stat().st_mtime_ns
+        except OSError:
+          current = None
+        if current != mtime:
+          changed.add(key)
+          self._mtimes[key] = current
+      if changed:
+        self._closures = {
+          key: closure
+          for key, closure in self._closures.items()
+          if not closure & changed
+        }
+    return changed
+
+  def affected_pages(self, changed: set[str]) -> list[str]:
+    """Pages whose recorded dependencies include a changed file."""
+    return sorted(page for page, deps in self.pages.items() if deps & changed)
+
+
+_deps = DependencyGraph()
+_page_deps: dict[str, set[str]] = {}
+
+
+def _invalidate(changed: set[str]) -> None:
+  """Evict the cache entries built from `changed` files."""
+  for key in list(_resolved_schema_cache):
+    if _deps.closure(key[0]) & changed:
+      del _resolved_schema_cache[key]
+  evicted = _render_cache.evict(changed)
+  pages = _deps.affected_pages(changed)
+  log.info(
+    f"{len(changed)} schema file(s) changed; evicted {evicted} cached"
+    f" table(s); affected pages: {', '.join(pages) or 'none'}"
+  )
+
+
+# --- RENDER CACHE ---
+class RenderCache:
+  """Memoized schema_table.Tables from _table_from_schema.
+
+  The same types (line_item, buyer, totals, ...) are rendered on the
+  capability pages, the transport pages and again in the reference. A
+  table depends only on the schema it is given, the renderer arguments
+  and the schema files it loads along the way, so entries are keyed by a
+  hash of the former and stored with the set of the latter: evict() drops
+  entries built from changed files, and everything is dropped whenever
+  the registry's generation moves. Safe to use from any thread.
+  """
+
+  def __init__(self) -> None:
+    """Initialize an empty cache."""
+    self._tables: dict[str, tuple[schema_table.Table, frozenset[str]]] = {}
+    self._lock = threading.Lock()
+    self._generation = -1
+    self.hits = 0
+    self.misses = 0
+
+  @staticmethod
+  def key(
+    schema_data: Any,
+    spec_file_name: str,
+    need_header: bool,
+    parent_required_list: list | None,
+    context: dict | None,
+  ) -> str:
+    """Stable hash of every renderer input that can change the output."""
+    variant = None
+    if context is not None:
+      # operation_id only matters through the ucp-schema op it selects.
+      io_type = context.get("io_type")
+      op_id = context.get("operation_id") or ""
+      variant = [io_type, _variant_operation(io_type, op_id)]
+    payload = json.dumps(
+      [
+        schema_data,
+        spec_file_name,
+        need_header,
+        parent_required_list,
+        variant,
+      ],
+      default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+  def _check_generation(self) -> None:
+    generation = _schemas().generation
+    if generation != self._generation:
+      self._tables.clear()
+      self._generation = generation
+
+  def get(self, key: str) -> schema_table.Table | None:
+    """Return the cached table for `key`, counting the hit or miss.
+
+    A hit records the entry's dependencies as if it had been rendered.
+    """
+    with self._lock:
+      self._check_generation()
+      entry = self._tables.get(key)
+      if entry is None:
+        self.misses += 1
+        return None
+      self.hits += 1
+    _deps.record_all(entry[1])
+    return entry[0]
+
+  def put(self, key: str, table: schema_table.Table, deps: set[str]) -> None:
+    """Store a built table with the files it was built from."""
+    with self._lock:
+      self._check_generation()
+      self._tables[key] = (table, frozenset(deps))
+
+  def evict(self, changed: set[str]) -> int:
+    """Drop entries built from any of `changed`; return how many."""
+    with self._lock:
+      stale = [k for k, (_, deps) in self._tables.items() if deps & changed]
+      for key in stale:
+        del self._tables[key]
+    return len(stale)
+
+
+_render_cache = RenderCache()
+
+
+def on_pre_page_macros(env):
+  """Start recording the page's schema dependencies (and timing it)."""
+  page = env.page.file.src_path
+  _page_deps[page] = _deps.begin()
+  if _profile:
+    _profile.page_start(page)
+
+
+def on_post_page_macros(env):
+  """Store the page's schema dependencies (and stop timing it)."""
+  page = env.page.file.src_path
+  if _profile:
+    _profile.page_end(page)
+  deps = _page_deps.pop(page, None)
+  if deps is not None:
+    _deps.pages[page] = _deps.end(deps)
+
+
+def on_post_build(env):
+  """Report cache effectiveness, and the build profile if enabled."""
+  log.debug(
+    f"Table render cache: {_render_cache.hits} hits,"
+    f" {_render_cache.misses} misses"
+  )
+  if not _profile:
+    return
+  pool = ucp_schema_pool.default_pool()
+  _profile.set_counter("render_cache.hits", _render_cache.hits)
+  _profile.set_counter("render_cache.misses", _render_cache.misses)
+  _profile.set_counter("subprocess.spawned", pool.spawned)
+  _profile.set_counter("subprocess.requests", pool.requests)
+  _profile.set_counter(
+    "json_bytes_parsed", _schemas().bytes_parsed + pool.bytes_received
+  )
+  path = _profile.write()
+  for line in _profile.summary():
+    log.info(line)
+  log.info(f"Build profile written to {path}")
+
+
+# --- HELPER FUNCTIONS ---
+# These are thin wrappers; actual schema resolution is done by ucp-schema CLI.
 
 
 def _resolve_json_pointer(pointer: str, data: Any) -> Any | None:
@@ -150,13 +704,52 @@ def _resolve_json_pointer(pointer: str, data: Any) -> Any | None:
   return current
 
 
+# ucp.json is consulted for nearly every property row the renderer emits
+# (inline $defs expansion, the version special case). Its parse comes from
+# the registry; the index below is rebuilt only when that parse changes.
+_ucp_defs_index: tuple[Any, dict[str, dict]] | None = None
+
+
+def _ucp_defs() -> dict[str, dict]:
+  """$defs of ucp.json, with allOf members' local $refs already merged in.
+
+  Returns an empty dict if ucp.json cannot be read or parsed.
+  """
+  global _ucp_defs_index
+  try:
+    data = _schemas().document(UCP_SCHEMA_PATH)
+  except OSError:
+    return {}
+  except json.JSONDecodeError as e:
+    log.warning(f"Error loading schema {UCP_SCHEMA_PATH}: {e}")
+    return {}
+  if _ucp_defs_index is None or _ucp_defs_index[0] is not data:
+    defs = {}
+    for name, schema in data.get("$defs", {}).items():
+      if isinstance(schema, dict) and "allOf" in schema:
+        all_of = []
+        for item in schema["allOf"]:
+          ref = item.get("$ref", "") if isinstance(item, dict) else ""
+          resolved = (
+            _resolve_json_pointer(ref, data) if ref.startswith("#/") else None
+          )
+          all_of.append(resolved if resolved else item)
+        schema = {**schema, "allOf": all_of}
+      defs[name] = schema
+    _ucp_defs_index = (data, defs)
+  return _ucp_defs_index[1]
+
+
+_resolve_flight = SingleFlight()
+
+
 def _resolve_schema(
   schema_path: str | Path,
   direction: str = "response",
   operation: str = "read",
   bundle: bool = False,
 ) -> dict[str, Any] | None:
-  """Resolve a schema using ucp-schema CLI.
+  """Resolve a schema using ucp-schema CLI (or the in-process resolver).
 
   Args:
     schema_path: Path to the schema file.
@@ -169,35 +762,75 @@ def _resolve_schema(
     Resolved schema as dict, or raises RuntimeError if ucp-schema fails.
 
   """
-  bundle_suffix = ":bundled" if bundle else ""
-  cache_key = f"{schema_path}:{direction}:{operation}{bundle_suffix}"
-  if cache_key in _resolved_schema_cache:
-    return _resolved_schema_cache[cache_key]
-
-  dir_flag = "--request" if direction == "request" else "--response"
-  cmd = [
-    "ucp-schema",
-    "resolve",
-    str(schema_path),
-    dir_flag,
-    "--op",
-    operation,
-  ]
-  if bundle:
-    cmd.append("--bundle")
-
-  result = subprocess.run(
-    cmd,
-    capture_output=True,
-    text=True,
-    check=False,
+  _deps.record_closure(schema_path)
+  cache_key = (str(schema_path), direction, operation, bundle)
+  data = _resolved_schema_cache.get(cache_key)
+  if data is not None:
+    if _profile:
+      _profile.count("resolve.memory_hits")
+    return data
+  # Threads asking for a variant that is already being resolved (prewarm,
+  # prerendered pages) wait for that resolve instead of starting another.
+  return _resolve_flight.do(
+    cache_key,
+    lambda: _resolve_uncached(schema_path, direction, operation, bundle),
   )
-  if result.returncode == 0:
-    data = json.loads(result.stdout)
-    _resolved_schema_cache[cache_key] = data
+
+
+def _resolve_uncached(
+  schema_path: str | Path, direction: str, operation: str, bundle: bool
+) -> dict[str, Any]:
+  """Resolve a variant missing from the memory cache (see _resolve_schema)."""
+  cache_key = (str(schema_path), direction, operation, bundle)
+  data = _resolved_schema_cache.get(cache_key)
+  if data is not None:
+    # Resolved by another thread between our lookup and this flight.
     return data
-  else:
-    raise RuntimeError(f"ucp-schema execution error: result = {result}")
+
+  in_process = schema_resolver.backend() == "python"
+  disk_key = None
+  if _disk_cache is not None:
+    if in_process:
+      version = schema_resolver.VERSION
+    else:
+      version = schema_cache.cli_version()
+    if version:
+      disk_key = schema_cache.cache_key(
+        schema_path, (direction, operation, bundle), version
+      )
+      data = _disk_cache.get(disk_key)
+      if data is not None:
+        if _profile:
+          _profile.count("resolve.disk_hits")
+        _resolved_schema_cache[cache_key] = data
+        return data
+
+  if _profile:
+    _profile.count("resolve.misses")
+
+  # UCP_SCHEMA_RESOLVER=python resolves in-process; otherwise requests are
+  # served by a long-lived worker when the CLI supports `serve`, or by a
+  # one-shot `ucp-schema resolve` (see scripts/ucp_schema_pool.py).
+  try:
+    if in_process:
+      data = schema_resolver.resolve(schema_path, direction, operation, bundle)
+    else:
+      data = ucp_schema_pool.default_pool().resolve(
+        schema_path, direction, operation, bundle
+      )
+  except (
+    schema_resolver.SchemaResolveError,
+    ucp_schema_pool.SchemaResolveError,
+  ) as e:
+    raise RuntimeError(f"ucp-schema execution error: {e}") from e
+  _resolved_schema_cache[cache_key] = data
+  if disk_key:
+    _disk_cache.put(disk_key, data)
+  return data
+
+
+if _profile:
+  _resolve_schema = _profile.timed(_resolve_schema)
 
 
 # Backward compatibility alias
@@ -210,6 +843,597 @@ def _resolve_schema_bundled(
   return _resolve_schema(schema_path, direction, operation, bundle=True)
 
 
+def _find_schema_file(entity_name: str) -> Path | None:
+  """Return the first SCHEMAS_DIRS match for an entity name, if any."""
+  return _schemas().find(entity_name)
+
+
+def _parse_entity_suffix(entity_name: str) -> tuple[str, str, str]:
+  """Split a schema_fields entity name into (base, direction, operation).
+
+  - 'cart_resp' -> ('cart', 'response', 'read')
+  - 'cart_create_req' -> ('cart', 'request', 'create')
+  - 'buyer' -> ('buyer', 'response', 'read')
+  """
+  direction = "response"
+  operation = "read"
+  base_name = entity_name
+
+  if entity_name.endswith("_resp"):
+    base_name = entity_name[:-5]  # Strip _resp
+    direction = "response"
+  elif entity_name.endswith("_req"):
+    # Pattern: entity_op_req (e.g., cart_create_req)
+    parts = entity_name[:-4].rsplit("_", 1)  # Strip _req, split on last _
+    if len(parts) == 2 and parts[1] in (
+      "create",
+      "update",
+      "complete",
+      "read",
+    ):
+      base_name, operation = parts
+      direction = "request"
+    else:
+      base_name = entity_name[:-4]
+      direction = "request"
+
+  return base_name, direction, operation
+
+
+def _variant_operation(io_type: str, op_id: str) -> str:
+  """Map an operationId (or bare op name) to a ucp-schema --op value."""
+  op_id = op_id.lower()
+  if io_type == "request":
+    if "create" in op_id:
+      return "create"
+    if "update" in op_id or "patch" in op_id:
+      return "update"
+    if "complete" in op_id:
+      return "complete"
+  return "read"
+
+
+def _ref_entity_name(ref: str) -> str:
+  """Entity name the table renderer loads for a $ref (may be empty)."""
+  ref_clean = ref.split("#")[0]
+  if ref_clean.endswith("/schema"):
+    ref_clean = ref_clean.replace("/schema", "")
+  return Path(ref_clean).stem
+
+
+# --- OPERATION INDEX ---
+# method_fields and header_fields look operations up by operationId (OpenAPI)
+# or method name (OpenRPC). Each spec is indexed once per parse instead of
+# being re-read and scanned on every macro call.
+
+
+class Operation(NamedTuple):
+  """One transport operation, with everything the macros read from it."""
+
+  # The OpenAPI Operation Object or OpenRPC Method Object.
+  operation: dict
+  # Parameters declared on the enclosing OpenAPI Path Item.
+  path_parameters: list
+  # Path-level + operation parameters, local $refs resolved where possible.
+  parameters: list
+  # application/json request body schema (OpenRPC: params as properties).
+  request_schema: dict
+  # application/json schema of the first 200/201 response (OpenRPC: result).
+  response_schema: dict
+  # 200 response headers as dicts carrying their `name`, $refs resolved.
+  response_headers: list
+
+
+def _openapi_operation(
+  op: dict, path_parameters: list, spec: dict
+) -> Operation:
+  parameters = []
+  for param in [*path_parameters, *op.get("parameters", [])]:
+    if "$ref" in param:
+      param = _resolve_json_pointer(param["$ref"], spec) or param
+    parameters.append(param)
+
+  req_content = op.get("requestBody", {}).get("content", {})
+  request_schema = req_content.get("application/json", {}).get("schema", {})
+
+  response_schema = {}
+  responses = op.get("responses", {})
+  for code in ("200", "201"):
+    if code in responses:
+      res_content = responses.get(code, {}).get("content", {})
+      response_schema = res_content.get("application/json", {}).get(
+        "schema", {}
+      )
+      break
+
+  response_headers = []
+  for name, header in responses.get("200", {}).get("headers", {}).items():
+    if "$ref" in header:
+      resolved = _resolve_json_pointer(header["$ref"], spec)
+      if resolved:
+        response_headers.append({**resolved, "name": name})
+      else:
+        response_headers.append(
+          {"name": name, "description": "Ref not resolved"}
+        )
+    else:
+      response_headers.append({**header, "name": name})
+
+  return Operation(
+    op,
+    path_parameters,
+    parameters,
+    request_schema,
+    response_schema,
+    response_headers,
+  )
+
+
+def _openrpc_operation(method: dict) -> Operation:
+  properties = {}
+  required = []
+  for param in method.get("params", []):
+    schema = dict(param.get("schema", {}))
+    if "description" in param:
+      schema["description"] = param["description"]
+    properties[param["name"]] = schema
+    if param.get("required"):
+      required.append(param["name"])
+  request_schema = (
+    {"properties": properties, "required": required} if properties else {}
+  )
+  response_schema = method.get("result", {}).get("schema", {})
+  return Operation(method, [], [], request_schema, response_schema, [])
+
+
+def _build_operation_index(spec: dict, spec_path: Path) -> dict:
+  index: dict[str, Operation] = {}
+  # Paths before webhooks, first match wins: the order the macros searched.
+  for section in ("paths", "webhooks"):
+    for path_item in spec.get(section, {}).values():
+      path_parameters = []
+      if section == "paths":
+        path_parameters = path_item.get("parameters", [])
+      for op in path_item.values():
+        if isinstance(op, dict) and "operationId" in op:
+          index.setdefault(
+            op["operationId"], _openapi_operation(op, path_parameters, spec)
+          )
+  for method in spec.get("methods", []):
+    if "$ref" in method:
+      # OpenRPC methods may live in a schema file (e.g. fulfillment.json).
+      target, _, fragment = method["$ref"].partition("#")
+      doc = _schemas().document(spec_path.parent / target)
+      method = _resolve_json_pointer(f"#{fragment}", doc) or {}
+    if "name" in method:
+      index.setdefault(method["name"], _openrpc_operation(method))
+  return index
+
+
+_operation_indexes: dict[Path, tuple[Any, dict[str, Operation]]] = {}
+
+
+def _operation_index(file_name: str) -> tuple[dict, dict[str, Operation]]:
+  """Return (parsed spec, operationId -> Operation) for an OPENAPI_DIR file.
+
+  Rebuilt only when the registry re-parses the spec after an mtime change.
+  Raises FileNotFoundError / json.JSONDecodeError if the spec is unreadable.
+  """
+  spec_path = OPENAPI_DIR / file_name
+  spec = _schemas().document(spec_path)
+  cached = _operation_indexes.get(spec_path)
+  if cached is None or cached[0] is not spec:
+    cached = (spec, _build_operation_index(spec, spec_path))
+    _operation_indexes[spec_path] = cached
+  return cached
+
+
+# --- LINKS ---
+class TypeLocations(NamedTuple):
+  """What create_link needs to know about the schema tree.
+
+  Basenames ("buyer.json") present in common/types, shopping/types and
+  shopping/, and the stems of polymorphic types: types/ schemas with a
+  ucp_request annotation anywhere (properties, allOf branches, $defs),
+  whose request and response variants are documented separately.
+  """
+
+  common_types: frozenset[str] = frozenset()
+  shopping_types: frozenset[str] = frozenset()
+  shopping_schemas: frozenset[str] = frozenset()
+  polymorphic: frozenset[str] = frozenset()
+
+  def is_polymorphic(self, ref_string: str) -> bool:
+    """Whether a types/ ref points at a polymorphic type."""
+    if "types/" not in ref_string:
+      return False
+    return Path(ref_string).name.replace(".json", "") in self.polymorphic
+
+
+def _has_ucp_request(node: Any) -> bool:
+  if isinstance(node, dict):
+    return "ucp_request" in node or any(
+      _has_ucp_request(v) for v in node.values()
+    )
+  if isinstance(node, list):
+    return any(_has_ucp_request(v) for v in node)
+  return False
+
+
+def _basenames(directory: Path) -> frozenset[str]:
+  if not directory.is_dir():
+    return frozenset()
+  return frozenset(p.name for p in directory.glob("*.json"))
+
+
+def scan_type_locations(registry: SchemaRegistry) -> TypeLocations:
+  """Build the TypeLocations for the schema tree (once per build).
+
+  Polymorphism is judged on the document the registry resolves each
+  types/ stem to, as the docs do when rendering it.
+  """
+  stems = {
+    p.stem
+    for d in (COMMON_TYPES_DIR, *schema_layout().vertical_types_dirs)
+    if d.is_dir()
+    for p in d.glob("*.json")
+  }
+  return TypeLocations(
+    common_types=_basenames(COMMON_TYPES_DIR),
+    shopping_types=_basenames(SHOPPING_TYPES_DIR),
+    shopping_schemas=_basenames(SHOPPING_SCHEMAS_DIR),
+    polymorphic=frozenset(
+      stem for stem in stems if _has_ucp_request(registry.load(stem))
+    ),
+  )
+
+
+def create_link(
+  ref_string: str,
+  spec_file_name: str,
+  types: TypeLocations,
+  context: dict | None = None,
+) -> schema_table.Link:
+  """Transform schema paths into links.
+
+  Transforms paths like "types/line_item.create_req.json" into links.
+  This function is used to generate links to specific schema entities within
+  the same specification file. Pure: everything it needs to know about
+  the schema tree comes from `types`, so it also works outside mkdocs.
+
+  Args:
+  ----
+    ref_string: e.g., "types/line_item.create_req.json" or
+      "types/pagination.json#/$defs/response"
+    spec_file_name: e.g., "checkout"
+    types: Schema locations from scan_type_locations().
+    context: Optional dict with 'io_type' (request/response) for polymorphic
+      type handling.
+
+  Returns:
+  -------
+    schema_table.Link: text "Line Item.Create_Req", anchor
+    "line-item-create_request".
+
+  """
+  # Refer to checkout.json for ap2-mandates.json entities that are not
+  # explicitly defined in ap2-mandates.json.
+  if (
+    spec_file_name == "ap2-mandates"
+    and "ap2_mandate" not in ref_string
+    and not ref_string.startswith("#")
+  ):
+    spec_file_name = "checkout"
+
+  # Extract fragment identifier if present (e.g., #/$defs/response)
+  # This handles cases like "types/pagination.json#/$defs/response"
+  fragment = None
+  ref_path = ref_string
+  if "#/$defs/" in ref_string:
+    ref_path, fragment = ref_string.split("#/$defs/", 1)
+
+  # Redirect all types/ references to the reference specification
+  if ref_string.startswith("types/"):
+    spec_file_name = "reference"
+
+  # Redirect refs to common/types/ or shopping/types/ schemas to reference.
+  # Uses ref_path (fragment stripped) so refs like
+  # "../common/types/pagination.json#/$defs/request" are handled correctly.
+  elif ref_path.endswith(".json"):
+    filename_only = Path(ref_path).name
+    if filename_only in types.common_types or (
+      filename_only in types.shopping_types
+      and filename_only not in types.shopping_schemas
+    ):
+      spec_file_name = "reference"
+
+  filename = Path(ref_path).name
+
+  # Check if this reference comes from the core UCP schema
+  is_ucp = "ucp.json" in ref_string
+
+  # 1. Clean extension and paths
+  raw_name = filename.replace(".json", "")
+  if filename.endswith("#/schema"):
+    raw_name = raw_name.replace("#/schema", "")
+
+  # 2. Generate Link Text (Visual)
+  # e.g. "checkout_response" -> "Checkout Response"
+  # e.g. "pagination" + fragment "response" -> "Pagination Response"
+  if fragment:
+    base_text = (
+      raw_name.replace("_", " ").replace(".", " ").replace("-", " ").title()
+    )
+    fragment_text = (
+      fragment.replace("_", " ").replace(".", " ").replace("-", " ").title()
+    )
+    link_text = f"{base_text} {fragment_text}"
+  else:
+    link_text = (
+      raw_name.replace("_", " ").replace(".", " ").replace("-", " ").title()
+    )
+
+  if link_text.endswith("Resp"):
+    link_text = link_text.replace("Resp", "Response")
+  elif link_text.endswith("Req"):
+    link_text = link_text.replace("Req", "Request")
+
+  # FIX: Explicitly add UCP prefix for core UCP definitions if missing
+  if is_ucp and "Ucp" not in link_text and "UCP" not in link_text:
+    link_text = f"UCP {link_text}"
+
+  # 3. Generate Anchor (Target)
+  # We want "types/line_item.create_req.json" -> "#line-item-create_request"
+  # This matches the pattern: "Line Item" H3 -> "Create Request" H4
+  parts = raw_name.split(".")
+  base_entity = parts[0]
+
+  anchor_name = base_entity.replace("_", "-")
+
+  # Handle fragment in anchor
+  # e.g., pagination#/$defs/response -> pagination-response
+  if fragment:
+    fragment_anchor = fragment.replace("_", "-")
+    if anchor_name:  # External ref: base-fragment
+      anchor_name = f"{anchor_name}-{fragment_anchor}"
+    else:  # Internal ref like #/$defs/context: just use fragment
+      anchor_name = fragment_anchor
+  elif len(parts) > 1:
+    variant = parts[1]
+    variant_expanded = (
+      variant.replace("create_req", "create-request")
+      .replace("update_req", "update-request")
+      .replace("resp", "response")
+      .replace("-", " ")
+    )
+    anchor_name = f"{anchor_name}-{variant_expanded}".replace(" ", "-")
+  elif raw_name.endswith("_resp"):
+    anchor_name = raw_name.replace("_", "-").replace("-resp", "-response")
+  elif raw_name.endswith("_req"):
+    anchor_name = raw_name.replace("_", "-").replace("-req", "-request")
+  elif context and context.get("io_type") == "response":
+    # For polymorphic types in response mode, keep the base anchor name to
+    # match markdown headings like "Line Item" instead of "Line Item Response"
+    if types.is_polymorphic(ref_string) and not link_text.endswith("Response"):
+      link_text = f"{link_text} Response"
+
+  # FIX: Ensure anchor starts with ucp- for UCP definitions
+  if is_ucp and not anchor_name.startswith("ucp-"):
+    anchor_name = f"ucp-{anchor_name}"
+
+  return schema_table.Link(link_text, spec_file_name, anchor_name.lower())
+
+
+# --- PREWARM ---
+# Every macro call resolves its schemas lazily the first time a page
+# renders, one ucp-schema round-trip at a time. Scanning the docs up front
+# lets define_env resolve the whole working set concurrently instead.
+
+_MACRO_CALL_RE = re.compile(r"\{\{\s*(\w+)\s*\((.*?)\)\s*\}\}", re.DOTALL)
+
+# (schema path, direction, operation, bundle) — the _resolve_schema args.
+ResolveKey = tuple[Path, str, str, bool]
+
+
+def _scan_macro_calls(docs_dir: str | Path) -> list[tuple[str, list, dict]]:
+  """Find `{{ macro(literal, ...) }}` calls in every Markdown page."""
+  calls = []
+  for md_file in sorted(Path(docs_dir).rglob("*.md")):
+    try:
+      text = md_file.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+      continue
+    for match in _MACRO_CALL_RE.finditer(text):
+      try:
+        node = ast.parse(f"_({match.group(2)})", mode="eval").body
+        args = [ast.literal_eval(arg) for arg in node.args]
+        kwargs = {k.arg: ast.literal_eval(k.value) for k in node.keywords}
+      except (SyntaxError, ValueError):
+        continue
+      calls.append((match.group(1), args, kwargs))
+  return calls
+
+
+def _rendered_refs(schema: Any) -> list[str]:
+  """$refs the table renderer loads as sub-tables (not just links to).
+
+  Mirrors the recursion in _render_table_from_schema: a schema-level $ref,
+  a '$ref' pseudo-property, and allOf members (top-level or nested under
+  properties) are expanded inline; property-level $refs only become links.
+  """
+  if not isinstance(schema, dict):
+    return []
+  refs = []
+  if isinstance(schema.get("$ref"), str):
+    refs.append(schema["$ref"])
+  properties = schema.get("properties")
+  all_of = list(schema.get("allOf") or [])
+  if isinstance(properties, dict):
+    if isinstance(properties.get("$ref"), str):
+      refs.append(properties["$ref"])
+    all_of += properties.get("allOf") or []
+  for item in all_of:
+    refs.extend(_rendered_refs(item))
+  return refs
+
+
+def _variant_key(ref: str, direction: str, operation: str) -> ResolveKey | None:
+  """Key _load_schema_variant would resolve for a ref under a context."""
+  if ref.startswith("http"):
+    return None
+  entity_name = _ref_entity_name(ref)
+  if not entity_name:
+    return None
+  path = _find_schema_file(entity_name)
+  if path is None:
+    return None
+  return (path, direction, operation, False)
+
+
+def _method_resolve_keys(operation_id: str, file_name: str) -> set[ResolveKey]:
+  """Keys method_fields needs for an OpenAPI operation's request/response."""
+  try:
+    data, index = _operation_index(file_name)
+  except (OSError, json.JSONDecodeError):
+    return set()
+  if operation_id not in index:
+    return set()
+  entry = index[operation_id]
+
+  keys = set()
+  for io_type, schema in (
+    ("request", entry.request_schema),
+    ("response", entry.response_schema),
+  ):
+    operation = _variant_operation(io_type, operation_id)
+    pending = [schema]
+    while pending:
+      node = pending.pop()
+      for ref in _rendered_refs(node):
+        if ref.startswith("#/"):
+          pending.append(_resolve_json_pointer(ref, data))
+          continue
+        key = _variant_key(ref, io_type, operation)
+        if key:
+          keys.add(key)
+  return keys
+
+
+def _macro_resolve_keys(name: str, args: list, kwargs: dict) -> set[ResolveKey]:
+  """Top-level resolve keys for one macro call (nested ones come later)."""
+  if name == "schema_fields" and args and "#" not in args[0]:
+    base_name, direction, operation = _parse_entity_suffix(args[0])
+    path = _find_schema_file(base_name)
+    return {(path, direction, operation, False)} if path else set()
+  if name == "extension_schema_fields" and args and ".json#/" in args[0]:
+    core_entity_name = args[0].split(".json#", 1)[0]
+    path = _find_schema_file(core_entity_name)
+    return {(path, "response", "read", True)} if path else set()
+  if name == "method_fields" and len(args) >= 2:
+    return _method_resolve_keys(args[0], args[1])
+  return set()
+
+
+def _prewarm_one(key: ResolveKey) -> dict[str, Any] | None:
+  try:
+    return _resolve_schema(*key)
+  except Exception as e:
+    # Prewarming is best-effort: leave the failure to the page render,
+    # which reports it with the page that triggered it.
+    log.debug(f"Prewarm of {key[0]} failed: {e}")
+    return None
+
+
+def _prewarm_schemas(docs_dir: str | Path) -> int:
+  """Resolve every schema variant the docs will ask for, concurrently.
+
+  Top-level keys come straight from macro arguments. As each resolve
+  finishes, the sub-schemas its table will expand (under the same
+  direction/operation context) are queued too, so nested variants are
+  warmed without waiting for a whole wave to drain.
+
+  Returns the number of distinct variants requested.
+  """
+  seen: set[ResolveKey] = set()
+  for name, args, kwargs in _scan_macro_calls(docs_dir):
+    seen |= _macro_resolve_keys(name, args, kwargs)
+
+  with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    futures = {executor.submit(_prewarm_one, key): key for key in seen}
+    while futures:
+      done, _ = wait(futures, return_when=FIRST_COMPLETED)
+      for future in done:
+        _, direction, operation, bundle = futures.pop(future)
+        resolved = future.result()
+        if resolved is None or bundle:
+          continue
+        for ref in _rendered_refs(resolved):
+          key = _variant_key(ref, direction, operation)
+          if key and key not in seen:
+            seen.add(key)
+            futures[executor.submit(_prewarm_one, key)] = key
+  return len(seen)
+
+
+# --- PRERENDER ---
+# Opt-in (UCP_DOCS_PRERENDER=1): evaluate every literal macro call in the
+# docs on a thread pool before mkdocs' serial page loop starts; the loop
+# then looks the outputs up. Calls that fail are left for the page render,
+# which reports the error with the page that triggered it.
+
+# Call key -> (output, schema files it read).
+_prerendered: dict[str, tuple[Any, frozenset[str]]] = {}
+
+
+def _call_key(name: str, args: Any, kwargs: dict) -> str:
+  return json.dumps([name, list(args), kwargs], sort_keys=True, default=str)
+
+
+def _prerender_one(
+  fn: Callable, args: list, kwargs: dict
+) -> tuple[Any, frozenset[str]]:
+  with _deps.collect() as deps:
+    output = fn(*args, **kwargs)
+  return output, frozenset(deps)
+
+
+def _prerender(macros: dict[str, Callable], docs_dir: str | Path) -> int:
+  """Evaluate the docs' macro calls concurrently into _prerendered.
+
+  Returns the number of distinct calls whose output was stored.
+  """
+  calls = {}
+  for name, args, kwargs in _scan_macro_calls(docs_dir):
+    if name in macros:
+      key = _call_key(name, args, kwargs)
+      calls.setdefault(key, (macros[name], args, kwargs))
+
+  with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    futures = {
+      executor.submit(_prerender_one, *call): key for key, call in calls.items()
+    }
+    for future in as_completed(futures):
+      try:
+        _prerendered[futures[future]] = future.result()
+      except Exception:  # Raised again, with context, by the page render.
+        continue
+  return len(_prerendered)
+
+
+def _serve_prerendered(fn: Callable) -> Callable:
+  """Wrap macro `fn` to return its prerendered output when there is one."""
+
+  @functools.wraps(fn)
+  def wrapper(*args, **kwargs):
+    entry = _prerendered.get(_call_key(fn.__name__, args, kwargs))
+    if entry is None:
+      return fn(*args, **kwargs)
+    _deps.record_all(entry[1])
+    return entry[0]
+
+  return wrapper
+
+
 def define_env(env):
   """Injects custom macros into the MkDocs environment.
 
@@ -222,8 +1446,41 @@ def define_env(env):
     env: The MkDocs environment object.
 
   """
-  # Use module-level constants for paths
-  schemas_dirs = SCHEMAS_DIRS
+  # Index the schema directories once; on `mkdocs serve` rebuilds this only
+  # re-indexes if a directory changed (resolved variants may embed any
+  # file, so drop them all). Edited files only evict what was built from
+  # them; pages that use none of them are served entirely from cache.
+  schemas = _schemas(schema_layout())
+  if schemas.refresh():
+    _resolved_schema_cache.clear()
+  changed = _deps.changed()
+  if changed:
+    _invalidate(changed)
+  # Which directories hold which types, for create_link.
+  types = scan_type_locations(schemas)
+  # Outputs from the previous build may be stale.
+  _prerendered.clear()
+
+  # Resolve every schema variant the pages reference before the first page
+  # renders. Opt out with UCP_DOCS_PREWARM=0.
+  docs_dir = env.conf.get("docs_dir", "docs")
+  if os.environ.get("UCP_DOCS_PREWARM", "1") != "0":
+    count = _prewarm_schemas(docs_dir)
+    log.info(f"Prewarmed {count} schema variants from {docs_dir}")
+
+  prerender = os.environ.get("UCP_DOCS_PRERENDER") == "1"
+  macros: dict[str, Callable] = {}
+
+  def macro(fn):
+    """Register `fn` with env.macro, timed when profiling is enabled.
+
+    With UCP_DOCS_PRERENDER=1 the registered macro serves _prerender's
+    output for the call when there is one.
+    """
+    if _profile:
+      fn = _profile.timed(fn)
+    macros[fn.__name__] = fn
+    return env.macro(_serve_prerendered(fn) if prerender else fn)
 
   def get_error_context():
     try:
@@ -236,15 +1493,23 @@ def define_env(env):
     return _resolve_schema(schema_path, direction, operation, bundle=False)
 
   def _load_json_file(entity_name):
-    """Try loading a JSON file from the configured directories."""
-    for schemas_dir in schemas_dirs:
-      full_path = Path(schemas_dir) / (entity_name + ".json")
-      try:
-        with full_path.open(encoding="utf-8") as f:
-          return json.load(f)
-      except FileNotFoundError:
-        continue
-    return None
+    """Load a schema by entity name from the registry (None if missing)."""
+    return schemas.load(entity_name)
+
+  def _link(ref_string, spec_file_name, context):
+    """create_link, recording the linked type as a table dependency.
+
+    In response context the link text depends on whether the linked
+    types/ schema is polymorphic, which `types` judges from that file's
+    content; recording it makes an edit there evict the tables linking to
+    it, as if they had read it.
+    """
+    response = bool(context) and context.get("io_type") == "response"
+    if response and "types/" in ref_string:
+      path = schemas.find(Path(ref_string).name.replace(".json", ""))
+      if path is not None:
+        _deps.record(path)
+    return create_link(ref_string, spec_file_name, types, context)
 
   def _load_schema_variant(entity_name, context):
     """Load and resolve a schema for a specific operation.
@@ -265,32 +1530,15 @@ def define_env(env):
       return _load_json_file(entity_name)
 
     io_type = context.get("io_type")
-    op_id = context.get("operation_id", "").lower()
 
     # Find the schema file
-    schema_path = None
-    for schemas_dir in schemas_dirs:
-      full_path = Path(schemas_dir) / (entity_name + ".json")
-      if full_path.exists():
-        schema_path = str(full_path)
-        break
-
+    schema_path = _find_schema_file(entity_name)
     if not schema_path:
       return _load_json_file(entity_name)
 
     # Determine direction and operation for ucp-schema
     direction = io_type  # "request" or "response"
-    operation = "read"  # default for responses
-
-    if io_type == "request":
-      if "create" in op_id:
-        operation = "create"
-      elif "update" in op_id or "patch" in op_id:
-        operation = "update"
-      elif "complete" in op_id:
-        operation = "complete"
-    elif io_type == "response":
-      operation = "read"
+    operation = _variant_operation(io_type, context.get("operation_id", ""))
 
     # Resolve using ucp-schema (no fallback - fail loudly if unavailable)
     resolved = _resolve_with_ucp_schema(schema_path, direction, operation)
@@ -300,176 +1548,7 @@ def define_env(env):
     # ucp-schema failed - don't silently fall back to raw JSON with annotations
     return None
 
-  # Cache for polymorphic type detection
-  _polymorphic_cache: dict[str, bool] = {}
-
-  def _is_polymorphic_type(ref_string: str) -> bool:
-    """Check if a schema file is polymorphic (has ucp_request annotations).
-
-    Polymorphic types have different request/response variants and require
-    the -response suffix in anchors to match markdown headings.
-    """
-    if ref_string in _polymorphic_cache:
-      return _polymorphic_cache[ref_string]
-
-    # Only check types/ refs
-    if "types/" not in ref_string:
-      _polymorphic_cache[ref_string] = False
-      return False
-
-    # Find and load the schema file
-    # ref_string is like "types/line_item.json", extract just the filename
-    filename = Path(ref_string).name.replace(".json", "")
-    # _load_json_file searches in SCHEMAS_DIRS which already includes the
-    # types directory, so we just pass the filename
-    schema_data = _load_json_file(filename)
-    if not schema_data:
-      _polymorphic_cache[ref_string] = False
-      return False
-
-    # Check if any property has ucp_request annotation
-    properties = schema_data.get("properties", {})
-    for prop_details in properties.values():
-      if isinstance(prop_details, dict) and "ucp_request" in prop_details:
-        _polymorphic_cache[ref_string] = True
-        return True
-
-    _polymorphic_cache[ref_string] = False
-    return False
-
-  def create_link(ref_string, spec_file_name, context=None):
-    """Transform schema paths into Markdown links.
-
-    Transforms paths like "types/line_item.create_req.json" into Markdown links.
-    This function is used to generate links to specific schema entities within
-    the same specification file.
-
-    Args:
-    ----
-      ref_string: e.g., "types/line_item.create_req.json" or
-        "types/pagination.json#/$defs/response"
-      spec_file_name: e.g., "checkout"
-      context: Optional dict with 'io_type' (request/response) for polymorphic
-        type handling.
-
-    Returns:
-    -------
-      Markdown link: [Line Item.Create_Req](#line-item-create_request)
-
-    """
-    # Refer to checkout.json for ap2-mandates.json entities that are not
-    # explicitly defined in ap2-mandates.json.
-    if (
-      spec_file_name == "ap2-mandates"
-      and "ap2_mandate" not in ref_string
-      and not ref_string.startswith("#")
-    ):
-      spec_file_name = "checkout"
-
-    # Extract fragment identifier if present (e.g., #/$defs/response)
-    # This handles cases like "types/pagination.json#/$defs/response"
-    fragment = None
-    ref_path = ref_string
-    if "#/$defs/" in ref_string:
-      ref_path, fragment = ref_string.split("#/$defs/", 1)
-
-    # Redirect all types/ references to the reference specification
-    if ref_string.startswith("types/"):
-      spec_file_name = "reference"
-
-    # Redirect refs to common/types/ or shopping/types/ schemas to reference.
-    # Uses ref_path (fragment stripped) so refs like
-    # "../common/types/pagination.json#/$defs/request" are handled correctly.
-    elif ref_path.endswith(".json"):
-      filename_only = Path(ref_path).name
-      common_type_path = COMMON_TYPES_DIR / filename_only
-      shopping_type_path = SHOPPING_TYPES_DIR / filename_only
-      shopping_path = SHOPPING_SCHEMAS_DIR / filename_only
-      if common_type_path.exists() or (
-        shopping_type_path.exists() and not shopping_path.exists()
-      ):
-        spec_file_name = "reference"
-
-    filename = Path(ref_path).name
-
-    # Check if this reference comes from the core UCP schema
-    is_ucp = "ucp.json" in ref_string
-
-    # 1. Clean extension and paths
-    raw_name = filename.replace(".json", "")
-    if filename.endswith("#/schema"):
-      raw_name = raw_name.replace("#/schema", "")
-
-    # 2. Generate Link Text (Visual)
-    # e.g. "checkout_response" -> "Checkout Response"
-    # e.g. "pagination" + fragment "response" -> "Pagination Response"
-    if fragment:
-      base_text = (
-        raw_name.replace("_", " ").replace(".", " ").replace("-", " ").title()
-      )
-      fragment_text = (
-        fragment.replace("_", " ").replace(".", " ").replace("-", " ").title()
-      )
-      link_text = f"{base_text} {fragment_text}"
-    else:
-      link_text = (
-        raw_name.replace("_", " ").replace(".", " ").replace("-", " ").title()
-      )
-
-    if link_text.endswith("Resp"):
-      link_text = link_text.replace("Resp", "Response")
-    elif link_text.endswith("Req"):
-      link_text = link_text.replace("Req", "Request")
-
-    # FIX: Explicitly add UCP prefix for core UCP definitions if missing
-    if is_ucp and "Ucp" not in link_text and "UCP" not in link_text:
-      link_text = f"UCP {link_text}"
-
-    # 3. Generate Anchor (Target)
-    # We want "types/line_item.create_req.json" -> "#line-item-create_request"
-    # This matches the pattern: "Line Item" H3 -> "Create Request" H4
-    parts = raw_name.split(".")
-    base_entity = parts[0]
-
-    anchor_name = base_entity.replace("_", "-")
-
-    # Handle fragment in anchor
-    # e.g., pagination#/$defs/response -> pagination-response
-    if fragment:
-      fragment_anchor = fragment.replace("_", "-")
-      if anchor_name:  # External ref: base-fragment
-        anchor_name = f"{anchor_name}-{fragment_anchor}"
-      else:  # Internal ref like #/$defs/context: just use fragment
-        anchor_name = fragment_anchor
-    elif len(parts) > 1:
-      variant = parts[1]
-      variant_expanded = (
-        variant.replace("create_req", "create-request")
-        .replace("update_req", "update-request")
-        .replace("resp", "response")
-        .replace("-", " ")
-      )
-      anchor_name = f"{anchor_name}-{variant_expanded}".replace(" ", "-")
-    elif raw_name.endswith("_resp"):
-      anchor_name = raw_name.replace("_", "-").replace("-resp", "-response")
-    elif raw_name.endswith("_req"):
-      anchor_name = raw_name.replace("_", "-").replace("-req", "-request")
-    elif context and context.get("io_type") == "response":
-      # For polymorphic types in response mode, keep the base anchor name to
-      # match markdown headings like "Line Item" instead of "Line Item Response"
-      if _is_polymorphic_type(ref_string) and not link_text.endswith(
-        "Response"
-      ):
-        link_text = f"{link_text} Response"
-
-    # FIX: Ensure anchor starts with ucp- for UCP definitions
-    if is_ucp and not anchor_name.startswith("ucp-"):
-      anchor_name = f"ucp-{anchor_name}"
-
-    base = f"site:specification/{spec_file_name}/#"
-    return f"[{link_text}]({base}{anchor_name.lower()})"
-
-  def _render_table_from_ref(
+  def _table_from_ref(
     properties_ref, required_list, spec_file_name, context=None
   ):
     """Inline fields from a given list of properties.
@@ -486,16 +1565,12 @@ def define_env(env):
 
     Returns:
     -------
-      A string containing a Markdown table representing the schema properties,
-      or a message indicating why a table could not be rendered.
+      A schema_table.Table representing the schema properties, or a
+      message indicating why a table could not be rendered.
 
     """
     # Clean up ref to get entity name
-    ref_clean = properties_ref.split("#")[0]
-    if ref_clean.endswith("/schema"):
-      ref_clean = ref_clean.replace("/schema", "")
-
-    ref_entity_name = Path(ref_clean).stem
+    ref_entity_name = _ref_entity_name(properties_ref)
 
     # LOAD DATA WITH CONTEXT
     ref_schema_data = _load_schema_variant(ref_entity_name, context)
@@ -511,13 +1586,13 @@ def define_env(env):
       ):
         ref_schema_data = ref_schema_data.get("schema", ref_schema_data)
 
-      return _render_table_from_schema(
+      return _table_from_schema(
         ref_schema_data, spec_file_name, False, required_list, context
       )
     else:
       # If purely external and not found locally
       if properties_ref.startswith("http"):
-        return f"_See [{properties_ref}]({properties_ref})_"
+        return schema_table.Table("external", text=properties_ref)
       # ucp-schema failed or schema not found - fail loudly
       raise RuntimeError(
         f"Failed to resolve ref_entity_name='{ref_entity_name}' "
@@ -525,7 +1600,7 @@ def define_env(env):
         f"Ensure ucp-schema is installed: `cargo install ucp-schema`"
       )
 
-  def _render_embedded_table(
+  def _embedded_table(
     properties_list, required_list, spec_file_name, context=None
   ):
     """Inline fields from a given list of properties.
@@ -542,12 +1617,12 @@ def define_env(env):
 
     Returns:
     -------
-      A string containing a Markdown table representing the schema properties,
-      or a message indicating why a table could not be rendered.
+      A schema_table.Table representing the schema properties, or a
+      message indicating why a table could not be rendered.
 
     """
     if not properties_list:
-      return "_No content fields defined._"
+      return schema_table.message("No content fields defined.")
 
     # Special handling for capability.
     if (
@@ -557,15 +1632,15 @@ def define_env(env):
     ):
       ref = properties_list[0].get("$ref")
       if ref:
-        return _read_schema_from_defs(
+        return _table_from_defs(
           "capability.json" + ref,
           spec_file_name,
           False,
           properties_list[1].get("required", []),
-        )
+        )[0]
       else:
         # If the ref was already resolved, render the schema directly.
-        return _render_table_from_schema(
+        return _table_from_schema(
           properties_list[0],
           spec_file_name,
           False,
@@ -581,13 +1656,14 @@ def define_env(env):
         if req not in merged_required:
           merged_required.append(req)
 
-    md = []
+    rows = []
     for properties in properties_list:
       if len(properties) == 1 and "$ref" in properties:
-        embedded_data = _render_table_from_ref(
-          properties["$ref"], merged_required, spec_file_name, context
+        rows.append(
+          _table_from_ref(
+            properties["$ref"], merged_required, spec_file_name, context
+          )
         )
-        md.append(embedded_data)
         continue
 
       # Skip allOf siblings that only carry constraints (required,
@@ -600,13 +1676,13 @@ def define_env(env):
       if not has_renderable:
         continue
 
-      md.append(
-        _render_table_from_schema(
+      rows.append(
+        _table_from_schema(
           properties, spec_file_name, False, merged_required, context
         )
       )
 
-    return "\n".join(md)
+    return schema_table.Table("rows", rows=rows)
 
   def _render_table_from_schema(
     schema_data,
@@ -617,6 +1693,51 @@ def define_env(env):
   ):
     """Render a Markdown table from a schema dictionary.
 
+    See _table_uncached for the arguments.
+    """
+    return schema_table.markdown(
+      _table_from_schema(
+        schema_data, spec_file_name, need_header, parent_required_list, context
+      )
+    )
+
+  def _table_from_schema(
+    schema_data,
+    spec_file_name,
+    need_header=True,
+    parent_required_list=None,
+    context=None,
+  ):
+    """Build the table for a schema dictionary, memoized.
+
+    See _table_uncached for the arguments; repeated builds of the same
+    schema under the same arguments are served from _render_cache.
+    """
+    key = RenderCache.key(
+      schema_data, spec_file_name, need_header, parent_required_list, context
+    )
+    table = _render_cache.get(key)
+    if table is None:
+      with _deps.collect() as deps:
+        table = _table_uncached(
+          schema_data,
+          spec_file_name,
+          need_header,
+          parent_required_list,
+          context,
+        )
+      _render_cache.put(key, table, deps)
+    return table
+
+  def _table_uncached(
+    schema_data,
+    spec_file_name,
+    need_header=True,
+    parent_required_list=None,
+    context=None,
+  ):
+    """Build the table for a schema dictionary.
+
     Schema dictionary must contain 'properties'. 'required' list is optional.
 
     Args:
@@ -633,12 +1754,12 @@ def define_env(env):
 
     Returns:
     -------
-      A string containing a Markdown table representing the schema properties,
-      or a message indicating why a table could not be rendered.
+      A schema_table.Table representing the schema properties, or a
+      message indicating why a table could not be rendered.
 
     """
     if not schema_data:
-      return "_No content fields defined._"
+      return schema_table.message("No content fields defined.")
 
     # If schema is ONLY a oneOf, render as prose instead of table
     if (
@@ -647,18 +1768,15 @@ def define_env(env):
       and not schema_data.get("allOf")
       and not schema_data.get("$ref")
     ):
-      links = []
+      options = []
       for item in schema_data["oneOf"]:
         if "$ref" in item:
-          links.append(create_link(item["$ref"], spec_file_name, context))
+          link = _link(item["$ref"], spec_file_name, context)
+          options.append(schema_table.FieldType("ref", link))
         elif item.get("type"):
-          links.append(f"`{item.get('type')}`")
-      if links:
-        return (
-          "\nThis object MUST be one of the following types: "
-          + ", ".join(links)
-          + ".\n"
-        )
+          options.append(schema_table.FieldType(item.get("type")))
+      if options:
+        return schema_table.Table("one_of", options=options)
 
     properties = schema_data.get("properties", {})
     required_list = schema_data.get("required", [])
@@ -683,24 +1801,21 @@ def define_env(env):
       pattern_val = schema_data.get("pattern")
 
       if s_type or enum_val:
-        desc = schema_data.get("description", "")
-        if pattern_val:
-          desc += f"\n\n**Pattern:** `{pattern_val}`"
-        if enum_val:
-          formatted = ", ".join([f"`{v}`" for v in enum_val])
-          desc += f"\n\n**Enum:** {formatted}"
-        return desc
+        return schema_table.Table(
+          "scalar",
+          description=schema_data.get("description", ""),
+          pattern=pattern_val,
+          enum=enum_val,
+        )
 
-      return "_No properties defined._"
+      return schema_table.message("No properties defined.")
 
-    md = []
-    if need_header:
-      md = ["| Name | Type | Required | Description |"]
-      md.append("| :--- | :--- | :--- | :--- |")
+    table = schema_table.Table("rows", header=bool(need_header))
+    rows = table.rows
 
     if "allOf" in properties:
-      md.append(
-        _render_embedded_table(
+      rows.append(
+        _embedded_table(
           properties.get("allOf", []),
           required_list,
           spec_file_name,
@@ -708,8 +1823,8 @@ def define_env(env):
         )
       )
     elif "allOf" in schema_data and not properties:
-      md.append(
-        _render_embedded_table(
+      rows.append(
+        _embedded_table(
           schema_data.get("allOf", []),
           required_list,
           spec_file_name,
@@ -717,18 +1832,16 @@ def define_env(env):
         )
       )
     elif "$ref" in schema_data:
-      md.append(
-        _render_table_from_ref(
+      rows.append(
+        _table_from_ref(
           schema_data.get("$ref"), required_list, spec_file_name, context
         )
       )
     else:
       for field_name, details in properties.items():
         if field_name == "$ref":
-          md.append(
-            _render_table_from_ref(
-              details, required_list, spec_file_name, context
-            )
+          rows.append(
+            _table_from_ref(details, required_list, spec_file_name, context)
           )
           continue
 
@@ -740,22 +1853,17 @@ def define_env(env):
         # e.g., "$ref": "../../ucp.json#/$defs/error" -> inline the allOf
         if ref and "ucp.json#/$defs/" in ref and "$defs" in ref:
           def_name = ref.split("/")[-1]
-          try:
-            with UCP_SCHEMA_PATH.open(encoding="utf-8") as f:
-              ucp_data = json.load(f)
-              resolved_def = ucp_data.get("$defs", {}).get(def_name)
-              if resolved_def:
-                # Merge resolved def into details, preserving embedder's
-                # description. The resolved def (e.g. allOf with base +
-                # status const) replaces the bare $ref.
-                embedder_desc = details.get("description")
-                details = dict(resolved_def)
-                if embedder_desc:
-                  details["description"] = embedder_desc
-                ref = None
-                f_type = details.get("type", "any")
-          except (json.JSONDecodeError, OSError):
-            pass
+          resolved_def = _ucp_defs().get(def_name)
+          if resolved_def:
+            # Merge resolved def into details, preserving embedder's
+            # description. The resolved def (e.g. allOf with base +
+            # status const) replaces the bare $ref.
+            embedder_desc = details.get("description")
+            details = dict(resolved_def)
+            if embedder_desc:
+              details["description"] = embedder_desc
+            ref = None
+            f_type = details.get("type", "any")
 
         # Check for Array specific logic
         items = details.get("items", {})
@@ -764,45 +1872,45 @@ def define_env(env):
         # Special handling for UCP version
         version_data = None
         if ref and ref.endswith("#/$defs/version"):
-          try:
-            with UCP_SCHEMA_PATH.open(encoding="utf-8") as f:
-              data = json.load(f)
-              version_data = data.get("$defs", {}).get("version", {})
-          except json.JSONDecodeError as e:
-            print(f"**Error loading schema {'ucp.json' + ref}':** {e}")
+          version_data = _ucp_defs().get("version", {})
 
         # --- Logic to determine Display Type ---
         if "oneOf" in details:
           # List of values embedded within an oneOf
-          f_type = "OneOf["
-          for idx, one_of_type in enumerate(details.get("oneOf", [])):
+          options = []
+          for one_of_type in details.get("oneOf", []):
             if "$ref" in one_of_type:
-              f_type += create_link(
-                one_of_type["$ref"], spec_file_name, context
+              link = _link(one_of_type["$ref"], spec_file_name, context)
+              options.append(schema_table.FieldType("ref", link))
+            else:
+              options.append(
+                schema_table.FieldType(one_of_type.get("type", "any"))
               )
-              if idx < len(details.get("oneOf", [])) - 1:
-                f_type += ", "
-          f_type += "]"
+          field_type = schema_table.FieldType("oneOf", options=options)
         elif ref:
           if version_data:
-            f_type = version_data.get("type", "any")
+            field_type = schema_table.FieldType(version_data.get("type", "any"))
           else:
             # Direct Reference
-            f_type = create_link(ref, spec_file_name, context)
+            link = _link(ref, spec_file_name, context)
+            field_type = schema_table.FieldType("ref", link)
         elif f_type == "array" and items_ref:
           # Array of References
-          link = create_link(items_ref, spec_file_name, context)
-          f_type = f"Array[{link}]"
+          link = _link(items_ref, spec_file_name, context)
+          field_type = schema_table.FieldType("array", link)
         elif f_type == "array":
           # Array of Primitives
           inner_type = items.get("type", "any")
-          f_type = f"Array[{inner_type}]"
+          field_type = schema_table.FieldType("array", items=inner_type)
+        else:
+          field_type = schema_table.FieldType(f_type)
 
         # --- Handle Description ---
         desc = ""
+        constant = None
         # Handle additional description text for constant
         if "const" in details:
-          desc += f"**Constant = {details.get('const')}**. "
+          constant = f"{details.get('const')}"
         # Special handling for UCP version
         elif version_data and ref == "#/$defs/version":
           desc += version_data.get("description", "")
@@ -820,30 +1928,42 @@ def define_env(env):
             desc += ref_schema.get("description", "")
 
         enum_values = details.get("enum")
+        if not (enum_values and isinstance(enum_values, list)):
+          enum_values = None
+
+        rows.append(
+          schema_table.Row(
+            field_name,
+            field_type,
+            field_name in required_list,
+            desc,
+            constant,
+            enum_values,
+          )
+        )
 
-        # --- Handle Enum ---
-        if enum_values and isinstance(enum_values, list):
-          # Format values like: `val1`, `val2`
-          formatted_enums = ", ".join([f"`{str(v)}`" for v in enum_values])
-          # Add a line break if description exists, then append Enum list
-          if desc:
-            desc += "<br>"
-          desc += f"**Enum:** {formatted_enums}"
-
-        # --- Handle Required ---
-        req_display = "**Yes**" if field_name in required_list else "No"
-
-        md.append(f"| {field_name} | {f_type} | {req_display} | {desc} |")
-
-    return "\n".join(md)
+    return table
 
   def _read_schema_from_defs(
     entity_name, spec_file_name, need_header=True, parent_required_list=None
   ):
     """Parse a standalone JSON Schema file with ref definitions.
 
-    Render a table.
+    Render a table, preceded by the definition's description when
+    need_header is set.
     """
+    table, desc = _table_from_defs(
+      entity_name, spec_file_name, need_header, parent_required_list
+    )
+    table = schema_table.markdown(table)
+    if desc and need_header:
+      return f"{desc}\n\n{table}"
+    return table
+
+  def _table_from_defs(
+    entity_name, spec_file_name, need_header=True, parent_required_list=None
+  ):
+    """Build the table for a $defs entry; returns (table, description)."""
     if ".json#/" not in entity_name:
       raise ValueError(
         f"Invalid entity name format for def: {entity_name}"
@@ -859,10 +1979,8 @@ def define_env(env):
         f"Malformed entity name: {entity_name}{get_error_context()}"
       ) from None
 
-    for schemas_dir in schemas_dirs:
-      full_path = Path(schemas_dir) / core_entity_name
-      if not full_path.exists():
-        continue
+    full_path = schemas.find(core_entity_name.removesuffix(".json"))
+    if full_path:
       # Use ucp-schema to resolve the full file with bundling
       bundled = _resolve_schema_bundled(full_path)
       if bundled:
@@ -881,22 +1999,18 @@ def define_env(env):
             embedded_schema_data = embedded_schema_data.copy()
             embedded_schema_data["allOf"] = new_all_of
 
-          table = _render_table_from_schema(
+          table = _table_from_schema(
             embedded_schema_data,
             spec_file_name,
             need_header,
             parent_required_list,
           )
-          desc = embedded_schema_data.get("description", "")
-          if desc and need_header:
-            return f"{desc}\n\n{table}"
-          return table
+          return table, embedded_schema_data.get("description", "")
         else:
           raise RuntimeError(
             f"Definition '{def_path}' not found in '{full_path}'"
             f"{get_error_context()}"
           )
-      # Try next directory if resolution failed
 
     raise FileNotFoundError(
       f"Schema file '{core_entity_name}' not found in any schema"
@@ -904,7 +2018,7 @@ def define_env(env):
     )
 
   # --- MACRO 1: For Standalone JSON Schemas ---
-  @env.macro
+  @macro
   def schema_fields(entity_name, spec_file_name):
     """Parse a standalone JSON Schema file and render a table.
 
@@ -922,35 +2036,13 @@ def define_env(env):
 
     """
     # Parse suffix to determine resolution direction/operation
-    direction = "response"
-    operation = "read"
-    base_name = entity_name
-
-    if entity_name.endswith("_resp"):
-      base_name = entity_name[:-5]  # Strip _resp
-      direction = "response"
-    elif entity_name.endswith("_req"):
-      # Pattern: entity_op_req (e.g., cart_create_req)
-      parts = entity_name[:-4].rsplit("_", 1)  # Strip _req, split on last _
-      if len(parts) == 2 and parts[1] in (
-        "create",
-        "update",
-        "complete",
-        "read",
-      ):
-        base_name, operation = parts
-        direction = "request"
-      else:
-        base_name = entity_name[:-4]
-        direction = "request"
+    base_name, direction, operation = _parse_entity_suffix(entity_name)
 
     # Build context for downstream link generation
     context = {"io_type": direction, "operation_id": operation}
 
-    for schemas_dir in schemas_dirs:
-      full_path = Path(schemas_dir) / (base_name + ".json")
-      if not full_path.exists():
-        continue
+    full_path = _find_schema_file(base_name)
+    if full_path:
       # Resolve WITHOUT bundling to preserve $refs for hyperlinks
       resolved_schema = _resolve_schema(
         full_path, direction, operation, bundle=False
@@ -971,7 +2063,7 @@ def define_env(env):
       f"{get_error_context()}."
     )
 
-  @env.macro
+  @macro
   def extension_schema_fields(entity_name, spec_file_name):
     """Parse a standalone JSON Schema file and render a table.
 
@@ -987,7 +2079,7 @@ def define_env(env):
     """
     return _read_schema_from_defs(entity_name, spec_file_name)
 
-  @env.macro
+  @macro
   def auto_generate_schema_reference(
     sub_dir=".",
     spec_file_name="reference",
@@ -1101,7 +2193,7 @@ def define_env(env):
     return "\n".join(output)
 
   # --- MACRO 2: For Standalone JSON Extensions ---
-  @env.macro
+  @macro
   def extension_fields(entity_name, spec_file_name):
     """Parse an extension schema file and render a table from its $defs.
 
@@ -1117,8 +2209,7 @@ def define_env(env):
     # Construct full path based on new structure
     full_path = SHOPPING_SCHEMAS_DIR / (entity_name + ".json")
     try:
-      with full_path.open(encoding="utf-8") as f:
-        data = json.load(f)
+      data = schemas.document(full_path)
 
       # Extension schemas have their composed type in $defs.checkout
       # or $defs.order_line_item.
@@ -1142,7 +2233,7 @@ def define_env(env):
       ) from e
 
   # --- MACRO 3: For Transport Operations ---
-  @env.macro
+  @macro
   def method_fields(operation_id, file_name, spec_file_name, io_type=None):
     """Extract Request/Response schemas for a specific OpenAPI operationId.
 
@@ -1156,64 +2247,21 @@ def define_env(env):
         both (if None).
 
     """
-    full_path = OPENAPI_DIR / file_name
-
     try:
-      with full_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-
-      # 1. Find the Operation Object by ID (search paths first, then webhooks)
-      operation = None
-      path_parameters = []
-
-      # Search in paths
-      paths = data.get("paths", {})
-      for _, path_item in paths.items():
-        for _, op_data in path_item.items():
-          if not isinstance(op_data, dict):
-            continue
-          if op_data.get("operationId") == operation_id:
-            operation = op_data
-            path_parameters = path_item.get("parameters", [])
-            break
-        if operation:
-          break
-
-      # If not found in paths, search in webhooks (OpenAPI 3.1+)
-      if not operation:
-        webhooks = data.get("webhooks", {})
-        for _, webhook_item in webhooks.items():
-          for _, op_data in webhook_item.items():
-            if not isinstance(op_data, dict):
-              continue
-            if op_data.get("operationId") == operation_id:
-              operation = op_data
-              break
-          if operation:
-            break
-
-      if not operation:
+      # 1. Find the Operation Object by ID (paths first, then webhooks, then
+      # OpenRPC methods)
+      data, index = _operation_index(file_name)
+      entry = index.get(operation_id)
+      if entry is None:
         raise ValueError(
           f"Operation ID `{operation_id}` not found{get_error_context()}."
         )
 
-      # 2. Extract Request Schema
-      req_content = operation.get("requestBody", {}).get("content", {})
-      req_schema = req_content.get("application/json", {}).get("schema", {})
-
-      # 3. Extract Parameters (Path + Operation)
-      op_parameters = operation.get("parameters", [])
-      all_parameters = path_parameters + op_parameters
-
-      # 4. Extract Response Schema
-      success_response_codes = ["200", "201"]
-      res_schema = {}
-      res = operation.get("responses", {})
-      for code in success_response_codes:
-        if code in res:
-          res_content = res.get(code, {}).get("content", {})
-          res_schema = res_content.get("application/json", {}).get("schema", {})
-          break
+      # 2-4. Request schema, parameters (path + operation) and the success
+      # response schema, precomputed by the index.
+      req_schema = entry.request_schema
+      all_parameters = entry.parameters
+      res_schema = entry.response_schema
 
       # --- FIX: Targeted Reference Resolution ---
       # We only resolve the top-level ref and 'allOf' children.
@@ -1238,7 +2286,8 @@ def define_env(env):
               new_all_of.append(resolved if resolved else item)
             else:
               new_all_of.append(item)
-          schema["allOf"] = new_all_of
+          # Copy: `schema` belongs to the shared, cached spec.
+          schema = {**schema, "allOf": new_all_of}
         return schema
 
       req_schema = resolve_structure(req_schema, data)
@@ -1254,13 +2303,6 @@ def define_env(env):
         param_props = {}
         param_required_fields = []
         for param in all_parameters:
-          # Resolve param refs explicitly if needed (rare for params but good
-          # safety)
-          if "$ref" in param and param["$ref"].startswith("#/"):
-            resolved = _resolve_json_pointer(param["$ref"], data)
-            if resolved:
-              param = resolved
-
           # Filter out headers (transport-specific)
           if param.get("in") == "header":
             continue
@@ -1335,7 +2377,7 @@ def define_env(env):
       ) from e
 
   # --- MACRO 4: For HTTP Headers ---
-  @env.macro
+  @macro
   def header_fields(operation_id, file_name):
     """Extract HTTP headers for a specific OpenAPI operationId.
 
@@ -1345,71 +2387,25 @@ def define_env(env):
       file_name: The name of the OpenAPI file to read.
 
     """
-    full_path = OPENAPI_DIR / file_name
-
     try:
-      with full_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-
       # 1. Find the Operation Object by ID
-      operation = None
-      path_parameters = []
-      paths = data.get("paths", {})
-      for _, path_item in paths.items():
-        for _, op_data in path_item.items():
-          if not isinstance(op_data, dict):
-            continue
-
-          if op_data.get("operationId") == operation_id:
-            operation = op_data
-            # Extract parameters defined at the path level
-            path_parameters = path_item.get("parameters", [])
-            break
-        if operation:
-          break
-
-      if not operation:
+      _, index = _operation_index(file_name)
+      entry = index.get(operation_id)
+      if entry is None:
         raise ValueError(
           f"Operation ID `{operation_id}` not found{get_error_context()}."
         )
 
-      # 2. Extract Request Parameters (Path + Operation)
-      op_parameters = operation.get("parameters", [])
-      all_parameters = path_parameters + op_parameters
-
-      req_headers = []
-      for param in all_parameters:
-        # Resolve reference if needed
-        if "$ref" in param:
-          resolved = _resolve_json_pointer(param["$ref"], data)
-          if resolved:
-            param = resolved
-          else:
-            continue
+      # 2. Request headers among the (path + operation) parameters; refs
+      # the index could not resolve are skipped.
+      req_headers = [
+        param
+        for param in entry.parameters
+        if "$ref" not in param and param.get("in") == "header"
+      ]
 
-        if param.get("in") == "header":
-          req_headers.append(param)
-
-      # 3. Extract Response Headers (Assumes 200 OK)
-      res_headers_defs = (
-        operation.get("responses", {}).get("200", {}).get("headers", {})
-      )
-      res_headers = []
-      for name, header in res_headers_defs.items():
-        if "$ref" in header:
-          resolved = _resolve_json_pointer(header["$ref"], data)
-          if resolved:
-            h = resolved.copy()
-            h["name"] = name
-            res_headers.append(h)
-          else:
-            # If ref not resolved, just use name
-            h = {"name": name, "description": "Ref not resolved"}
-            res_headers.append(h)
-        else:
-          h = header.copy()
-          h["name"] = name
-          res_headers.append(h)
+      # 3. Response Headers (Assumes 200 OK)
+      res_headers = entry.response_headers
 
       if not req_headers and not res_headers:
         return "_No headers defined._"
@@ -1443,3 +2439,8 @@ def define_env(env):
       raise RuntimeError(
         f"Error processing OpenAPI: {e}{get_error_context()}"
       ) from e
+
+  # Every macro is registered; evaluate the pages' calls up front.
+  if prerender:
+    count = _prerender(macros, docs_dir)
+    log.info(f"Prerendered {count} macro calls from {docs_dir}")
@@ -0,0 +1,137 @@
+"""Timers and counters for profiling a docs build.
+
+main.py wraps every docs macro and schema resolution in a BuildProfile
+when profiling is enabled, then writes the collected numbers to
+build-profile.json and logs a top-N summary at the end of the build.
+When profiling is off no BuildProfile exists and nothing is wrapped.
+
+Environment:
+  UCP_DOCS_PROFILE=1      write build-profile.json in the working directory
+  UCP_DOCS_PROFILE=PATH   write the report to PATH instead
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+DEFAULT_REPORT = Path("build-profile.json")
+
+
+class BuildProfile:
+  """Thread-safe accumulator of call timings, counters and page times."""
+
+  def __init__(self, report_path: str | Path = DEFAULT_REPORT) -> None:
+    """Initialize an empty profile that reports to `report_path`."""
+    self.report_path = Path(report_path)
+    self.started = time.perf_counter()
+    self._lock = threading.Lock()
+    # name -> [calls, total seconds, max seconds]
+    self._timers: dict[str, list] = defaultdict(lambda: [0, 0.0, 0.0])
+    self._counters: dict[str, int] = defaultdict(int)
+    self._pages: dict[str, float] = {}
+    self._page_started: dict[str, float] = {}
+
+  def record(self, name: str, seconds: float) -> None:
+    """Add one timed call of `name`."""
+    with self._lock:
+      timer = self._timers[name]
+      timer[0] += 1
+      timer[1] += seconds
+      timer[2] = max(timer[2], seconds)
+
+  def count(self, name: str, n: int = 1) -> None:
+    """Increment counter `name` by `n`."""
+    with self._lock:
+      self._counters[name] += n
+
+  def set_counter(self, name: str, value: int) -> None:
+    """Set counter `name` (for totals gathered elsewhere)."""
+    with self._lock:
+      self._counters[name] = value
+
+  def timed(self, fn: Callable, name: str | None = None) -> Callable:
+    """Wrap `fn` so every call is recorded under `name` (default: its name)."""
+    label = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+      start = time.perf_counter()
+      try:
+        return fn(*args, **kwargs)
+      finally:
+        self.record(label, time.perf_counter() - start)
+
+    return wrapper
+
+  def page_start(self, page: str) -> None:
+    """Mark the start of macro rendering for `page`."""
+    start = time.perf_counter()
+    with self._lock:
+      self._page_started[page] = start
+
+  def page_end(self, page: str) -> None:
+    """Mark the end of macro rendering for `page`."""
+    end = time.perf_counter()
+    with self._lock:
+      start = self._page_started.pop(page, None)
+      if start is not None:
+        self._pages[page] = self._pages.get(page, 0.0) + end - start
+
+  def report(self) -> dict:
+    """Return the profile as a JSON-serializable dict."""
+    with self._lock:
+      timers = {
+        name: {
+          "calls": calls,
+          "total_ms": round(total * 1000, 3),
+          "mean_ms": round(total * 1000 / calls, 3) if calls else 0.0,
+          "max_ms": round(peak * 1000, 3),
+        }
+        for name, (calls, total, peak) in sorted(
+          self._timers.items(), key=lambda kv: -kv[1][1]
+        )
+      }
+      pages = {
+        page: round(seconds * 1000, 3)
+        for page, seconds in sorted(self._pages.items(), key=lambda kv: -kv[1])
+      }
+      counters = dict(sorted(self._counters.items()))
+    return {
+      "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+      "timers": timers,
+      "counters": counters,
+      "pages_ms": pages,
+    }
+
+  def summary(self, top_n: int = 10) -> list[str]:
+    """Human-readable top-N lines for the build log."""
+    report = self.report()
+    lines = [f"Build profile ({report['wall_ms']:.0f} ms wall):"]
+    for name, t in list(report["timers"].items())[:top_n]:
+      lines.append(
+        f"  {name}: {t['calls']} calls, {t['total_ms']:.1f} ms total,"
+        f" {t['max_ms']:.1f} ms max"
+      )
+    for page, ms in list(report["pages_ms"].items())[:top_n]:
+      lines.append(f"  page {page}: {ms:.1f} ms")
+    for name, value in report["counters"].items():
+      lines.append(f"  {name} = {value}")
+    return lines
+
+  def write(self) -> Path:
+    """Write the report to report_path and return the path."""
+    self.report_path.write_text(json.dumps(self.report(), indent=2) + "\n")
+    return self.report_path
+
+
+def from_env() -> BuildProfile | None:
+  """Build the profile requested by UCP_DOCS_PROFILE, or None if off."""
+  value = os.environ.get("UCP_DOCS_PROFILE", "")
+  if value in ("", "0"):
+    return None
+  return BuildProfile(DEFAULT_REPORT if value == "1" else value)
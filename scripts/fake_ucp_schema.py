@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Fake ucp-schema CLI used as a test double by the scripts/ test suites.
+
+Implements just enough of the real binary's surface for the Python
+tooling to be exercised without the Rust build:
+
+  fake_ucp_schema.py --version
+  fake_ucp_schema.py resolve PATH (--request|--response) --op OP
+                     [--bundle] [--pretty]
+  fake_ucp_schema.py serve        newline-delimited JSON on stdin/stdout
+  fake_ucp_schema.py validate INSTANCE... --schema PATH
+                     (--request|--response) --op OP --json
+                     (INSTANCE `-` reads JSON Lines from stdin)
+
+"Resolving" returns the schema file unchanged plus an `x-resolved`
+member recording the flags, so tests can assert which variant was
+requested. It performs no annotation processing.
+
+"Validating" only checks the schema's top-level `required` members and
+the JSON type of top-level `properties`.
+One instance prints a {"valid", "errors"} object; several print a list
+of them, in instance order.
+
+Environment:
+  FAKE_UCP_SCHEMA_LOG=PATH     append one line per process start
+                               (the subcommand name) — lets tests count
+                               spawns
+  FAKE_UCP_SCHEMA_NO_SERVE=1   reject `serve` like an older CLI would
+  FAKE_UCP_SCHEMA_SERVE_GARBAGE=1
+                               answer every `serve` request with a line
+                               that is not JSON
+  FAKE_UCP_SCHEMA_NO_BATCH=1   reject more than one validate instance
+  FAKE_UCP_SCHEMA_NO_STDIN=1   treat validate instance `-` as a file name
+  FAKE_UCP_SCHEMA_NO_STDIN=json
+                               ... and report the read error as --json
+                               output rather than on stderr
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+VERSION = "ucp-schema 0.0.0-fake"
+
+
+def _resolve(schema: str, direction: str, op: str, bundle: bool) -> dict:
+  data = json.loads(Path(schema).read_text())
+  data["x-resolved"] = {"direction": direction, "op": op, "bundle": bundle}
+  return data
+
+
+_TYPES = {
+  "string": str,
+  "object": dict,
+  "array": list,
+  "boolean": bool,
+  "integer": int,
+}
+
+
+def _validate(data, schema: dict) -> dict:
+  if not isinstance(data, dict):
+    return {"valid": False, "errors": [{"path": "", "message": "not object"}]}
+  errors = [
+    {"path": "", "message": f"missing required property '{name}'"}
+    for name in schema.get("required", [])
+    if name not in data
+  ]
+  for name, prop in schema.get("properties", {}).items():
+    expected = _TYPES.get(prop.get("type"))
+    if name in data and expected and not isinstance(data[name], expected):
+      errors.append({"path": f"/{name}", "message": f"not {prop['type']}"})
+  return {"valid": not errors, "errors": errors}
+
+
+def _serve() -> int:
+  for line in sys.stdin:
+    if os.environ.get("FAKE_UCP_SCHEMA_SERVE_GARBAGE"):
+      sys.stdout.write("thread 'main' panicked\n")
+      sys.stdout.flush()
+      continue
+    msg = json.loads(line)
+    params = msg.get("params", {})
+    try:
+      if msg.get("method") != "resolve":
+        raise ValueError(f"unknown method {msg.get('method')!r}")
+      result = _resolve(
+        params["schema"],
+        params.get("direction", "response"),
+        params.get("op", "read"),
+        bool(params.get("bundle")),
+      )
+      reply = {"id": msg.get("id"), "result": result}
+    except (OSError, ValueError, KeyError) as e:
+      reply = {"id": msg.get("id"), "error": {"message": str(e)}}
+    sys.stdout.write(json.dumps(reply) + "\n")
+    sys.stdout.flush()
+  return 0
+
+
+def main(argv: list[str]) -> int:
+  """Dispatch a fake ucp-schema invocation."""
+  log = os.environ.get("FAKE_UCP_SCHEMA_LOG")
+  if log:
+    with Path(log).open("a") as f:
+      f.write(f"{argv[0] if argv else ''}\n")
+
+  if argv == ["--version"]:
+    print(VERSION)
+    return 0
+
+  if argv and argv[0] == "serve":
+    if os.environ.get("FAKE_UCP_SCHEMA_NO_SERVE"):
+      print("error: unrecognized subcommand 'serve'", file=sys.stderr)
+      return 2
+    return _serve()
+
+  if argv and argv[0] == "resolve":
+    schema = argv[1]
+    direction = "request" if "--request" in argv else "response"
+    op = argv[argv.index("--op") + 1] if "--op" in argv else "read"
+    try:
+      result = _resolve(schema, direction, op, "--bundle" in argv)
+    except (OSError, ValueError) as e:
+      print(f"error: {e}", file=sys.stderr)
+      return 1
+    print(json.dumps(result, indent=2 if "--pretty" in argv else None))
+    return 0
+
+  if argv and argv[0] == "validate" and "--schema" in argv:
+    at = argv.index("--schema")
+    paths = [a for a in argv[1:at] if not a.startswith("--")]
+    if "-" in paths and os.environ.get("FAKE_UCP_SCHEMA_NO_STDIN") == "json":
+      error = {"path": "", "message": "cannot read file '-'"}
+      print(json.dumps({"valid": False, "errors": [error]}))
+      return 1
+    try:
+      instances = [
+        json.loads(text)
+        for path in paths
+        for text in (
+          sys.stdin.read().splitlines()
+          if path == "-" and not os.environ.get("FAKE_UCP_SCHEMA_NO_STDIN")
+          else [Path(path).read_text()]
+        )
+        if text.strip()
+      ]
+    except (OSError, ValueError) as e:
+      print(f"error: {e}", file=sys.stderr)
+      return 1
+    if len(instances) > 1 and os.environ.get("FAKE_UCP_SCHEMA_NO_BATCH"):
+      print("error: expected a single instance", file=sys.stderr)
+      return 2
+    try:
+      schema = json.loads(Path(argv[at + 1]).read_text())
+      results = [_validate(i, schema) for i in instances]
+    except (OSError, ValueError) as e:
+      print(f"error: {e}", file=sys.stderr)
+      return 1
+    print(json.dumps(results[0] if len(results) == 1 else results))
+    return 0 if all(r["valid"] for r in results) else 1
+
+  print(f"error: unsupported arguments {argv!r}", file=sys.stderr)
+  return 2
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Manifest of the source files the docs build publishes into site/.
+
+hooks.on_post_build copies every file under source/ into the site,
+rewriting JSON schemas on the way (absolute $refs, versions). The
+manifest, written to site/publish-manifest.json, records for each source
+file its sha256, the output path and the output's sha256 (plus those of
+outputs derived from it, see schema_artifacts.py), under a key
+covering everything else the output depends on: the transform rule
+version, the configured versions and the $ids of all source schemas.
+
+On the next build into the same site directory (`mkdocs serve`,
+`mkdocs build --dirty`) a file whose source hash and key are unchanged
+and whose output is still on disk with the recorded hash is skipped.
+
+CLI:
+  publish_manifest.py --check site/ [--source source/]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+MANIFEST_NAME = "publish-manifest.json"
+
+# Bump when the manifest layout changes.
+_FORMAT = 1
+
+
+def sha256_file(path: str | Path) -> str:
+  """Return the hex sha256 of a file's bytes."""
+  return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class Manifest:
+  """Source path -> published output, for one site directory."""
+
+  def __init__(self, site_dir: str | Path, key: dict) -> None:
+    """Initialize an empty manifest for `site_dir` built under `key`."""
+    self.site_dir = Path(site_dir)
+    self.key = key
+    self.files: dict[str, dict] = {}
+    self._previous: dict[str, dict] = {}
+
+  @classmethod
+  def load(cls, site_dir: str | Path, key: dict) -> "Manifest":
+    """Return a manifest that remembers the last build's entries.
+
+    Entries are only remembered when that build used the same `key`;
+    a missing or unreadable manifest is treated as empty.
+    """
+    manifest = cls(site_dir, key)
+    data = _read(manifest.path)
+    if data and data.get("format") == _FORMAT and data.get("key") == key:
+      manifest._previous = data.get("files", {})
+    return manifest
+
+  @property
+  def path(self) -> Path:
+    """Where the manifest lives."""
+    return self.site_dir / MANIFEST_NAME
+
+  def fresh(self, source: str, source_sha256: str) -> bool:
+    """Whether `source` is published and unchanged since the last build.
+
+    A fresh entry is carried over into this build's manifest.
+    """
+    entry = self._previous.get(source)
+    if not entry or entry.get("source_sha256") != source_sha256:
+      return False
+    for output, digest in _outputs(entry).items():
+      path = self.site_dir / output
+      if not path.is_file() or sha256_file(path) != digest:
+        return False
+    self.files[source] = entry
+    return True
+
+  def record(
+    self,
+    source: str,
+    source_sha256: str,
+    output: str,
+    output_sha256: str,
+    derived: dict[str, str] | None = None,
+    meta: dict | None = None,
+  ) -> None:
+    """Record that `source` was published to `output` (site-relative).
+
+    `derived` maps further outputs written from the same source to their
+    sha256; `meta` is anything else the build wants back for an unchanged
+    file on the next run.
+    """
+    self.files[source] = {
+      "source_sha256": source_sha256,
+      "output": output,
+      "output_sha256": output_sha256,
+    }
+    if derived:
+      self.files[source]["derived"] = dict(sorted(derived.items()))
+    if meta:
+      self.files[source]["meta"] = meta
+
+  def write(self) -> Path:
+    """Write the manifest into the site directory and return its path."""
+    data = {
+      "format": _FORMAT,
+      "key": self.key,
+      "files": dict(sorted(self.files.items())),
+    }
+    self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    return self.path
+
+
+def _outputs(entry: dict) -> dict[str, str]:
+  """Every site path an entry wrote, with its sha256."""
+  return {entry["output"]: entry["output_sha256"], **entry.get("derived", {})}
+
+
+def _read(path: Path) -> dict | None:
+  try:
+    data = json.loads(path.read_text(encoding="utf-8"))
+  except (OSError, ValueError):
+    return None
+  return data if isinstance(data, dict) else None
+
+
+def check(site_dir: str | Path, source_dir: str | Path | None = None) -> list:
+  """Verify a site against its manifest; return the problems found.
+
+  Every recorded output must exist with the recorded hash. With
+  `source_dir`, every recorded source must also be unchanged and every
+  file under it recorded.
+  """
+  site_dir = Path(site_dir)
+  data = _read(site_dir / MANIFEST_NAME)
+  if data is None:
+    return [f"{site_dir / MANIFEST_NAME}: missing or unreadable"]
+  if data.get("format") != _FORMAT:
+    return [f"{site_dir / MANIFEST_NAME}: unknown format {data.get('format')}"]
+
+  problems = []
+  files = data.get("files", {})
+  for source, entry in files.items():
+    for output, digest in _outputs(entry).items():
+      if not (site_dir / output).is_file():
+        problems.append(f"{output}: missing (from {source})")
+      elif sha256_file(site_dir / output) != digest:
+        problems.append(f"{output}: modified since published")
+    if source_dir is None:
+      continue
+    src = Path(source_dir) / source
+    if not src.is_file():
+      problems.append(f"{source}: source no longer exists")
+    elif sha256_file(src) != entry["source_sha256"]:
+      problems.append(f"{source}: source changed since published")
+  if source_dir is not None:
+    for src in sorted(Path(source_dir).rglob("*")):
+      source = src.relative_to(source_dir).as_posix()
+      if src.is_file() and source not in files:
+        problems.append(f"{source}: not published")
+  return problems
+
+
+def main() -> int:
+  """Verify a built site against its publish manifest."""
+  parser = argparse.ArgumentParser(
+    description=__doc__,
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+  )
+  parser.add_argument("site_dir", type=Path, help="Built site directory")
+  parser.add_argument(
+    "--check",
+    action="store_true",
+    required=True,
+    help="Verify every published output against the manifest",
+  )
+  parser.add_argument(
+    "--source",
+    type=Path,
+    default=None,
+    help="Also verify the manifest is current for this source directory",
+  )
+  args = parser.parse_args()
+
+  problems = check(args.site_dir, args.source)
+  for problem in problems:
+    print(problem)
+  if problems:
+    print(f"\n{len(problems)} problem(s)")
+    return 1
+  print("Manifest OK")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,103 @@
+"""Derived forms of the published schemas, for clients rather than readers.
+
+hooks.on_post_build publishes every schema as indented JSON. Next to each
+one it also writes, from the same document:
+
+  X.min.json      the schema without whitespace
+  X.json.gz       X.json gzip-compressed, for servers that serve
+                  precompressed siblings (nginx gzip_static and the like)
+
+and for every named entity (capabilities, services, handlers):
+
+  X.bundle.json   the schema with every document it references, directly
+                  or not, embedded under $defs (minified), plus .gz
+
+Bundles follow the JSON Schema 2020-12 bundling convention: embedded
+schemas keep their `$id`, keyed by it in `$defs`, and no `$ref` is
+rewritten, so a validator resolves the same refs without fetching.
+
+Environment:
+  UCP_DOCS_SCHEMA_ARTIFACTS=0   publish only the indented schemas
+"""
+
+import gzip
+import json
+import os
+from collections.abc import Callable
+from urllib.parse import urldefrag, urljoin
+
+
+def enabled() -> bool:
+  """Whether the build should write the derived artifacts."""
+  return os.environ.get("UCP_DOCS_SCHEMA_ARTIFACTS", "1") != "0"
+
+
+def min_path(output: str) -> str:
+  """schemas/x.json -> schemas/x.min.json."""
+  return output.removesuffix(".json") + ".min.json"
+
+
+def bundle_path(output: str) -> str:
+  """schemas/x.json -> schemas/x.bundle.json."""
+  return output.removesuffix(".json") + ".bundle.json"
+
+
+def gz_path(output: str) -> str:
+  """schemas/x.json -> schemas/x.json.gz."""
+  return output + ".gz"
+
+
+def minify(data) -> bytes:
+  """Serialize `data` as compact UTF-8 JSON."""
+  return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def compress(raw: bytes) -> bytes:
+  """Gzip `raw` reproducibly (no timestamp), at maximum compression."""
+  return gzip.compress(raw, compresslevel=9, mtime=0)
+
+
+def is_bundle_root(data) -> bool:
+  """Whether a published document is a named entity worth bundling."""
+  return isinstance(data, dict) and "name" in data and "$id" in data
+
+
+def _refs(doc: dict, base: str):
+  """Yield the absolute document URL of every non-local $ref in `doc`."""
+  stack = [doc]
+  while stack:
+    node = stack.pop()
+    if isinstance(node, dict):
+      ref = node.get("$ref")
+      if isinstance(ref, str) and not ref.startswith("#"):
+        url = urldefrag(urljoin(base, ref))[0]
+        if url.startswith(("http://", "https://")):
+          yield url
+      stack.extend(node.values())
+    elif isinstance(node, list):
+      stack.extend(node)
+
+
+def bundle(root: dict, load: Callable[[str], dict | None]) -> dict:
+  """Return `root` with its whole $ref closure embedded under $defs.
+
+  `load(url)` returns the published document for a schema URL, or None
+  for documents that are not published (those refs are left to be
+  fetched).
+  """
+  root_id = urldefrag(root["$id"])[0]
+  embedded: dict[str, dict] = {}
+  stack = list(_refs(root, root_id))
+  while stack:
+    url = stack.pop()
+    if url == root_id or url in embedded:
+      continue
+    doc = load(url)
+    if not isinstance(doc, dict):
+      continue
+    embedded[url] = doc
+    stack.extend(_refs(doc, urldefrag(doc.get("$id", url))[0]))
+  if not embedded:
+    return root
+  defs = {**root.get("$defs", {}), **dict(sorted(embedded.items()))}
+  return {**root, "$defs": defs}
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Persistent, content-addressed cache for `ucp-schema resolve` output.
+
+The docs build (main.py) resolves every (schema, direction, op, bundle)
+variant through the ucp-schema CLI. Results only change when the schema,
+something it references, the flags, or the CLI itself change, so they are
+stored on disk under a key derived from exactly those inputs:
+
+  - which schema is resolved (its file name),
+  - the schema file and its transitive relative-$ref closure (contents,
+    not mtimes — a checkout or `git stash` round-trip still hits),
+  - the resolve flags (direction, op, bundle),
+  - the `ucp-schema --version` string.
+
+Entries are plain JSON files sharded by key prefix. Total size is capped;
+when a write pushes the cache over the cap, least-recently-used entries
+(by mtime, refreshed on every hit) are evicted first.
+
+Environment:
+  UCP_SCHEMA_CACHE=0           disable the disk cache entirely
+  UCP_SCHEMA_CACHE_DIR=PATH    cache location (default: .cache/ucp-schema)
+  UCP_SCHEMA_CACHE_MAX_MB=N    size cap in MiB (default: 64)
+
+CLI:
+  schema_cache.py --stats
+  schema_cache.py --clear
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(".cache") / "ucp-schema"
+DEFAULT_MAX_MB = 64
+
+# Bump when the key derivation or entry layout changes so stale entries
+# written by an older build are never read back.
+_KEY_SCHEMA = "ucp-schema-cache/v2"
+
+# -----------------------------------------------------------
+# Key derivation
+# -----------------------------------------------------------
+
+
+def _iter_refs(node):
+  """Yield every $ref string in a JSON document."""
+  if isinstance(node, dict):
+    for key, value in node.items():
+      if key == "$ref" and isinstance(value, str):
+        yield value
+      else:
+        yield from _iter_refs(value)
+  elif isinstance(node, list):
+    for item in node:
+      yield from _iter_refs(item)
+
+
+def ref_closure(schema_path: str | Path) -> list[Path]:
+  """Return the schema plus every file reachable through relative $refs.
+
+  Fragment-only refs (#/...) and absolute URLs are ignored; missing or
+  unparsable targets are still included so their absence is part of the
+  key. The result is sorted for stable hashing.
+  """
+  root = Path(schema_path).resolve()
+  seen: set[Path] = set()
+  stack = [root]
+  while stack:
+    path = stack.pop()
+    if path in seen:
+      continue
+    seen.add(path)
+    try:
+      data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+      continue
+    for ref in _iter_refs(data):
+      target = ref.split("#", 1)[0]
+      if not target or target.startswith(("http://", "https://")):
+        continue
+      stack.append((path.parent / target).resolve())
+  return sorted(seen)
+
+
+def cache_key(
+  schema_path: str | Path,
+  flags: tuple,
+  cli_version: str,
+) -> str:
+  """Derive the content-addressed key for one resolve invocation."""
+  digest = hashlib.sha256()
+  digest.update(_KEY_SCHEMA.encode())
+  digest.update(b"\0" + cli_version.encode())
+  digest.update(b"\0" + json.dumps(list(flags)).encode())
+  # Schemas that $ref each other share a closure; the root tells them apart.
+  digest.update(b"\0" + Path(schema_path).name.encode())
+  root_dir = Path(schema_path).resolve().parent
+  for path in ref_closure(schema_path):
+    try:
+      content = path.read_bytes()
+    except OSError:
+      content = b"<missing>"
+    # Paths are hashed relative to the root schema so a checkout in a
+    # different directory (CI worktree, mike build_temp) shares entries.
+    rel = os.path.relpath(path, root_dir)
+    digest.update(b"\0" + rel.encode())
+    digest.update(b"\0" + hashlib.sha256(content).digest())
+  return digest.hexdigest()
+
+
+@functools.cache
+def cli_version(binary: str = "ucp-schema") -> str | None:
+  """Return `ucp-schema --version` output, or None if unavailable."""
+  try:
+    result = subprocess.run(
+      [binary, "--version"],
+      capture_output=True,
+      text=True,
+      check=False,
+    )
+  except OSError:
+    return None
+  if result.returncode != 0:
+    return None
+  return result.stdout.strip()
+
+
+# -----------------------------------------------------------
+# Disk store
+# -----------------------------------------------------------
+
+
+class SchemaCache:
+  """Size-capped LRU store of JSON documents keyed by content hash.
+
+  Safe to use from any thread: entries are written outside the lock, but
+  replacing them, the usage tally and eviction happen under it.
+  """
+
+  def __init__(self, root: str | Path, max_bytes: int) -> None:
+    """Initialize a cache rooted at `root` holding at most `max_bytes`."""
+    self.root = Path(root)
+    self.max_bytes = max_bytes
+    self._usage: int | None = None
+    self._lock = threading.Lock()
+
+  def _entry(self, key: str) -> Path:
+    return self.root / key[:2] / f"{key}.json"
+
+  def _entries(self) -> list[tuple[float, int, Path]]:
+    """List (mtime, size, path) for every entry, oldest first."""
+    entries = []
+    if not self.root.is_dir():
+      return entries
+    for path in self.root.glob("*/*.json"):
+      try:
+        st = path.stat()
+      except OSError:
+        continue
+      entries.append((st.st_mtime, st.st_size, path))
+    entries.sort()
+    return entries
+
+  def get(self, key: str) -> dict | None:
+    """Return the cached document for `key`, or None on a miss."""
+    path = self._entry(key)
+    try:
+      data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+      return None
+    # Refresh recency for LRU eviction; a read-only cache dir still hits.
+    with contextlib.suppress(OSError):
+      os.utime(path)
+    return data
+
+  def put(self, key: str, data: dict) -> None:
+    """Store `data` under `key`, evicting old entries past the size cap."""
+    path = self._entry(key)
+    payload = json.dumps(data, separators=(",", ":")).encode()
+    try:
+      path.parent.mkdir(parents=True, exist_ok=True)
+      # Write-then-rename so concurrent builds never read a torn entry.
+      fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+      with os.fdopen(fd, "wb") as f:
+        f.write(payload)
+    except OSError:
+      return
+    with self._lock:
+      try:
+        replaced = path.stat().st_size
+      except OSError:
+        replaced = 0
+      try:
+        Path(tmp).replace(path)
+      except OSError:
+        with contextlib.suppress(OSError):
+          Path(tmp).unlink()
+        return
+      if self._usage is None:
+        self._usage = sum(size for _, size, _ in self._entries())
+      else:
+        self._usage += len(payload) - replaced
+      if self._usage > self.max_bytes:
+        self._evict()
+
+  def evict(self) -> int:
+    """Drop least-recently-used entries until under the cap."""
+    with self._lock:
+      return self._evict()
+
+  def _evict(self) -> int:
+    entries = self._entries()
+    usage = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+      if usage <= self.max_bytes:
+        break
+      with contextlib.suppress(OSError):
+        path.unlink()
+        usage -= size
+        removed += 1
+    self._usage = usage
+    return removed
+
+  def clear(self) -> None:
+    """Remove every entry."""
+    with self._lock:
+      shutil.rmtree(self.root, ignore_errors=True)
+      self._usage = 0
+
+  def stats(self) -> dict:
+    """Return entry count and total size."""
+    entries = self._entries()
+    return {
+      "path": str(self.root),
+      "entries": len(entries),
+      "bytes": sum(size for _, size, _ in entries),
+      "max_bytes": self.max_bytes,
+    }
+
+
+def from_env() -> SchemaCache | None:
+  """Build the cache configured by UCP_SCHEMA_CACHE_* env vars."""
+  if os.environ.get("UCP_SCHEMA_CACHE", "1") == "0":
+    return None
+  root = os.environ.get("UCP_SCHEMA_CACHE_DIR") or DEFAULT_CACHE_DIR
+  value = os.environ.get("UCP_SCHEMA_CACHE_MAX_MB")
+  try:
+    max_mb = int(value) if value else DEFAULT_MAX_MB
+  except ValueError:
+    print(
+      f"warning: UCP_SCHEMA_CACHE_MAX_MB={value!r} is not an integer; "
+      f"using {DEFAULT_MAX_MB}",
+      file=sys.stderr,
+    )
+    max_mb = DEFAULT_MAX_MB
+  return SchemaCache(root, max_mb * 1024 * 1024)
+
+
+# -----------------------------------------------------------
+# CLI
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Inspect or clear the resolve cache."""
+  parser = argparse.ArgumentParser(
+    description=__doc__,
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+  )
+  parser.add_argument(
+    "--cache-dir",
+    type=Path,
+    default=None,
+    help="Cache directory (default: $UCP_SCHEMA_CACHE_DIR or "
+    f"{DEFAULT_CACHE_DIR})",
+  )
+  action = parser.add_mutually_exclusive_group(required=True)
+  action.add_argument(
+    "--clear", action="store_true", help="Delete every cached entry"
+  )
+  action.add_argument(
+    "--stats", action="store_true", help="Print entry count and size"
+  )
+  args = parser.parse_args()
+
+  cache = from_env() or SchemaCache(DEFAULT_CACHE_DIR, 0)
+  if args.cache_dir:
+    cache.root = args.cache_dir
+
+  if args.clear:
+    cache.clear()
+    print(f"Cleared {cache.root}")
+  else:
+    print(json.dumps(cache.stats(), indent=2))
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,240 @@
+"""In-process Python implementation of `ucp-schema resolve`.
+
+Applies the UCP visibility annotations to a schema file and optionally
+bundles it, following what the CLI does for
+
+  ucp-schema resolve PATH (--request|--response) --op OP [--bundle]
+
+scripts/test_schema_resolver.py compares the two on every source schema
+when the ucp-schema binary is on PATH (as it is in CI).
+
+Annotations (on any property schema):
+
+  ucp_request / ucp_response: "omit" | "optional" | "required"
+      or a per-operation object, e.g. {"create": "omit",
+      "update": "required"}; operations missing from the object leave
+      the property untouched.
+
+  "omit" drops the property (and its `required` entry), "required"
+  appends it to the parent's `required` list, "optional" removes it from
+  that list. Both annotations are stripped from the output; other keys,
+  and properties or $defs whose names start with `ucp_`, are kept.
+
+Bundling inlines every $ref that points into another file (with or
+without a fragment); refs inside inlined documents are inlined as well,
+so the result is self-contained. Fragment-only refs in the root document
+are kept, along with its $defs, as the CLI does. Ref cycles are left as
+$ref.
+
+Backend selection for callers (main.py, validate_examples.py):
+
+  UCP_SCHEMA_RESOLVER=cli      shell out to ucp-schema (default)
+  UCP_SCHEMA_RESOLVER=python   use this module
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+# Stands in for `ucp-schema --version` in persistent cache keys; bump
+# whenever resolve output changes.
+VERSION = "ucp-schema-py 2"
+
+BACKENDS = ("cli", "python")
+
+_ANNOTATIONS = {"request": "ucp_request", "response": "ucp_response"}
+
+# Keywords whose members are named subschemas: the names are data, not
+# annotations, so they are never stripped.
+_SCHEMA_MAPS = frozenset(
+  {
+    "properties",
+    "patternProperties",
+    "dependentSchemas",
+    "$defs",
+    "definitions",
+  }
+)
+
+
+class SchemaResolveError(RuntimeError):
+  """A schema (or something it references) could not be resolved."""
+
+
+def backend() -> str:
+  """Return the resolver backend selected by UCP_SCHEMA_RESOLVER."""
+  name = os.environ.get("UCP_SCHEMA_RESOLVER", "cli")
+  if name not in BACKENDS:
+    raise ValueError(
+      f"UCP_SCHEMA_RESOLVER must be one of {', '.join(BACKENDS)}, got {name!r}"
+    )
+  return name
+
+
+# -----------------------------------------------------------
+# Annotations
+# -----------------------------------------------------------
+
+
+def _visibility(annotation: Any, op: str) -> str | None:
+  if isinstance(annotation, dict):
+    return annotation.get(op)
+  return annotation
+
+
+def _apply_annotations(node: Any, key: str, op: str) -> Any:
+  """Return a copy of `node` with `key` annotations applied and stripped."""
+  if isinstance(node, list):
+    return [_apply_annotations(item, key, op) for item in node]
+  if not isinstance(node, dict):
+    return node
+
+  out = {}
+  for k, v in node.items():
+    if k in _ANNOTATIONS.values():
+      continue
+    if k in _SCHEMA_MAPS and isinstance(v, dict):
+      out[k] = {
+        name: _apply_annotations(sub, key, op) for name, sub in v.items()
+      }
+    else:
+      out[k] = _apply_annotations(v, key, op)
+  props = node.get("properties")
+  if not isinstance(props, dict):
+    return out
+
+  required = list(out.get("required", []))
+  touched = False
+  for name, prop in props.items():
+    if not isinstance(prop, dict):
+      continue
+    vis = _visibility(prop.get(key), op)
+    if vis == "omit":
+      del out["properties"][name]
+      if name in required:
+        required.remove(name)
+      touched = True
+    elif vis == "required":
+      if name not in required:
+        required.append(name)
+      touched = True
+    elif vis == "optional":
+      if name in required:
+        required.remove(name)
+      touched = True
+  if touched:
+    if required:
+      out["required"] = required
+    else:
+      out.pop("required", None)
+  return out
+
+
+# -----------------------------------------------------------
+# Bundling
+# -----------------------------------------------------------
+
+
+def _pointer(doc: Any, fragment: str) -> Any:
+  """Follow a JSON pointer fragment (without the leading '#')."""
+  node = doc
+  for part in fragment.lstrip("/").split("/") if fragment else []:
+    part = part.replace("~1", "/").replace("~0", "~")
+    node = node[int(part)] if isinstance(node, list) else node[part]
+  return node
+
+
+class _Bundler:
+  """Inline cross-file $refs for one resolve call."""
+
+  def __init__(self, key: str, op: str) -> None:
+    self.key = key
+    self.op = op
+    self._docs: dict[Path, dict] = {}
+
+  def load(self, path: Path) -> dict:
+    if path not in self._docs:
+      try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+      except (OSError, ValueError) as e:
+        raise SchemaResolveError(f"cannot load {path}: {e}") from e
+      self._docs[path] = _apply_annotations(raw, self.key, self.op)
+    return self._docs[path]
+
+  def inline(
+    self,
+    node: Any,
+    path: Path,
+    in_root: bool,
+    stack: tuple[tuple[Path, str], ...],
+  ) -> Any:
+    if isinstance(node, list):
+      return [self.inline(item, path, in_root, stack) for item in node]
+    if not isinstance(node, dict):
+      return node
+
+    ref = node.get("$ref")
+    # The root keeps its own #/... refs (and $defs); callers such as
+    # main._embedded_table resolve them against the result.
+    if (
+      isinstance(ref, str)
+      and not ref.startswith(("http://", "https://"))
+      and not (in_root and ref.startswith("#"))
+    ):
+      return self._inline_ref(node, path, in_root, stack)
+    return {k: self.inline(v, path, in_root, stack) for k, v in node.items()}
+
+  def _inline_ref(
+    self,
+    node: dict,
+    path: Path,
+    in_root: bool,
+    stack: tuple[tuple[Path, str], ...],
+  ) -> Any:
+    target, _, fragment = node["$ref"].partition("#")
+    target_path = (path.parent / target).resolve() if target else path
+    frame = (target_path, fragment)
+    if frame in stack:
+      return node
+    doc = self.load(target_path)
+    try:
+      resolved = _pointer(doc, fragment)
+    except (KeyError, IndexError, ValueError) as e:
+      raise SchemaResolveError(
+        f"unresolvable $ref {node['$ref']!r} in {path}"
+      ) from e
+    if not fragment and isinstance(resolved, dict):
+      resolved = {
+        k: v for k, v in resolved.items() if k not in ("$schema", "$id")
+      }
+    resolved = self.inline(resolved, target_path, False, (*stack, frame))
+    siblings = {k: v for k, v in node.items() if k != "$ref"}
+    if not siblings or not isinstance(resolved, dict):
+      return resolved
+    return {**resolved, **self.inline(siblings, path, in_root, stack)}
+
+
+# -----------------------------------------------------------
+# Entry point
+# -----------------------------------------------------------
+
+
+def resolve(
+  schema_path: str | Path,
+  direction: str = "response",
+  op: str = "read",
+  bundle: bool = False,
+) -> dict:
+  """Resolve one schema variant in-process.
+
+  Same arguments and return shape as ucp_schema_pool.SchemaWorkerPool.
+  """
+  if direction not in _ANNOTATIONS:
+    raise SchemaResolveError(f"unknown direction {direction!r}")
+  bundler = _Bundler(_ANNOTATIONS[direction], op)
+  path = Path(schema_path).resolve()
+  doc = bundler.load(path)
+  if not bundle:
+    return doc
+  return bundler.inline(doc, path, True, ((path, ""),))
@@ -0,0 +1,296 @@
+"""Renderer-neutral form of the schema tables in the docs.
+
+main.py walks a schema once into a `Table` and hands it to an emitter:
+markdown() produces exactly what the macros put on the page, html() the
+same table as HTML, and to_json()/from_json() move it to and from disk
+so other outputs (llms.txt, the playground, API portals) can reuse the
+walk instead of repeating it.
+
+A Table is one of:
+
+  rows      a field table: optional header plus Rows and nested Tables
+            (allOf branches and $ref'd schemas), flattened in order
+  one_of    "MUST be one of" prose over a list of types
+  scalar    description, pattern and enum of a non-object schema
+  message   a placeholder such as "No properties defined."
+  external  a pointer to a schema that lives outside the repo
+"""
+
+import dataclasses
+import html as _html
+import json
+from typing import Any
+
+# Where links point: specification page and heading anchor.
+SITE_TARGET = "site:specification/{page}/#{anchor}"
+
+
+@dataclasses.dataclass
+class Link:
+  """A link to a schema's heading on a specification page."""
+
+  text: str
+  page: str
+  anchor: str
+
+
+@dataclasses.dataclass
+class FieldType:
+  """The type of a field.
+
+  `name` is the JSON Schema type ("string", "array", ...), or "ref" /
+  "oneOf". `link` is set for refs and arrays of refs, `items` for arrays
+  of primitives, `options` for oneOf.
+  """
+
+  name: Any
+  link: Link | None = None
+  items: Any = None
+  options: list["FieldType"] | None = None
+
+
+@dataclasses.dataclass
+class Row:
+  """One field of a rows table."""
+
+  name: str
+  type: FieldType
+  required: bool = False
+  description: str = ""
+  constant: str | None = None
+  enum: list | None = None
+
+
+@dataclasses.dataclass
+class Table:
+  """A rendered schema (see the module docstring for the kinds)."""
+
+  kind: str
+  header: bool = False
+  rows: list["Row | Table"] = dataclasses.field(default_factory=list)
+  options: list[FieldType] = dataclasses.field(default_factory=list)
+  description: str = ""
+  pattern: str | None = None
+  enum: list | None = None
+  text: str = ""
+
+
+def message(text: str) -> Table:
+  """Return a placeholder table such as "No properties defined."."""
+  return Table("message", text=text)
+
+
+# -----------------------------------------------------------
+# Serialization
+# -----------------------------------------------------------
+
+
+def to_dict(table: Table) -> dict:
+  """Return `table` as plain JSON-serializable data."""
+  return dataclasses.asdict(table)
+
+
+def _link_from(data: dict | None) -> Link | None:
+  return Link(**data) if data else None
+
+
+def _type_from(data: dict) -> FieldType:
+  return FieldType(
+    data["name"],
+    _link_from(data.get("link")),
+    data.get("items"),
+    None
+    if data.get("options") is None
+    else [_type_from(o) for o in data["options"]],
+  )
+
+
+def from_dict(data: dict) -> Table:
+  """Inverse of to_dict()."""
+  rows = [
+    from_dict(r) if "kind" in r else Row(**{**r, "type": _type_from(r["type"])})
+    for r in data.get("rows", [])
+  ]
+  return Table(
+    **{
+      **data,
+      "rows": rows,
+      "options": [_type_from(o) for o in data.get("options", [])],
+    }
+  )
+
+
+def to_json(table: Table) -> str:
+  """Serialize `table` to a JSON string."""
+  return json.dumps(to_dict(table), sort_keys=True)
+
+
+def from_json(text: str) -> Table:
+  """Inverse of to_json()."""
+  return from_dict(json.loads(text))
+
+
+# -----------------------------------------------------------
+# Markdown
+# -----------------------------------------------------------
+
+
+def markdown_link(link: Link) -> str:
+  """[Text](site:specification/page/#anchor)."""
+  target = SITE_TARGET.format(page=link.page, anchor=link.anchor)
+  return f"[{link.text}]({target})"
+
+
+def _md_type(t: FieldType) -> str:
+  if t.options is not None:
+    # Only linked options are shown; each is followed by a separator
+    # unless it is the last option, as the tables always have been.
+    parts = []
+    for idx, option in enumerate(t.options):
+      if option.link:
+        parts.append(markdown_link(option.link))
+        if idx < len(t.options) - 1:
+          parts.append(", ")
+    return f"OneOf[{''.join(parts)}]"
+  if t.name == "array":
+    inner = markdown_link(t.link) if t.link else t.items
+    return f"Array[{inner}]"
+  if t.link:
+    return markdown_link(t.link)
+  return f"{t.name}"
+
+
+def _md_row(row: Row) -> str:
+  desc = ""
+  if row.constant is not None:
+    desc += f"**Constant = {row.constant}**. "
+  desc += row.description
+  if row.enum:
+    if desc:
+      desc += "<br>"
+    desc += "**Enum:** " + ", ".join(f"`{v}`" for v in row.enum)
+  required = "**Yes**" if row.required else "No"
+  return f"| {row.name} | {_md_type(row.type)} | {required} | {desc} |"
+
+
+def markdown(table: Table) -> str:
+  """Render `table` as the Markdown the docs macros emit."""
+  if table.kind == "rows":
+    md = []
+    if table.header:
+      md.append("| Name | Type | Required | Description |")
+      md.append("| :--- | :--- | :--- | :--- |")
+    for row in table.rows:
+      md.append(markdown(row) if isinstance(row, Table) else _md_row(row))
+    return "\n".join(md)
+  if table.kind == "one_of":
+    types = ", ".join(
+      markdown_link(t.link) if t.link else f"`{t.name}`" for t in table.options
+    )
+    return f"\nThis object MUST be one of the following types: {types}.\n"
+  if table.kind == "scalar":
+    desc = table.description
+    if table.pattern:
+      desc += f"\n\n**Pattern:** `{table.pattern}`"
+    if table.enum:
+      desc += "\n\n**Enum:** " + ", ".join(f"`{v}`" for v in table.enum)
+    return desc
+  if table.kind == "external":
+    return f"_See [{table.text}]({table.text})_"
+  return f"_{table.text}_"
+
+
+# -----------------------------------------------------------
+# HTML
+# -----------------------------------------------------------
+
+
+def _html_link(link: Link, target: str) -> str:
+  href = target.format(page=link.page, anchor=link.anchor)
+  return f'<a href="{_html.escape(href)}">{_html.escape(link.text)}</a>'
+
+
+def _html_type(t: FieldType, target: str) -> str:
+  if t.options is not None:
+    inner = ", ".join(
+      _html_link(o.link, target) if o.link else _html.escape(f"{o.name}")
+      for o in t.options
+    )
+    return f"OneOf[{inner}]"
+  if t.name == "array":
+    if t.link:
+      return f"Array[{_html_link(t.link, target)}]"
+    return _html.escape(f"Array[{t.items}]")
+  if t.link:
+    return _html_link(t.link, target)
+  return _html.escape(f"{t.name}")
+
+
+def _html_rows(table: Table, target: str) -> list[str]:
+  out = []
+  for row in table.rows:
+    if isinstance(row, Table):
+      if row.kind == "rows":
+        out.extend(_html_rows(row, target))
+      else:
+        out.append(f'<tr><td colspan="4">{html(row, target)}</td></tr>')
+      continue
+    desc = ""
+    if row.constant is not None:
+      desc += f"<strong>Constant = {_html.escape(row.constant)}</strong>. "
+    desc += _html.escape(row.description)
+    if row.enum:
+      if desc:
+        desc += "<br>"
+      desc += "<strong>Enum:</strong> " + ", ".join(
+        f"<code>{_html.escape(str(v))}</code>" for v in row.enum
+      )
+    required = "<strong>Yes</strong>" if row.required else "No"
+    out.append(
+      f"<tr><td>{_html.escape(row.name)}</td>"
+      f"<td>{_html_type(row.type, target)}</td>"
+      f"<td>{required}</td><td>{desc}</td></tr>"
+    )
+  return out
+
+
+def html(table: Table, target: str = SITE_TARGET) -> str:
+  """Render `table` as HTML.
+
+  Descriptions are escaped, not interpreted as Markdown. `target` formats
+  link hrefs from the link's `page` and `anchor`.
+  """
+  if table.kind == "rows":
+    head = ""
+    if table.header:
+      head = (
+        "<thead><tr><th>Name</th><th>Type</th><th>Required</th>"
+        "<th>Description</th></tr></thead>"
+      )
+    body = "".join(_html_rows(table, target))
+    return f"<table>{head}<tbody>{body}</tbody></table>"
+  if table.kind == "one_of":
+    types = ", ".join(
+      _html_link(t.link, target)
+      if t.link
+      else f"<code>{_html.escape(f'{t.name}')}</code>"
+      for t in table.options
+    )
+    return f"<p>This object MUST be one of the following types: {types}.</p>"
+  if table.kind == "scalar":
+    parts = [f"<p>{_html.escape(table.description)}</p>"]
+    if table.pattern:
+      parts.append(
+        f"<p><strong>Pattern:</strong> "
+        f"<code>{_html.escape(table.pattern)}</code></p>"
+      )
+    if table.enum:
+      values = ", ".join(
+        f"<code>{_html.escape(str(v))}</code>" for v in table.enum
+      )
+      parts.append(f"<p><strong>Enum:</strong> {values}</p>")
+    return "".join(parts)
+  if table.kind == "external":
+    url = _html.escape(table.text)
+    return f'<p><em>See <a href="{url}">{url}</a></em></p>'
+  return f"<p><em>{_html.escape(table.text)}</em></p>"
@@ -0,0 +1,667 @@
+"""In-process JSON Schema 2020-12 validation for doc examples.
+
+validate_examples.py checks each example payload against a schema it has
+already resolved and bundled (see schema_resolver.py). compile_schema()
+turns such a schema, once, into a tree of check closures; calling the
+result on an instance returns its errors in the shape
+`ucp-schema validate --json` reports them:
+
+  [{"path": "/line_items/0/quantity", "message": "..."}]
+
+`path` is the JSON Pointer of the offending instance location. Like the
+CLI, `required` and `additionalProperties` report at the object itself.
+
+Assertions: type, enum, const, required, properties, patternProperties,
+additionalProperties, propertyNames, min/maxProperties, items,
+prefixItems, min/maxItems, uniqueItems, contains (min/maxContains),
+min/maxLength, pattern, minimum, maximum, exclusiveMinimum,
+exclusiveMaximum, multipleOf, allOf, anyOf, oneOf, not, if/then/else and
+$ref. Every other keyword (format, title, default, ...) is an
+annotation and never fails, as in the CLI.
+
+`discriminator` (OpenAPI) on a oneOf/anyOf picks the branch whose
+`propertyName` is a matching `const`, so errors point into that branch
+rather than at the whole union.
+
+Only fragment refs ("#/$defs/...") are followed, against the root
+passed to compile_schema(). A bundled schema holds no others, so any
+other ref, or a fragment missing from the root, is a SchemaError rather
+than a subschema accepted unchecked.
+
+Engine selection (validate_examples.py --engine):
+
+  cli      shell out to `ucp-schema validate` (default)
+  python   use this module
+  both     run both and fail blocks on which they disagree
+"""
+
+from collections.abc import Callable
+from decimal import Decimal, InvalidOperation
+import json
+import math
+import operator
+import re
+from typing import Any
+from urllib.parse import unquote
+
+ENGINES = ("cli", "python", "both")
+
+Errors = list[dict]
+Check = Callable[[Any, str], Errors]
+
+
+def _is_number(value: Any) -> bool:
+  return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> bool:
+  """Integers, including floats with no fractional part (1.0)."""
+  if isinstance(value, float):
+    return value.is_integer()
+  return _is_number(value)
+
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+  "null": lambda v: v is None,
+  "boolean": lambda v: isinstance(v, bool),
+  "object": lambda v: isinstance(v, dict),
+  "array": lambda v: isinstance(v, list),
+  "string": lambda v: isinstance(v, str),
+  "number": _is_number,
+  "integer": _is_integer,
+}
+
+
+class SchemaError(ValueError):
+  """A schema is malformed (unknown type, invalid pattern, ...)."""
+
+
+def _dump(value: Any) -> str:
+  return json.dumps(value, ensure_ascii=False)
+
+
+def _child(path: str, key: str | int) -> str:
+  """Append one JSON Pointer segment."""
+  return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def _error(path: str, message: str) -> Errors:
+  return [{"path": path, "message": message}]
+
+
+def _equal(a: Any, b: Any) -> bool:
+  """JSON equality: 1 == 1.0, but true != 1."""
+  if isinstance(a, bool) or isinstance(b, bool):
+    return type(a) is type(b) and a == b
+  if isinstance(a, dict) and isinstance(b, dict):
+    return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+  if isinstance(a, list) and isinstance(b, list):
+    return len(a) == len(b) and all(map(_equal, a, b))
+  return a == b
+
+
+def _pointer(root: Any, fragment: str) -> Any:
+  """Follow a URI fragment JSON Pointer (without the leading '#')."""
+  node = root
+  for part in unquote(fragment).split("/")[1:] if fragment else []:
+    part = part.replace("~1", "/").replace("~0", "~")
+    node = node[int(part)] if isinstance(node, list) else node[part]
+  return node
+
+
+def _accept(instance: Any, path: str) -> Errors:
+  return []
+
+
+class _Compiler:
+  """Compile the subschemas of one root, each once (refs may cycle)."""
+
+  def __init__(self, root: Any) -> None:
+    self.root = root
+    self._compiled: dict[int, Check] = {}
+
+  def compile(self, schema: Any) -> Check:
+    if schema is True or schema == {}:
+      return _accept
+    if schema is False:
+      return lambda instance, path: _error(path, "False schema does not allow")
+    if not isinstance(schema, dict):
+      raise SchemaError(f"not a schema: {_dump(schema)[:80]}")
+    if id(schema) in self._compiled:
+      return self._compiled[id(schema)]
+
+    checks: list[Check] = []
+
+    def check(instance: Any, path: str) -> Errors:
+      errors: Errors = []
+      for keyword_check in checks:
+        errors += keyword_check(instance, path)
+      return errors
+
+    # Registered before the keywords compile, so a $ref cycle back to
+    # this schema finds it.
+    self._compiled[id(schema)] = check
+    for keyword, compile_keyword in _KEYWORDS:
+      if keyword in schema:
+        compiled = compile_keyword(self, schema[keyword], schema)
+        if compiled is not None:
+          checks.append(compiled)
+    return check
+
+  def ref_target(self, ref: Any) -> Any:
+    """Return the schema a $ref points at in the root."""
+    if not isinstance(ref, str):
+      raise SchemaError(f"$ref must be a string, got {_dump(ref)}")
+    if not ref.startswith("#"):
+      raise SchemaError(f"cannot follow $ref {_dump(ref)} outside the schema")
+    try:
+      return _pointer(self.root, ref[1:])
+    except (KeyError, IndexError, ValueError, TypeError) as e:
+      raise SchemaError(f"$ref {_dump(ref)} not found in the schema") from e
+
+  def ref(self, ref: Any) -> Check:
+    return self.compile(self.ref_target(ref))
+
+
+# -----------------------------------------------------------
+# Keywords
+#
+# Each takes (compiler, keyword value, enclosing schema) and returns a
+# check, or None when the keyword never fails on its own.
+# -----------------------------------------------------------
+
+
+def _type(c: _Compiler, value: Any, schema: dict) -> Check:
+  names = value if isinstance(value, list) else [value]
+  try:
+    tests = [_TYPES[name] for name in names]
+  except (KeyError, TypeError) as e:
+    raise SchemaError(f"unknown type {_dump(value)}") from e
+  expected = " or ".join(f'"{name}"' for name in names)
+
+  def check(instance: Any, path: str) -> Errors:
+    if any(test(instance) for test in tests):
+      return []
+    return _error(path, f"{_dump(instance)} is not of type {expected}")
+
+  return check
+
+
+def _enum(c: _Compiler, value: Any, schema: dict) -> Check:
+  def check(instance: Any, path: str) -> Errors:
+    if any(_equal(instance, option) for option in value):
+      return []
+    return _error(path, f"{_dump(instance)} is not one of {_dump(value)}")
+
+  return check
+
+
+def _const(c: _Compiler, value: Any, schema: dict) -> Check:
+  def check(instance: Any, path: str) -> Errors:
+    if _equal(instance, value):
+      return []
+    return _error(path, f"{_dump(value)} was expected")
+
+  return check
+
+
+def _required(c: _Compiler, value: Any, schema: dict) -> Check:
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, dict):
+      return []
+    return [
+      {"path": path, "message": f'"{name}" is a required property'}
+      for name in value
+      if name not in instance
+    ]
+
+  return check
+
+
+def _properties(c: _Compiler, value: Any, schema: dict) -> Check:
+  compiled = {name: c.compile(sub) for name, sub in value.items()}
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, dict):
+      return []
+    errors: Errors = []
+    for name, sub in compiled.items():
+      if name in instance:
+        errors += sub(instance[name], _child(path, name))
+    return errors
+
+  return check
+
+
+def _pattern_properties(c: _Compiler, value: Any, schema: dict) -> Check:
+  compiled = [(_regex(p), c.compile(sub)) for p, sub in value.items()]
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, dict):
+      return []
+    errors: Errors = []
+    for name, item in instance.items():
+      for regex, sub in compiled:
+        if regex.search(name):
+          errors += sub(item, _child(path, name))
+    return errors
+
+  return check
+
+
+def _additional_properties(c: _Compiler, value: Any, schema: dict) -> Check:
+  known = set(schema.get("properties", {}))
+  patterns = [_regex(p) for p in schema.get("patternProperties", {})]
+  sub = c.compile(value)
+
+  def extra(instance: dict) -> list[str]:
+    return [
+      name
+      for name in instance
+      if name not in known and not any(p.search(name) for p in patterns)
+    ]
+
+  if value is False:
+
+    def check(instance: Any, path: str) -> Errors:
+      if not isinstance(instance, dict):
+        return []
+      names = extra(instance)
+      if not names:
+        return []
+      unexpected = ", ".join(repr(name) for name in names)
+      verb = "was" if len(names) == 1 else "were"
+      return _error(
+        path,
+        f"Additional properties are not allowed ({unexpected} {verb} "
+        "unexpected)",
+      )
+
+    return check
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, dict):
+      return []
+    errors: Errors = []
+    for name in extra(instance):
+      errors += sub(instance[name], _child(path, name))
+    return errors
+
+  return check
+
+
+def _property_names(c: _Compiler, value: Any, schema: dict) -> Check:
+  sub = c.compile(value)
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, dict):
+      return []
+    errors: Errors = []
+    for name in instance:
+      errors += sub(name, path)
+    return errors
+
+  return check
+
+
+def _bound(
+  kind: Callable[[Any], bool],
+  size: Callable[[Any], Any],
+  fails: Callable[[Any, Any], bool],
+  message: str,
+) -> Callable[[_Compiler, Any, dict], Check]:
+  """Build a keyword comparing size(instance) against the keyword value.
+
+  `message` is formatted with the instance and the limit.
+  """
+
+  def keyword(c: _Compiler, value: Any, schema: dict) -> Check:
+    def check(instance: Any, path: str) -> Errors:
+      if not kind(instance) or not fails(size(instance), value):
+        return []
+      return _error(path, message.format(_dump(instance), value))
+
+    return check
+
+  return keyword
+
+
+def _identity(value: Any) -> Any:
+  return value
+
+
+def _items(c: _Compiler, value: Any, schema: dict) -> Check:
+  sub = c.compile(value)
+  start = len(schema.get("prefixItems", []))
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, list):
+      return []
+    errors: Errors = []
+    for i in range(start, len(instance)):
+      errors += sub(instance[i], _child(path, i))
+    return errors
+
+  return check
+
+
+def _prefix_items(c: _Compiler, value: Any, schema: dict) -> Check:
+  subs = [c.compile(sub) for sub in value]
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, list):
+      return []
+    errors: Errors = []
+    for i, (item, sub) in enumerate(zip(instance, subs, strict=False)):
+      errors += sub(item, _child(path, i))
+    return errors
+
+  return check
+
+
+def _unique_items(c: _Compiler, value: Any, schema: dict) -> Check | None:
+  if value is not True:
+    return None
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, list):
+      return []
+    for i, item in enumerate(instance):
+      if any(_equal(item, other) for other in instance[:i]):
+        return _error(path, f"{_dump(instance)} has non-unique elements")
+    return []
+
+  return check
+
+
+def _contains(c: _Compiler, value: Any, schema: dict) -> Check:
+  sub = c.compile(value)
+  low = schema.get("minContains", 1)
+  high = schema.get("maxContains")
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, list):
+      return []
+    count = sum(1 for item in instance if not sub(item, path))
+    if count < low:
+      if "minContains" not in schema:
+        return _error(
+          path, f"None of {_dump(instance)} are valid under the given schema"
+        )
+      return _error(
+        path, f"{_dump(instance)} contains fewer than {low} matching items"
+      )
+    if high is not None and count > high:
+      return _error(
+        path, f"{_dump(instance)} contains more than {high} matching items"
+      )
+    return []
+
+  return check
+
+
+def _regex(pattern: str) -> re.Pattern:
+  try:
+    return re.compile(pattern)
+  except (re.error, TypeError) as e:
+    raise SchemaError(f"invalid pattern {_dump(pattern)}: {e}") from e
+
+
+def _pattern(c: _Compiler, value: Any, schema: dict) -> Check:
+  regex = _regex(value)
+
+  def check(instance: Any, path: str) -> Errors:
+    if not isinstance(instance, str) or regex.search(instance):
+      return []
+    return _error(path, f'{_dump(instance)} does not match "{value}"')
+
+  return check
+
+
+def _multiple_of(c: _Compiler, value: Any, schema: dict) -> Check:
+  if not _is_number(value) or value <= 0:
+    raise SchemaError(f"multipleOf must be a positive number, got {value!r}")
+  # Decimal, from the shortest repr: 0.3 is a multiple of 0.1, although
+  # 0.3 / 0.1 == 2.9999999999999996 in binary floating point.
+  divisor = Decimal(str(value))
+
+  def check(instance: Any, path: str) -> Errors:
+    if not _is_number(instance):
+      return []
+    try:
+      multiple = Decimal(str(instance)) % divisor == 0
+    except InvalidOperation:
+      # Quotient beyond Decimal precision (e.g. 1e300 / 0.1).
+      quotient = instance / value
+      multiple = math.isfinite(quotient) and quotient == int(quotient)
+    if multiple:
+      return []
+    return _error(path, f"{_dump(instance)} is not a multiple of {value}")
+
+  return check
+
+
+def _all_of(c: _Compiler, value: Any, schema: dict) -> Check:
+  subs = [c.compile(sub) for sub in value]
+
+  def check(instance: Any, path: str) -> Errors:
+    errors: Errors = []
+    for sub in subs:
+      errors += sub(instance, path)
+    return errors
+
+  return check
+
+
+def _discriminated(
+  c: _Compiler, branches: list, schema: dict
+) -> Callable[[Any], Check | None]:
+  """Return a function picking the branch an instance names, if any."""
+  name = (schema.get("discriminator") or {}).get("propertyName")
+  if not name:
+    return lambda instance: None
+  by_value = []
+  for branch in branches:
+    if isinstance(branch, dict) and "$ref" in branch:
+      branch = c.ref_target(branch["$ref"])
+    props = _branch_properties(branch)
+    if isinstance(props.get(name), dict) and "const" in props[name]:
+      by_value.append((props[name]["const"], c.compile(branch)))
+
+  def pick(instance: Any) -> Check | None:
+    if not isinstance(instance, dict) or name not in instance:
+      return None
+    for const, sub in by_value:
+      if _equal(instance[name], const):
+        return sub
+    return None
+
+  return pick
+
+
+def _branch_properties(branch: Any) -> dict:
+  """Return a branch's properties, merging its allOf parts."""
+  if not isinstance(branch, dict):
+    return {}
+  props = dict(branch.get("properties", {}))
+  for part in branch.get("allOf", []):
+    if isinstance(part, dict):
+      props.update(part.get("properties", {}))
+  return props
+
+
+def _union_error(instance: Any, path: str, keyword: str, count: int) -> Errors:
+  verb = "valid under more than one of" if count else "not valid under any of"
+  return _error(
+    path,
+    f"{_dump(instance)} is {verb} the schemas listed in the '{keyword}' "
+    "keyword",
+  )
+
+
+def _any_of(c: _Compiler, value: Any, schema: dict) -> Check:
+  subs = [c.compile(sub) for sub in value]
+  pick = _discriminated(c, value, schema)
+
+  def check(instance: Any, path: str) -> Errors:
+    chosen = pick(instance)
+    if chosen is not None:
+      return chosen(instance, path)
+    if any(not sub(instance, path) for sub in subs):
+      return []
+    return _union_error(instance, path, "anyOf", 0)
+
+  return check
+
+
+def _one_of(c: _Compiler, value: Any, schema: dict) -> Check:
+  subs = [c.compile(sub) for sub in value]
+  pick = _discriminated(c, value, schema)
+
+  def check(instance: Any, path: str) -> Errors:
+    chosen = pick(instance)
+    if chosen is not None:
+      return chosen(instance, path)
+    count = sum(1 for sub in subs if not sub(instance, path))
+    if count == 1:
+      return []
+    return _union_error(instance, path, "oneOf", count)
+
+  return check
+
+
+def _not(c: _Compiler, value: Any, schema: dict) -> Check:
+  sub = c.compile(value)
+
+  def check(instance: Any, path: str) -> Errors:
+    if sub(instance, path):
+      return []
+    return _error(path, f"{_dump(value)} is not allowed for {_dump(instance)}")
+
+  return check
+
+
+def _if(c: _Compiler, value: Any, schema: dict) -> Check | None:
+  condition = c.compile(value)
+  then = c.compile(schema.get("then", True))
+  otherwise = c.compile(schema.get("else", True))
+  if then is _accept and otherwise is _accept:
+    return None
+
+  def check(instance: Any, path: str) -> Errors:
+    if condition(instance, path):
+      return otherwise(instance, path)
+    return then(instance, path)
+
+  return check
+
+
+def _ref(c: _Compiler, value: Any, schema: dict) -> Check:
+  return c.ref(value)
+
+
+def _is_object(value: Any) -> bool:
+  return isinstance(value, dict)
+
+
+def _is_array(value: Any) -> bool:
+  return isinstance(value, list)
+
+
+def _is_string(value: Any) -> bool:
+  return isinstance(value, str)
+
+
+# In evaluation order; errors come out in this order too.
+_KEYWORDS: list[tuple[str, Callable[[_Compiler, Any, dict], Check | None]]] = [
+  ("$ref", _ref),
+  ("type", _type),
+  ("enum", _enum),
+  ("const", _const),
+  ("required", _required),
+  (
+    "minProperties",
+    _bound(_is_object, len, operator.lt, "{} has less than {} properties"),
+  ),
+  (
+    "maxProperties",
+    _bound(_is_object, len, operator.gt, "{} has more than {} properties"),
+  ),
+  ("properties", _properties),
+  ("patternProperties", _pattern_properties),
+  ("additionalProperties", _additional_properties),
+  ("propertyNames", _property_names),
+  (
+    "minItems",
+    _bound(_is_array, len, operator.lt, "{} has less than {} items"),
+  ),
+  (
+    "maxItems",
+    _bound(_is_array, len, operator.gt, "{} has more than {} items"),
+  ),
+  ("uniqueItems", _unique_items),
+  ("prefixItems", _prefix_items),
+  ("items", _items),
+  ("contains", _contains),
+  (
+    "minLength",
+    _bound(_is_string, len, operator.lt, "{} is shorter than {} characters"),
+  ),
+  (
+    "maxLength",
+    _bound(_is_string, len, operator.gt, "{} is longer than {} characters"),
+  ),
+  ("pattern", _pattern),
+  (
+    "minimum",
+    _bound(
+      _is_number, _identity, operator.lt, "{} is less than the minimum of {}"
+    ),
+  ),
+  (
+    "maximum",
+    _bound(
+      _is_number, _identity, operator.gt, "{} is greater than the maximum of {}"
+    ),
+  ),
+  (
+    "exclusiveMinimum",
+    _bound(
+      _is_number,
+      _identity,
+      operator.le,
+      "{} is less than or equal to the minimum of {}",
+    ),
+  ),
+  (
+    "exclusiveMaximum",
+    _bound(
+      _is_number,
+      _identity,
+      operator.ge,
+      "{} is greater than or equal to the maximum of {}",
+    ),
+  ),
+  ("multipleOf", _multiple_of),
+  ("allOf", _all_of),
+  ("anyOf", _any_of),
+  ("oneOf", _one_of),
+  ("not", _not),
+  ("if", _if),
+]
+
+
+def compile_schema(schema: Any, root: Any = None) -> Callable[[Any], Errors]:
+  """Compile `schema` into a function returning an instance's errors.
+
+  `root` is the document fragment $refs resolve against; it defaults to
+  `schema` itself. Raises SchemaError for schemas that cannot be
+  compiled; an empty error list means the instance is valid.
+  """
+  check = _Compiler(schema if root is None else root).compile(schema)
+  return lambda instance: check(instance, "")
+
+
+def validate(instance: Any, schema: Any, root: Any = None) -> Errors:
+  """Return the errors of `instance` against `schema` (see compile_schema)."""
+  return compile_schema(schema, root)(instance)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Tests for build_profile.py (docs build timers and counters).
+
+Run: python3 scripts/test_build_profile.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import build_profile as bp  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+# -----------------------------------------------------------
+# Profile
+# -----------------------------------------------------------
+
+
+def test_timed_and_counters() -> None:
+  """Wrapped calls are timed (even when raising); counters accumulate."""
+  profile = bp.BuildProfile()
+
+  def schema_fields(name):
+    if name == "bad":
+      raise ValueError(name)
+    return name.upper()
+
+  wrapped = profile.timed(schema_fields)
+  _check("timed_preserves_name", wrapped.__name__ == "schema_fields")
+  _check("timed_preserves_result", wrapped("buyer") == "BUYER")
+  with contextlib.suppress(ValueError):
+    wrapped("bad")
+  profile.count("resolve.misses")
+  profile.count("resolve.misses", 2)
+  profile.set_counter("subprocess.spawned", 4)
+
+  report = profile.report()
+  _check(
+    "timed_counts_every_call",
+    report["timers"]["schema_fields"]["calls"] == 2,
+    f"got {report['timers']!r}",
+  )
+  _check(
+    "counters_accumulate",
+    report["counters"] == {"resolve.misses": 3, "subprocess.spawned": 4},
+    f"got {report['counters']!r}",
+  )
+
+
+def test_pages_and_report_file() -> None:
+  """Page times are recorded and the report round-trips through JSON."""
+  with tempfile.TemporaryDirectory() as tmp:
+    out = Path(tmp) / "profile.json"
+    profile = bp.BuildProfile(out)
+    profile.page_start("docs/checkout.md")
+    profile.page_end("docs/checkout.md")
+    profile.page_end("docs/never-started.md")
+    profile.write()
+    report = json.loads(out.read_text())
+    _check(
+      "pages_recorded",
+      list(report["pages_ms"]) == ["docs/checkout.md"],
+      f"got {report['pages_ms']!r}",
+    )
+    _check(
+      "summary_mentions_pages",
+      any("docs/checkout.md" in line for line in profile.summary()),
+    )
+
+
+def test_pages_concurrent() -> None:
+  """Pages rendered on several threads are all recorded."""
+  profile = bp.BuildProfile()
+
+  def render(i: int) -> None:
+    page = f"docs/page-{i}.md"
+    profile.page_start(page)
+    profile.report()
+    profile.page_end(page)
+
+  with ThreadPoolExecutor(max_workers=8) as pool:
+    list(pool.map(render, range(200)))
+  pages = profile.report()["pages_ms"]
+  _check("pages_concurrent", len(pages) == 200, f"{len(pages)} pages")
+
+
+def test_from_env() -> None:
+  """UCP_DOCS_PROFILE unset/0 disables; 1 or a path enables."""
+  saved = os.environ.pop("UCP_DOCS_PROFILE", None)
+  try:
+    off = bp.from_env()
+    os.environ["UCP_DOCS_PROFILE"] = "0"
+    zero = bp.from_env()
+    os.environ["UCP_DOCS_PROFILE"] = "1"
+    default = bp.from_env()
+    os.environ["UCP_DOCS_PROFILE"] = "out/p.json"
+    custom = bp.from_env()
+  finally:
+    os.environ.pop("UCP_DOCS_PROFILE", None)
+    if saved is not None:
+      os.environ["UCP_DOCS_PROFILE"] = saved
+  _check("env_off", off is None and zero is None)
+  _check(
+    "env_on",
+    default.report_path == bp.DEFAULT_REPORT
+    and custom.report_path == Path("out/p.json"),
+  )
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all profile tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running build_profile tests...\n")
+  test_timed_and_counters()
+  test_pages_and_report_file()
+  test_pages_concurrent()
+  test_from_env()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
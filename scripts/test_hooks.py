@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Tests for hooks.py (the JSON rewrites applied to published schemas).
+
+Run: python3 scripts/test_hooks.py
+Exit: 0 on all pass, 1 on any failure.
+
+Requires mkdocs (hooks.py imports it), as in the docs build environment.
+"""
+
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(REPO_ROOT))
+try:
+  import hooks
+except ImportError as e:  # mkdocs missing
+  hooks = None
+  _IMPORT_ERROR = e
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+_BASE = "https://ucp.dev/schemas"
+
+
+def _write_tree(root: Path) -> Path:
+  """Write shopping/checkout.json -> types/buyer.json (+ a file with no $id)."""
+  (root / "shopping" / "types").mkdir(parents=True)
+  (root / "shopping" / "types" / "buyer.json").write_text(
+    json.dumps({"$id": f"{_BASE}/shopping/types/buyer.json"})
+  )
+  (root / "shopping" / "types" / "anonymous.json").write_text("{}")
+  return root / "shopping"
+
+
+def _transform(data, src_dir, ids, schema_version=None, url_version=None):
+  doc = hooks._Document(src_dir, ids, schema_version, url_version)
+  hooks._transform(data, doc)
+  return doc
+
+
+# -----------------------------------------------------------
+# _transform
+# -----------------------------------------------------------
+
+
+def test_transform_refs() -> None:
+  """Relative $refs become versioned $id URLs; others are left alone."""
+  with tempfile.TemporaryDirectory() as tmp:
+    src = _write_tree(Path(tmp))
+    ids = hooks._SourceIndex(Path(tmp))
+    data = {
+      "$id": f"{_BASE}/shopping/checkout.json",
+      "properties": {
+        "buyer": {"$ref": "types/buyer.json"},
+        "name": {"$ref": "types/buyer.json#/$defs/name"},
+        "self": {"$ref": "#/$defs/self"},
+        "remote": {"$ref": f"{_BASE}/common/x.json"},
+        "other": {"$ref": "https://example.com/y.json"},
+      },
+      "examples": [{"$ref": 5}],
+    }
+    doc = _transform(data, src, ids, url_version="2026-04-08")
+    props = data["properties"]
+    versioned = "https://ucp.dev/2026-04-08/schemas"
+    _check(
+      "transform_id_versioned",
+      data["$id"] == f"{versioned}/shopping/checkout.json",
+      data["$id"],
+    )
+    _check(
+      "transform_relative_ref",
+      props["buyer"]["$ref"] == f"{versioned}/shopping/types/buyer.json",
+      props["buyer"]["$ref"],
+    )
+    _check(
+      "transform_relative_ref_fragment",
+      props["name"]["$ref"]
+      == f"{versioned}/shopping/types/buyer.json#/$defs/name",
+      props["name"]["$ref"],
+    )
+    _check("transform_local_ref", props["self"]["$ref"] == "#/$defs/self")
+    _check(
+      "transform_absolute_ref_versioned",
+      props["remote"]["$ref"] == f"{versioned}/common/x.json",
+    )
+    _check(
+      "transform_foreign_ref",
+      props["other"]["$ref"] == "https://example.com/y.json",
+    )
+    _check("transform_non_string_ref", data["examples"] == [{"$ref": 5}])
+    _check(
+      "transform_refs_in_order",
+      doc.refs
+      == [
+        props["buyer"]["$ref"],
+        props["name"]["$ref"],
+        "#/$defs/self",
+        props["remote"]["$ref"],
+        props["other"]["$ref"],
+      ],
+      f"got {doc.refs}",
+    )
+
+
+def test_transform_unresolved_refs() -> None:
+  """Unresolvable $refs are kept and reported once per target."""
+  with tempfile.TemporaryDirectory() as tmp:
+    src = _write_tree(Path(tmp))
+    ids = hooks._SourceIndex(Path(tmp))
+    data = {
+      "a": {"$ref": "types/missing.json"},
+      "b": {"$ref": "types/missing.json#/x"},
+      "c": {"$ref": "types/anonymous.json"},
+    }
+    _transform(data, src, ids)
+    _check(
+      "unresolved_refs_kept",
+      [data[k]["$ref"] for k in "abc"]
+      == [
+        "types/missing.json",
+        "types/missing.json#/x",
+        "types/anonymous.json",
+      ],
+      f"got {data}",
+    )
+    levels = sorted(level for level, _ in ids.problems.values())
+    _check(
+      "unresolved_refs_reported_once",
+      levels == [logging.WARNING, logging.ERROR],
+      f"got {ids.problems}",
+    )
+
+
+def test_transform_versions() -> None:
+  """Named entities and transport specs get the schema version."""
+  with tempfile.TemporaryDirectory() as tmp:
+    ids = hooks._SourceIndex(Path(tmp))
+    entity = {"name": "dev.ucp.shopping.checkout"}
+    spec = {"openapi": "3.1.0", "info": {"title": "x"}}
+    plain = {"type": "object"}
+    for data in (entity, spec, plain):
+      _transform(data, Path(tmp), ids, schema_version="2026-04-08")
+    _check("version_entity", entity.get("version") == "2026-04-08")
+    _check("version_spec", spec["info"].get("version") == "2026-04-08")
+    _check("version_plain", "version" not in plain)
+    unversioned = {"name": "x", "$id": f"{_BASE}/x.json"}
+    _transform(unversioned, Path(tmp), ids)
+    _check(
+      "version_none",
+      unversioned == {"name": "x", "$id": f"{_BASE}/x.json"},
+      f"got {unversioned}",
+    )
+
+
+def test_transform_deep() -> None:
+  """The walk is iterative: deep documents do not hit the recursion limit."""
+  with tempfile.TemporaryDirectory() as tmp:
+    ids = hooks._SourceIndex(Path(tmp))
+    depth = sys.getrecursionlimit() * 2
+    data = node = {}
+    for _ in range(depth):
+      node["items"] = [{}]
+      node = node["items"][0]
+    node["$id"] = f"{_BASE}/deep.json"
+    try:
+      _transform(data, Path(tmp), ids, url_version="v1")
+      ok = node["$id"] == "https://ucp.dev/v1/schemas/deep.json"
+    except RecursionError:
+      ok = False
+    _check("transform_deep", ok)
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all hooks tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running hooks tests...\n")
+  if hooks is None:
+    _check("hooks_import", False, f"SKIPPED: {_IMPORT_ERROR}")
+    return _report()
+  test_transform_refs()
+  test_transform_unresolved_refs()
+  test_transform_versions()
+  test_transform_deep()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
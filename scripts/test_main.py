@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""Tests for main.py (the mkdocs-macros module behind the docs build).
+
+Run: python3 scripts/test_main.py
+Exit: 0 on all pass, 1 on any failure.
+
+Schemas are resolved in-process (UCP_SCHEMA_RESOLVER=python), so the
+ucp-schema binary is not required. Run from anywhere; the build-level
+tests render the repo's own docs from the repo root.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("UCP_SCHEMA_RESOLVER", "python")
+os.environ.setdefault("UCP_SCHEMA_CACHE", "0")
+sys.path.insert(0, str(REPO_ROOT))
+import main as macros  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+# -----------------------------------------------------------
+# DependencyGraph
+# -----------------------------------------------------------
+
+
+def test_dependency_nested_collectors() -> None:
+  """Nested collectors get every read, even when their contents are equal."""
+  with tempfile.TemporaryDirectory() as tmp:
+    a, b = Path(tmp) / "a.json", Path(tmp) / "b.json"
+    a.write_text("{}")
+    b.write_text("{}")
+    graph = macros.DependencyGraph()
+    with graph.collect() as outer:
+      with graph.collect() as inner:
+        graph.record(a)
+      # inner == outer here; closing inner must not close outer.
+      graph.record(b)
+    _check(
+      "deps_inner_only_inner_reads",
+      inner == {graph._key(a)},
+      f"got {inner}",
+    )
+    _check(
+      "deps_outer_after_equal_inner",
+      outer == {graph._key(a), graph._key(b)},
+      f"got {outer}",
+    )
+    _check("deps_stack_empty", graph._active() == [], f"{graph._active()}")
+
+    with graph.collect() as first:
+      pass
+    with graph.collect() as second:
+      graph.record(a)
+    _check(
+      "deps_sibling_isolated", first == set() and second == {graph._key(a)}
+    )
+
+
+def test_dependency_closure_and_changes() -> None:
+  """Resolves record the $ref closure; edits are reported and re-baselined."""
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    (root / "a.json").write_text('{"$ref": "b.json"}')
+    (root / "b.json").write_text("{}")
+    (root / "c.json").write_text("{}")
+    graph = macros.DependencyGraph()
+    with graph.collect() as deps:
+      graph.record_closure(root / "a.json")
+    graph.pages["page.md"] = frozenset(deps)
+    with graph.collect() as other:
+      graph.record(root / "c.json")
+    graph.pages["other.md"] = frozenset(other)
+
+    b = graph._key(root / "b.json")
+    _check("deps_closure", deps == {graph._key(root / "a.json"), b})
+    _check("deps_unchanged", graph.changed() == set())
+
+    st = (root / "b.json").stat()
+    os.utime(root / "b.json", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    changed = graph.changed()
+    _check("deps_changed", changed == {b}, f"got {changed}")
+    _check(
+      "deps_affected_pages",
+      graph.affected_pages(changed) == ["page.md"],
+      f"got {graph.affected_pages(changed)}",
+    )
+    _check("deps_rebaselined", graph.changed() == set())
+
+
+# -----------------------------------------------------------
+# RenderCache
+# -----------------------------------------------------------
+
+
+def test_render_cache_key() -> None:
+  """Keys cover the renderer inputs; operationIds only via their op."""
+  key = macros.RenderCache.key
+  schema = {"type": "object"}
+
+  def ctx(op_id: str) -> dict:
+    return {"io_type": "request", "operation_id": op_id}
+
+  base = key(schema, "checkout.json", True, None, ctx("create_checkout"))
+  _check(
+    "render_key_same_op",
+    base == key(schema, "checkout.json", True, None, ctx("createCart")),
+  )
+  for name, other in (
+    ("op", key(schema, "checkout.json", True, None, ctx("update_checkout"))),
+    ("header", key(schema, "checkout.json", False, None, ctx("create"))),
+    ("required", key(schema, "checkout.json", True, ["id"], ctx("create"))),
+    ("spec", key(schema, "order.json", True, None, ctx("create"))),
+    ("schema", key({}, "checkout.json", True, None, ctx("create"))),
+  ):
+    _check(f"render_key_differs_{name}", other != base)
+
+
+def test_render_cache_invalidation() -> None:
+  """evict() drops dependent entries; a new registry generation drops all."""
+  cache = macros.RenderCache()
+  cache.put("a", "table-a", {"/s/a.json", "/s/common.json"})
+  cache.put("b", "table-b", {"/s/b.json"})
+  with macros._deps.collect() as deps:
+    hit = cache.get("a")
+  _check("render_cache_hit", hit == "table-a" and cache.hits == 1)
+  _check(
+    "render_cache_hit_records_deps",
+    deps == {"/s/a.json", "/s/common.json"},
+    f"got {deps}",
+  )
+  _check("render_cache_evict", cache.evict({"/s/common.json"}) == 1)
+  _check(
+    "render_cache_evict_keeps_others",
+    cache.get("a") is None and cache.get("b") == "table-b",
+  )
+  registry = macros._schemas()
+  registry.generation += 1
+  _check("render_cache_generation_clears", cache.get("b") is None)
+
+
+# -----------------------------------------------------------
+# Build
+# -----------------------------------------------------------
+
+
+class _Page:
+  def __init__(self, src_path: str) -> None:
+    self.file = type("File", (), {"src_path": src_path})()
+
+
+class _Env:
+  """The parts of the mkdocs-macros env object define_env uses."""
+
+  def __init__(self) -> None:
+    self.conf = {"docs_dir": "docs"}
+    self.page = _Page("index.md")
+    self.variables = {}
+    self.macros = {}
+
+  def macro(self, fn):
+    self.macros[fn.__name__] = fn
+    return fn
+
+
+class _NoRenderCache(macros.RenderCache):
+  """A RenderCache that never hits, for uncached reference renders."""
+
+  def get(self, key):
+    self.misses += 1
+
+
+def _render_docs(env: _Env | None = None) -> list[str]:
+  """Run define_env and every literal macro call in docs/, in order."""
+  env = env or _Env()
+  macros.define_env(env)
+  outputs = []
+  calls = macros._scan_macro_calls(env.conf["docs_dir"])
+  for i, (name, args, kwargs) in enumerate(calls):
+    # One page per call, so page dependencies stay apart.
+    env.page = _Page(f"call-{i}.md")
+    macros.on_pre_page_macros(env)
+    try:
+      output = str(env.macros[name](*args, **kwargs))
+    except Exception as e:
+      output = f"{type(e).__name__}: {e}"
+    macros.on_post_page_macros(env)
+    outputs.append(f"{name}{args}{kwargs}\n{output}")
+  return outputs
+
+
+def _errors(outputs: list[str]) -> list[str]:
+  return [o.split("\n")[0] for o in outputs if "Error: " in o]
+
+
+def _diff(outputs: list[str], expected: list[str]) -> str:
+  for got, want in zip(outputs, expected, strict=True):
+    if got != want:
+      return f"first difference in {want.split(chr(10))[0]}"
+  return ""
+
+
+def test_build_cached_matches_uncached() -> None:
+  """Every macro renders the same with the caches on (cold and warm) as off."""
+  saved = (macros._disk_cache, macros._render_cache)
+
+  def reset(disk, render_cache) -> None:
+    macros._resolved_schema_cache.clear()
+    macros._disk_cache = disk
+    macros._render_cache = render_cache
+
+  with tempfile.TemporaryDirectory() as tmp:
+    disk = macros.schema_cache.SchemaCache(tmp, 64 << 20)
+    try:
+      reset(None, _NoRenderCache())
+      expected = _render_docs()
+      _check("build_no_errors", not _errors(expected), f"{_errors(expected)}")
+
+      reset(disk, macros.RenderCache())
+      cold = _render_docs()
+      _check(
+        "build_cold_cache_matches", cold == expected, _diff(cold, expected)
+      )
+      _check("build_render_cache_hits", macros._render_cache.hits > 0)
+
+      # A fresh process: memory caches empty, resolves served from disk.
+      reset(disk, macros.RenderCache())
+      warm = _render_docs()
+      _check(
+        "build_warm_cache_matches", warm == expected, _diff(warm, expected)
+      )
+      _check("build_disk_cache_used", disk.stats()["entries"] > 0)
+    finally:
+      macros._disk_cache, macros._render_cache = saved
+      macros._resolved_schema_cache.clear()
+
+
+def test_build_incremental() -> None:
+  """A rebuild after a schema edit evicts what it fed and renders the same."""
+  expected = _render_docs()
+  buyer = macros.SHOPPING_TYPES_DIR / "buyer.json"
+  key = macros._deps._key(buyer)
+  pages = macros._deps.pages
+  _check("incremental_page_deps", any(key in deps for deps in pages.values()))
+  cached = [
+    k for k, (_, deps) in macros._render_cache._tables.items() if key in deps
+  ]
+  kept = len(macros._render_cache._tables) - len(cached)
+  st = buyer.stat()
+  try:
+    os.utime(buyer, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    macros.define_env(_Env())
+    tables = macros._render_cache._tables
+    _check(
+      "incremental_evicts_dependents",
+      cached and not any(k in tables for k in cached) and len(tables) == kept,
+      f"{len(cached)} dependent of {len(tables)} tables",
+    )
+    rebuilt = _render_docs()
+  finally:
+    os.utime(buyer, ns=(st.st_atime_ns, st.st_mtime_ns))
+  _check("incremental_matches", rebuilt == expected, _diff(rebuilt, expected))
+
+
+def _without_ucp_request(node):
+  if isinstance(node, dict):
+    return {
+      k: _without_ucp_request(v) for k, v in node.items() if k != "ucp_request"
+    }
+  if isinstance(node, list):
+    return [_without_ucp_request(v) for v in node]
+  return node
+
+
+def test_build_linked_type_edit() -> None:
+  """Tables linking to a type whose polymorphism changed are re-rendered."""
+  _render_docs()
+  stem = "totals"
+  path = macros._schemas().find(stem)
+  original = path.read_bytes()
+  st = path.stat()
+  saved = macros._render_cache
+  try:
+    path.write_text(json.dumps(_without_ucp_request(json.loads(original))))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    rebuilt = _render_docs()
+    _check(
+      "linked_type_no_longer_polymorphic",
+      stem not in macros.scan_type_locations(macros._schemas()).polymorphic,
+    )
+    macros._render_cache = _NoRenderCache()
+    expected = _render_docs()
+  finally:
+    macros._render_cache = saved
+    path.write_bytes(original)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+  _check(
+    "linked_type_edit_matches", rebuilt == expected, _diff(rebuilt, expected)
+  )
+
+
+# -----------------------------------------------------------
+# Schema layout
+# -----------------------------------------------------------
+
+
+def test_layout_validation_store() -> None:
+  """Validated layouts are remembered outside the resolve cache."""
+  saved = (macros._disk_cache, macros._layout_store, macros._layout)
+  validate = macros._validate_common_namespace_exclusivity
+  calls = []
+  with tempfile.TemporaryDirectory() as tmp:
+    macros._disk_cache = macros.schema_cache.SchemaCache(
+      Path(tmp) / "r", 1 << 20
+    )
+    macros._layout_store = macros.schema_cache.SchemaCache(
+      Path(tmp) / "l", 1 << 20
+    )
+    macros._validate_common_namespace_exclusivity = calls.append
+    try:
+      for _ in range(2):
+        macros._layout = None  # As in a fresh process.
+        layout = macros.schema_layout()
+      _check("layout_validated_once", len(calls) == 1, f"{len(calls)} calls")
+      _check(
+        "layout_kept_out_of_resolve_cache",
+        macros._disk_cache.stats()["entries"] == 0
+        and macros._layout_store.get(layout.fingerprint) is not None,
+      )
+    finally:
+      macros._validate_common_namespace_exclusivity = validate
+      macros._disk_cache, macros._layout_store, macros._layout = saved
+
+
+# -----------------------------------------------------------
+# Prewarm
+# -----------------------------------------------------------
+
+
+def test_prewarm_is_best_effort() -> None:
+  """Any resolve failure during prewarm is swallowed, not just RuntimeError."""
+  resolve = macros._resolve_schema
+
+  def fail(*_):
+    raise ValueError("unreadable schema")
+
+  macros._resolve_schema = fail
+  try:
+    result = macros._prewarm_one(("x.json", "response", "read", False))
+    _check("prewarm_swallows_errors", result is None)
+  except Exception as e:
+    _check("prewarm_swallows_errors", False, f"raised {e!r}")
+  finally:
+    macros._resolve_schema = resolve
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all main.py tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running main.py tests...\n")
+  os.chdir(REPO_ROOT)
+  test_dependency_nested_collectors()
+  test_dependency_closure_and_changes()
+  test_render_cache_key()
+  test_render_cache_invalidation()
+  test_build_cached_matches_uncached()
+  test_build_incremental()
+  test_build_linked_type_edit()
+  test_layout_validation_store()
+  test_prewarm_is_best_effort()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
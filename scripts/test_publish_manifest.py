@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Tests for publish_manifest.py (incremental publishing of source/).
+
+Run: python3 scripts/test_publish_manifest.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import publish_manifest as pm  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+_KEY = {"rules": [1], "schema_version": "2026-01-11", "ids": "abc"}
+
+
+def _publish(root: Path) -> tuple[Path, Path]:
+  """Lay out a source tree and a site with one published schema."""
+  source = root / "source"
+  site = root / "site"
+  (source / "schemas").mkdir(parents=True)
+  (site / "schemas").mkdir(parents=True)
+  src = source / "schemas" / "buyer.json"
+  src.write_text('{"$id": "https://ucp.dev/schemas/buyer.json"}')
+  out = site / "schemas" / "buyer.json"
+  out.write_text(
+    '{\n  "$id": "https://ucp.dev/2026-01-11/schemas/buyer.json"\n}'
+  )
+  manifest = pm.Manifest.load(site, _KEY)
+  manifest.record(
+    "schemas/buyer.json",
+    pm.sha256_file(src),
+    "schemas/buyer.json",
+    pm.sha256_file(out),
+  )
+  manifest.write()
+  return source, site
+
+
+# -----------------------------------------------------------
+# Manifest
+# -----------------------------------------------------------
+
+
+def test_fresh() -> None:
+  """An unchanged source with its output intact is skipped next build."""
+  with tempfile.TemporaryDirectory() as tmp:
+    source, site = _publish(Path(tmp))
+    digest = pm.sha256_file(source / "schemas" / "buyer.json")
+
+    manifest = pm.Manifest.load(site, _KEY)
+    _check("fresh_unchanged", manifest.fresh("schemas/buyer.json", digest))
+    _check("fresh_carried_over", "schemas/buyer.json" in manifest.files)
+    _check("fresh_unknown", not manifest.fresh("schemas/cart.json", digest))
+    _check(
+      "fresh_source_changed",
+      not manifest.fresh("schemas/buyer.json", "0" * 64),
+    )
+
+    other_key = {**_KEY, "schema_version": "2026-04-08"}
+    _check(
+      "fresh_key_changed",
+      not pm.Manifest.load(site, other_key).fresh("schemas/buyer.json", digest),
+    )
+
+    (site / "schemas" / "buyer.json").write_text("{}")
+    _check(
+      "fresh_output_modified",
+      not pm.Manifest.load(site, _KEY).fresh("schemas/buyer.json", digest),
+    )
+    (site / "schemas" / "buyer.json").unlink()
+    _check(
+      "fresh_output_missing",
+      not pm.Manifest.load(site, _KEY).fresh("schemas/buyer.json", digest),
+    )
+
+
+def test_derived() -> None:
+  """Derived outputs are verified with the output; meta is carried over."""
+  with tempfile.TemporaryDirectory() as tmp:
+    source, site = _publish(Path(tmp))
+    src = source / "schemas" / "buyer.json"
+    gz = site / "schemas" / "buyer.json.gz"
+    gz.write_bytes(b"gz")
+    manifest = pm.Manifest.load(site, _KEY)
+    entry = manifest._previous["schemas/buyer.json"]
+    manifest.record(
+      "schemas/buyer.json",
+      entry["source_sha256"],
+      entry["output"],
+      entry["output_sha256"],
+      {"schemas/buyer.json.gz": pm.sha256_file(gz)},
+      {"size": 42},
+    )
+    manifest.write()
+    digest = pm.sha256_file(src)
+    manifest = pm.Manifest.load(site, _KEY)
+    _check("derived_fresh", manifest.fresh("schemas/buyer.json", digest))
+    _check(
+      "meta_carried_over",
+      manifest.files["schemas/buyer.json"].get("meta") == {"size": 42},
+    )
+    gz.unlink()
+    _check(
+      "derived_missing_not_fresh",
+      not pm.Manifest.load(site, _KEY).fresh("schemas/buyer.json", digest),
+    )
+    _check(
+      "derived_missing_checked",
+      pm.check(site)
+      == ["schemas/buyer.json.gz: missing (from schemas/buyer.json)"],
+    )
+
+
+def test_unreadable_manifest() -> None:
+  """A corrupt manifest is treated as empty rather than failing the build."""
+  with tempfile.TemporaryDirectory() as tmp:
+    site = Path(tmp)
+    (site / pm.MANIFEST_NAME).write_text("{not json")
+    manifest = pm.Manifest.load(site, _KEY)
+    _check("corrupt_manifest_empty", not manifest.fresh("a.json", "0" * 64))
+
+
+# -----------------------------------------------------------
+# Check
+# -----------------------------------------------------------
+
+
+def test_check() -> None:
+  """check() reports modified outputs, changed and unpublished sources."""
+  with tempfile.TemporaryDirectory() as tmp:
+    source, site = _publish(Path(tmp))
+    _check("check_clean", pm.check(site, source) == [])
+
+    (source / "schemas" / "cart.json").write_text("{}")
+    (source / "schemas" / "buyer.json").write_text("{}")
+    (site / "schemas" / "buyer.json").write_text("{}")
+    problems = pm.check(site, source)
+    _check(
+      "check_problems",
+      problems
+      == [
+        "schemas/buyer.json: modified since published",
+        "schemas/buyer.json: source changed since published",
+        "schemas/cart.json: not published",
+      ],
+      f"got {problems}",
+    )
+    _check("check_outputs_only", len(pm.check(site)) == 1)
+
+    (site / pm.MANIFEST_NAME).unlink()
+    _check("check_missing_manifest", len(pm.check(site)) == 1)
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all publish manifest tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running publish_manifest tests...\n")
+  test_fresh()
+  test_derived()
+  test_unreadable_manifest()
+  test_check()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
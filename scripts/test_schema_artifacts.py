@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Tests for schema_artifacts.py (minified, gzipped and bundled schemas).
+
+Run: python3 scripts/test_schema_artifacts.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import schema_artifacts as sa  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+_BASE = "https://ucp.dev/2026-01-11/schemas/shopping/"
+
+_CHECKOUT = {
+  "$id": _BASE + "checkout.json",
+  "name": "dev.ucp.shopping.checkout",
+  "$defs": {"status": {"type": "string"}},
+  "properties": {
+    "buyer": {"$ref": _BASE + "types/buyer.json"},
+    "status": {"$ref": "#/$defs/status"},
+    "self": {"$ref": "checkout.json#/$defs/status"},
+    "items": {"type": "array", "items": {"$ref": "types/line_item.json"}},
+    "ext": {"$ref": "https://example.com/ext.json"},
+  },
+}
+
+_PUBLISHED = {
+  _BASE + "types/buyer.json": {
+    "$id": _BASE + "types/buyer.json",
+    "properties": {"address": {"$ref": "postal_address.json#/$defs/x"}},
+  },
+  _BASE + "types/postal_address.json": {
+    "$id": _BASE + "types/postal_address.json",
+    "properties": {"owner": {"$ref": _BASE + "types/buyer.json"}},
+  },
+  _BASE + "types/line_item.json": {"$id": _BASE + "types/line_item.json"},
+}
+
+
+# -----------------------------------------------------------
+# Variants
+# -----------------------------------------------------------
+
+
+def test_paths_and_encodings() -> None:
+  """Variant paths sit next to the schema; encodings round-trip."""
+  _check("min_path", sa.min_path("schemas/a.json") == "schemas/a.min.json")
+  _check(
+    "bundle_path", sa.bundle_path("schemas/a.json") == "schemas/a.bundle.json"
+  )
+  _check("gz_path", sa.gz_path("schemas/a.json") == "schemas/a.json.gz")
+
+  data = {"title": "Café", "list": [1, 2]}
+  _check("minify", sa.minify(data) == '{"title":"Café","list":[1,2]}'.encode())
+  raw = json.dumps(data, indent=2).encode()
+  _check("compress_round_trip", gzip.decompress(sa.compress(raw)) == raw)
+  _check("compress_reproducible", sa.compress(raw) == sa.compress(raw))
+
+
+# -----------------------------------------------------------
+# Bundles
+# -----------------------------------------------------------
+
+
+def test_bundle() -> None:
+  """The whole closure is embedded by $id; refs and the root stay put."""
+  loaded = []
+
+  def load(url):
+    loaded.append(url)
+    return _PUBLISHED.get(url)
+
+  bundled = sa.bundle(_CHECKOUT, load)
+  _check(
+    "bundle_embeds_closure",
+    list(bundled["$defs"])
+    == [
+      "status",
+      _BASE + "types/buyer.json",
+      _BASE + "types/line_item.json",
+      _BASE + "types/postal_address.json",
+    ],
+    f"got {list(bundled['$defs'])}",
+  )
+  _check("bundle_keeps_refs", bundled["properties"] == _CHECKOUT["properties"])
+  _check(
+    "bundle_root_untouched",
+    "$defs" in _CHECKOUT and len(_CHECKOUT["$defs"]) == 1,
+  )
+  _check(
+    "bundle_loads_each_once",
+    sorted(loaded) == sorted([*_PUBLISHED, "https://example.com/ext.json"]),
+    f"got {loaded}",
+  )
+  _check("bundle_root", sa.is_bundle_root(_CHECKOUT))
+  _check(
+    "bundle_not_root",
+    not sa.is_bundle_root(_PUBLISHED[_BASE + "types/buyer.json"]),
+  )
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all schema artifact tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running schema_artifacts tests...\n")
+  test_paths_and_encodings()
+  test_bundle()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Tests for schema_cache.py (persistent ucp-schema resolve cache).
+
+Run: python3 scripts/test_schema_cache.py
+Exit: 0 on all pass, 1 on any failure.
+
+No external dependencies; the ucp-schema binary is not required.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import schema_cache as c  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+def _write_tree(root: Path) -> Path:
+  """Write checkout.json -> types/buyer.json -> ../common/name.json."""
+  (root / "types").mkdir()
+  (root / "common").mkdir()
+  (root / "checkout.json").write_text(
+    json.dumps(
+      {
+        "properties": {
+          "buyer": {"$ref": "types/buyer.json"},
+          "self": {"$ref": "#/$defs/self"},
+          "remote": {"$ref": "https://example.com/x.json"},
+        }
+      }
+    )
+  )
+  (root / "types" / "buyer.json").write_text(
+    json.dumps({"properties": {"name": {"$ref": "../common/name.json"}}})
+  )
+  (root / "common" / "name.json").write_text(json.dumps({"type": "string"}))
+  return root / "checkout.json"
+
+
+# -----------------------------------------------------------
+# Key derivation
+# -----------------------------------------------------------
+
+
+def test_ref_closure_and_key() -> None:
+  """Keys cover the transitive $ref closure, flags and CLI version."""
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    schema = _write_tree(root)
+
+    closure = {p.name for p in c.ref_closure(schema)}
+    _check(
+      "closure_is_transitive",
+      closure == {"checkout.json", "buyer.json", "name.json"},
+      f"got {closure!r}",
+    )
+
+    flags = ("response", "read", False)
+    base = c.cache_key(schema, flags, "ucp-schema 1.0.0")
+    _check(
+      "key_is_stable",
+      base == c.cache_key(schema, flags, "ucp-schema 1.0.0"),
+    )
+    request_flags = ("request", "create", False)
+    _check(
+      "key_changes_with_flags",
+      base != c.cache_key(schema, request_flags, "ucp-schema 1.0.0"),
+    )
+    _check(
+      "key_changes_with_cli_version",
+      base != c.cache_key(schema, flags, "ucp-schema 1.0.1"),
+    )
+
+    (root / "common" / "name.json").write_text(json.dumps({"type": "integer"}))
+    _check(
+      "key_changes_with_transitive_ref",
+      base != c.cache_key(schema, flags, "ucp-schema 1.0.0"),
+    )
+
+
+def test_key_distinguishes_ref_cycle() -> None:
+  """Schemas that $ref each other share a closure but not a key."""
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    (root / "a.json").write_text(json.dumps({"$ref": "b.json"}))
+    (root / "b.json").write_text(json.dumps({"$ref": "a.json"}))
+    _check(
+      "cycle_shares_closure",
+      c.ref_closure(root / "a.json") == c.ref_closure(root / "b.json"),
+    )
+    flags = ("response", "read", True)
+    _check(
+      "cycle_keys_differ",
+      c.cache_key(root / "a.json", flags, "ucp-schema 1.0.0")
+      != c.cache_key(root / "b.json", flags, "ucp-schema 1.0.0"),
+    )
+
+
+# -----------------------------------------------------------
+# Disk store
+# -----------------------------------------------------------
+
+
+def test_store_roundtrip_and_clear() -> None:
+  """put/get round-trips; clear empties the store."""
+  with tempfile.TemporaryDirectory() as tmp:
+    cache = c.SchemaCache(Path(tmp) / "cache", 1024 * 1024)
+    _check("miss_returns_none", cache.get("ab" * 32) is None)
+    cache.put("ab" * 32, {"type": "object"})
+    _check(
+      "hit_returns_document",
+      cache.get("ab" * 32) == {"type": "object"},
+    )
+    cache.clear()
+    _check(
+      "clear_removes_entries",
+      cache.get("ab" * 32) is None and cache.stats()["entries"] == 0,
+    )
+
+
+def test_lru_eviction() -> None:
+  """Least-recently-used entries are evicted first past the size cap."""
+  with tempfile.TemporaryDirectory() as tmp:
+    doc = {"description": "x" * 100}
+    entry_size = len(json.dumps(doc, separators=(",", ":")))
+    cache = c.SchemaCache(Path(tmp), entry_size * 2)
+    keys = [f"{i:02x}" * 32 for i in range(3)]
+
+    cache.put(keys[0], doc)
+    cache.put(keys[1], doc)
+    # Age both entries, then touch keys[0] so keys[1] is least recent.
+    past = time.time() - 60
+    for key in keys[:2]:
+      os.utime(cache._entry(key), (past, past))
+    cache.get(keys[0])
+    cache.put(keys[2], doc)
+
+    _check(
+      "lru_evicts_least_recent",
+      cache.get(keys[1]) is None,
+      f"stats {cache.stats()!r}",
+    )
+    _check(
+      "lru_keeps_recent",
+      cache.get(keys[0]) is not None and cache.get(keys[2]) is not None,
+    )
+
+
+def test_overwrite_accounting() -> None:
+  """Overwriting a key replaces its size in the usage tally."""
+  with tempfile.TemporaryDirectory() as tmp:
+    cache = c.SchemaCache(Path(tmp), 1024 * 1024)
+    cache.put("ab" * 32, {"description": "x" * 100})
+    for _ in range(3):
+      cache.put("ab" * 32, {"description": "y"})
+    _check(
+      "overwrite_usage_matches_disk",
+      cache._usage == cache.stats()["bytes"],
+      f"usage {cache._usage}, stats {cache.stats()!r}",
+    )
+
+
+def test_concurrent_puts() -> None:
+  """Concurrent writers, some to the same keys, keep the tally exact."""
+  with tempfile.TemporaryDirectory() as tmp:
+    cache = c.SchemaCache(Path(tmp), 1024 * 1024)
+    keys = [f"{i % 8:02x}" * 32 for i in range(64)]
+
+    def put(i: int) -> None:
+      cache.put(keys[i], {"description": "x" * (i % 5 + 1) * 10})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+      list(executor.map(put, range(len(keys))))
+    _check(
+      "concurrent_usage_matches_disk",
+      cache._usage == cache.stats()["bytes"],
+      f"usage {cache._usage}, stats {cache.stats()!r}",
+    )
+    _check("concurrent_no_temp_files", not list(Path(tmp).glob("*/*.tmp")))
+
+
+def test_from_env_bad_max_mb() -> None:
+  """A malformed size cap falls back to the default with a warning."""
+  saved = dict(os.environ)
+  stderr = io.StringIO()
+  try:
+    os.environ.pop("UCP_SCHEMA_CACHE", None)
+    os.environ["UCP_SCHEMA_CACHE_MAX_MB"] = "lots"
+    with contextlib.redirect_stderr(stderr):
+      cache = c.from_env()
+  finally:
+    os.environ.clear()
+    os.environ.update(saved)
+  _check(
+    "bad_max_mb_uses_default",
+    cache is not None and cache.max_bytes == c.DEFAULT_MAX_MB * 1024 * 1024,
+  )
+  _check(
+    "bad_max_mb_warns",
+    "UCP_SCHEMA_CACHE_MAX_MB" in stderr.getvalue(),
+    repr(stderr.getvalue()),
+  )
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all cache tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running schema_cache tests...\n")
+  test_ref_closure_and_key()
+  test_key_distinguishes_ref_cycle()
+  test_store_roundtrip_and_clear()
+  test_lru_eviction()
+  test_overwrite_accounting()
+  test_concurrent_puts()
+  test_from_env_bad_max_mb()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
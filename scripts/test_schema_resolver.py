@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Tests for schema_resolver.py (in-process `ucp-schema resolve`).
+
+Unit tests cover annotation handling and bundling on small fixture
+trees. The differential test runs the Python resolver and the real
+ucp-schema binary over every schema in source/schemas for every
+direction × op × bundle combination and requires byte-identical
+json.dumps output; it is gated and reported as skipped if the binary is
+missing.
+
+Run: python3 scripts/test_schema_resolver.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import schema_resolver as r  # noqa: E402
+import ucp_schema_pool  # noqa: E402
+
+_REPO_ROOT = Path(__file__).parent.parent
+_SCHEMA_BASE = _REPO_ROOT / "source" / "schemas"
+_DIRECTIONS = ("request", "response")
+_OPS = ("create", "update", "complete", "read")
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+def _has_ucp_schema() -> bool:
+  return shutil.which("ucp-schema") is not None
+
+
+def _write(root: Path, name: str, doc: dict) -> Path:
+  path = root / name
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps(doc))
+  return path
+
+
+# -----------------------------------------------------------
+# Annotations
+# -----------------------------------------------------------
+
+_ITEM = {
+  "type": "object",
+  "required": ["id", "name"],
+  "properties": {
+    "id": {
+      "type": "string",
+      "ucp_request": {"create": "omit", "update": "required"},
+    },
+    "name": {"type": "string", "ucp_request": "optional"},
+    "note": {"type": "string", "ucp_request": "required"},
+    "secret": {"type": "string", "ucp_response": "omit"},
+  },
+}
+
+
+def test_request_annotations() -> None:
+  """ucp_request string and per-op forms for request variants."""
+  with tempfile.TemporaryDirectory() as tmp:
+    path = _write(Path(tmp), "item.json", _ITEM)
+
+    create = r.resolve(path, "request", "create")
+    _check(
+      "request_create_omits_and_requires",
+      list(create["properties"]) == ["name", "note", "secret"]
+      and create["required"] == ["note"],
+      f"got {create!r}",
+    )
+    update = r.resolve(path, "request", "update")
+    _check(
+      "request_update_per_op_required",
+      update["required"] == ["id", "note"],
+      f"got {update['required']!r}",
+    )
+    complete = r.resolve(path, "request", "complete")
+    _check(
+      "request_missing_op_leaves_property",
+      "id" in complete["properties"],
+    )
+    _check(
+      "annotations_stripped",
+      "ucp_" not in json.dumps(create) + json.dumps(complete),
+    )
+
+
+def test_response_annotations() -> None:
+  """Responses apply ucp_response and ignore ucp_request."""
+  with tempfile.TemporaryDirectory() as tmp:
+    path = _write(Path(tmp), "item.json", _ITEM)
+    read = r.resolve(path, "response", "read")
+    _check(
+      "response_ignores_ucp_request",
+      list(read["properties"]) == ["id", "name", "note"]
+      and read["required"] == ["id", "name"],
+      f"got {read!r}",
+    )
+
+
+def test_nested_annotations() -> None:
+  """Annotations apply inside $defs, items and allOf branches."""
+  with tempfile.TemporaryDirectory() as tmp:
+    path = _write(
+      Path(tmp),
+      "wrap.json",
+      {
+        "$defs": {"item": _ITEM},
+        "properties": {"items": {"type": "array", "items": _ITEM}},
+        "allOf": [_ITEM],
+      },
+    )
+    create = r.resolve(path, "request", "create")
+    nested = [
+      create["$defs"]["item"],
+      create["properties"]["items"]["items"],
+      create["allOf"][0],
+    ]
+    _check(
+      "nested_annotations_applied",
+      all("id" not in n["properties"] for n in nested),
+    )
+
+
+# -----------------------------------------------------------
+# Bundling
+# -----------------------------------------------------------
+
+
+def test_ucp_named_members_kept() -> None:
+  """Only the two annotations are stripped, never ucp_* names or keys."""
+  doc = {
+    "ucp_shared_request": True,
+    "$defs": {"ucp_agent": {"type": "object", "ucp_request": "omit"}},
+    "properties": {
+      "meta": {"properties": {"ucp-agent": {"$ref": "#/$defs/ucp_agent"}}},
+      "ucp_id": {"type": "string"},
+      "ucp_request": {"type": "string", "ucp_request": "required"},
+    },
+  }
+  with tempfile.TemporaryDirectory() as tmp:
+    path = _write(Path(tmp), "tool.json", doc)
+    for bundle in (False, True):
+      out = r.resolve(path, "request", "create", bundle)
+      _check(
+        f"ucp_defs_kept_bundle_{bundle}",
+        out.get("$defs") == {"ucp_agent": {"type": "object"}},
+        f"got {out.get('$defs')!r}",
+      )
+      _check(
+        f"ucp_properties_kept_bundle_{bundle}",
+        list(out["properties"]) == ["meta", "ucp_id", "ucp_request"]
+        and out["properties"]["ucp_request"] == {"type": "string"}
+        and out["required"] == ["ucp_request"],
+        f"got {out['properties']!r}",
+      )
+      _check(
+        f"ucp_other_keys_kept_bundle_{bundle}",
+        out.get("ucp_shared_request") is True,
+      )
+
+
+def test_bundle_inlines_cross_file_refs() -> None:
+  """--bundle inlines other files and keeps the root's own #/ refs."""
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    _write(root, "types/item.json", {"$id": "item", **_ITEM})
+    _write(
+      root,
+      "common/types.json",
+      {
+        "$defs": {
+          "money": {"$ref": "#/$defs/amount"},
+          "amount": {"type": "integer"},
+        }
+      },
+    )
+    path = _write(
+      root,
+      "shopping/cart.json",
+      {
+        "$defs": {"total": {"$ref": "../common/types.json#/$defs/money"}},
+        "properties": {
+          "item": {"$ref": "../types/item.json", "description": "An item."},
+          "total": {"$ref": "#/$defs/total"},
+        },
+      },
+    )
+
+    plain = r.resolve(path, "request", "create")
+    _check(
+      "unbundled_keeps_refs",
+      plain["properties"]["item"]["$ref"] == "../types/item.json",
+    )
+
+    bundled = r.resolve(path, "request", "create", bundle=True)
+    item = bundled["properties"]["item"]
+    _check(
+      "bundle_inlines_file_ref",
+      "$ref" not in item
+      and "$id" not in item
+      and "id" not in item["properties"]
+      and item["description"] == "An item.",
+      f"got {item!r}",
+    )
+    _check(
+      "bundle_inlines_fragment_and_nested_local_ref",
+      bundled["$defs"]["total"] == {"type": "integer"},
+      f"got {bundled['$defs']['total']!r}",
+    )
+    _check(
+      "bundle_keeps_root_local_ref",
+      bundled["properties"]["total"] == {"$ref": "#/$defs/total"},
+    )
+
+
+def test_bundle_cycle_and_errors() -> None:
+  """Ref cycles terminate; missing targets raise SchemaResolveError."""
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    _write(
+      root,
+      "node.json",
+      {"properties": {"child": {"$ref": "node.json"}}},
+    )
+    path = _write(root, "tree.json", {"$ref": "node.json"})
+    bundled = r.resolve(path, "response", "read", bundle=True)
+    child = bundled["properties"]["child"]
+    _check("bundle_cycle_left_as_ref", child == {"$ref": "node.json"})
+
+    broken = _write(root, "broken.json", {"$ref": "missing.json"})
+    try:
+      r.resolve(broken, bundle=True)
+      raised = False
+    except r.SchemaResolveError:
+      raised = True
+    _check("bundle_missing_target_raises", raised)
+
+
+# -----------------------------------------------------------
+# Differential: Python resolver vs ucp-schema
+# -----------------------------------------------------------
+
+
+def _outcome(resolve, path: Path, direction: str, op: str, bundle: bool):
+  try:
+    return json.dumps(resolve(path, direction, op, bundle))
+  except (r.SchemaResolveError, ucp_schema_pool.SchemaResolveError):
+    return "<error>"
+
+
+def test_matches_cli() -> None:
+  """Every schema × direction × op × bundle matches the CLI byte-for-byte."""
+  if not _has_ucp_schema():
+    _check(
+      "differential_vs_cli",
+      False,
+      "SKIPPED: ucp-schema binary not on PATH",
+    )
+    return
+
+  pool = ucp_schema_pool.SchemaWorkerPool()
+  try:
+    for path in sorted(_SCHEMA_BASE.rglob("*.json")):
+      mismatches = [
+        f"{direction}/{op}{'/bundle' if bundle else ''}"
+        for direction in _DIRECTIONS
+        for op in _OPS
+        for bundle in (False, True)
+        if _outcome(pool.resolve, path, direction, op, bundle)
+        != _outcome(r.resolve, path, direction, op, bundle)
+      ]
+      _check(
+        f"differential_{path.relative_to(_SCHEMA_BASE)}",
+        not mismatches,
+        f"differs for {', '.join(mismatches)}",
+      )
+  finally:
+    pool.close()
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all resolver tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running schema_resolver tests...\n")
+  test_request_annotations()
+  test_response_annotations()
+  test_nested_annotations()
+  test_ucp_named_members_kept()
+  test_bundle_inlines_cross_file_refs()
+  test_bundle_cycle_and_errors()
+  test_matches_cli()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
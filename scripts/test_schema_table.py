@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Tests for schema_table.py (schema table IR and its emitters).
+
+Run: python3 scripts/test_schema_table.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import schema_table as st  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+_BUYER = st.Link("Buyer", "checkout", "buyer")
+_ITEM = st.Link("Line Item Response", "reference", "line-item")
+
+
+def _sample() -> st.Table:
+  """Build a header table with a nested (embedded) block, like an allOf."""
+  nested = st.Table(
+    "rows",
+    rows=[
+      st.Row(
+        "line_items",
+        st.FieldType("array", _ITEM),
+        True,
+        "Items.",
+      ),
+      st.Row("tags", st.FieldType("array", items="string")),
+    ],
+  )
+  return st.Table(
+    "rows",
+    header=True,
+    rows=[
+      st.Row("id", st.FieldType("string"), True, "Unique ID."),
+      st.Row("buyer", st.FieldType("ref", _BUYER), False, "The buyer."),
+      st.Row(
+        "status",
+        st.FieldType("string"),
+        True,
+        "State.",
+        enum=["open", "closed"],
+      ),
+      st.Row("kind", st.FieldType("string"), constant="checkout"),
+      nested,
+    ],
+  )
+
+
+# -----------------------------------------------------------
+# Markdown
+# -----------------------------------------------------------
+
+
+def test_markdown_rows() -> None:
+  """Header, rows and nested blocks render as one Markdown table."""
+  expected = "\n".join(
+    [
+      "| Name | Type | Required | Description |",
+      "| :--- | :--- | :--- | :--- |",
+      "| id | string | **Yes** | Unique ID. |",
+      "| buyer | [Buyer](site:specification/checkout/#buyer) | No"
+      " | The buyer. |",
+      "| status | string | **Yes** | State.<br>**Enum:** `open`, `closed` |",
+      "| kind | string | No | **Constant = checkout**.  |",
+      "| line_items | Array[[Line Item Response]"
+      "(site:specification/reference/#line-item)] | **Yes** | Items. |",
+      "| tags | Array[string] | No |  |",
+    ]
+  )
+  got = st.markdown(_sample())
+  _check("markdown_rows", got == expected, f"got {got!r}")
+
+
+def test_markdown_one_of() -> None:
+  """Render oneOf types as prose and as the in-table OneOf[...] form."""
+  prose = st.Table(
+    "one_of",
+    options=[st.FieldType("ref", _BUYER), st.FieldType("string")],
+  )
+  expected = (
+    "\nThis object MUST be one of the following types: "
+    "[Buyer](site:specification/checkout/#buyer), `string`.\n"
+  )
+  _check("markdown_one_of_prose", st.markdown(prose) == expected)
+  # Only linked options are listed; a trailing unlinked option leaves the
+  # separator of the one before it.
+  field = st.FieldType(
+    "oneOf", options=[st.FieldType("ref", _BUYER), st.FieldType("string")]
+  )
+  row = st.Table("rows", rows=[st.Row("x", field)])
+  _check(
+    "markdown_one_of_field",
+    st.markdown(row)
+    == "| x | OneOf[[Buyer](site:specification/checkout/#buyer), ] | No |  |",
+    f"got {st.markdown(row)!r}",
+  )
+
+
+def test_markdown_other_kinds() -> None:
+  """Scalar, message and external tables."""
+  scalar = st.Table(
+    "scalar", description="A code.", pattern="^[A-Z]+$", enum=["A", "B"]
+  )
+  _check(
+    "markdown_scalar",
+    st.markdown(scalar)
+    == "A code.\n\n**Pattern:** `^[A-Z]+$`\n\n**Enum:** `A`, `B`",
+  )
+  _check(
+    "markdown_message",
+    st.markdown(st.message("No properties defined."))
+    == "_No properties defined._",
+  )
+  url = "https://example.com/schema.json"
+  _check(
+    "markdown_external",
+    st.markdown(st.Table("external", text=url)) == f"_See [{url}]({url})_",
+  )
+
+
+# -----------------------------------------------------------
+# HTML and JSON
+# -----------------------------------------------------------
+
+
+def test_html() -> None:
+  """HTML flattens nested rows, escapes text and formats link targets."""
+  table = _sample()
+  table.rows[0].description = "<b>ID</b>"
+  got = st.html(table, target="/{page}.html#{anchor}")
+  _check("html_header", got.startswith("<table><thead><tr><th>Name</th>"))
+  _check("html_escapes", "&lt;b&gt;ID&lt;/b&gt;" in got)
+  _check("html_link", '<a href="/checkout.html#buyer">Buyer</a>' in got)
+  _check(
+    "html_nested_flattened",
+    got.count("<tr>") == 7 and "<table>" not in got[len("<table>") :],
+  )
+
+
+def test_json_round_trip() -> None:
+  """to_json/from_json preserve the table and its Markdown exactly."""
+  table = st.Table(
+    "rows",
+    rows=[
+      _sample(),
+      st.Table("one_of", options=[st.FieldType(["string", "null"])]),
+      st.message("No content fields defined."),
+    ],
+  )
+  restored = st.from_json(st.to_json(table))
+  _check("json_round_trip_equal", restored == table)
+  _check(
+    "json_round_trip_markdown",
+    st.markdown(restored) == st.markdown(table),
+  )
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all schema table tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running schema_table tests...\n")
+  test_markdown_rows()
+  test_markdown_one_of()
+  test_markdown_other_kinds()
+  test_html()
+  test_json_round_trip()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
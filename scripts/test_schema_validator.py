@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Tests for schema_validator.py (in-process JSON Schema validation).
+
+Run: python3 scripts/test_schema_validator.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import schema_validator as sv  # noqa: E402
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+def _paths(instance, schema, root=None) -> list[str]:
+  return [e["path"] for e in sv.validate(instance, schema, root)]
+
+
+def _cases(prefix: str, schema, cases: list[tuple]) -> None:
+  """Check (instance, expected error paths) pairs against one schema."""
+  for i, (instance, expected) in enumerate(cases):
+    got = _paths(instance, schema)
+    _check(f"{prefix}_{i}", got == expected, f"{instance!r}: got {got}")
+
+
+# -----------------------------------------------------------
+# Keywords
+# -----------------------------------------------------------
+
+
+def test_scalars() -> None:
+  """type, enum, const, string and number bounds."""
+  _cases(
+    "type",
+    {"type": ["integer", "null"]},
+    [(1, []), (1.0, []), (None, []), (1.5, [""]), (True, [""]), ("1", [""])],
+  )
+  _cases(
+    "enum_const",
+    {"enum": [1, "a", {"k": [True]}], "const": 1},
+    [(1, []), (1.0, []), (True, ["", ""]), ({"k": [True]}, [""])],
+  )
+  _cases(
+    "string",
+    {"minLength": 2, "maxLength": 3, "pattern": "^[a-z]+$"},
+    [("ab", []), ("é€x", [""]), ("a", [""]), ("abcd", [""]), (7, [])],
+  )
+  _cases(
+    "number",
+    {"minimum": 0, "exclusiveMaximum": 10, "multipleOf": 0.5},
+    [(0, []), (9.5, []), (-1, [""]), (10, [""]), (0.25, [""]), ("x", [])],
+  )
+  _cases(
+    "multiple_of_fraction",
+    {"multipleOf": 0.1},
+    [(0.3, []), (19.9, []), (7, []), (0.35, [""]), (1e300, [])],
+  )
+  _cases(
+    "multiple_of_cents",
+    {"multipleOf": 0.01},
+    [(19.99, []), (0.07, []), (1.005, [""])],
+  )
+  errors = sv.validate(5, {"type": "string"})
+  _check(
+    "type_message",
+    errors == [{"path": "", "message": '5 is not of type "string"'}],
+    f"got {errors}",
+  )
+
+
+def test_objects() -> None:
+  """Required, properties and additionalProperties report at the object."""
+  schema = {
+    "type": "object",
+    "required": ["id"],
+    "properties": {"id": {"type": "string"}, "a/b": {"type": "integer"}},
+    "patternProperties": {"^x-": {"type": "string"}},
+    "additionalProperties": False,
+    "propertyNames": {"maxLength": 4},
+    "maxProperties": 3,
+  }
+  _cases(
+    "object",
+    schema,
+    [
+      ({"id": "1"}, []),
+      ({}, [""]),
+      ({"id": 1}, ["/id"]),
+      ({"id": "1", "a/b": "x"}, ["/a~1b"]),
+      ({"id": "1", "x-y": 1}, ["/x-y"]),
+      ({"id": "1", "zz": 1}, [""]),
+      ({"id": "1", "x-yz1": "s"}, [""]),
+      ({"id": "1", "a/b": 1, "x-a": "", "x-b": ""}, [""]),
+      ([], [""]),
+    ],
+  )
+  _cases(
+    "additional_schema",
+    {"properties": {"a": {}}, "additionalProperties": {"type": "integer"}},
+    [({"a": "x", "b": 1}, []), ({"b": "x"}, ["/b"])],
+  )
+
+
+def test_arrays() -> None:
+  """items, prefixItems, bounds, uniqueItems and contains."""
+  _cases(
+    "array",
+    {
+      "prefixItems": [{"type": "string"}],
+      "items": {"type": "integer"},
+      "minItems": 1,
+      "uniqueItems": True,
+    },
+    [
+      (["a", 1, 2], []),
+      ([], [""]),
+      ([1], ["/0"]),
+      (["a", "b"], ["/1"]),
+      (["a", 1, 1.0], [""]),
+      (["a", 1, True], ["/2"]),
+    ],
+  )
+  _cases(
+    "contains",
+    {"contains": {"const": 1}, "maxContains": 2},
+    [([1, 2], []), ([2], [""]), ([1, 1, 1], [""]), ({}, [])],
+  )
+
+
+def test_combinators() -> None:
+  """allOf, anyOf, oneOf, not and if/then/else."""
+  _cases(
+    "all_of",
+    {"allOf": [{"required": ["a"]}, {"required": ["b"]}]},
+    [({"a": 1, "b": 1}, []), ({}, ["", ""])],
+  )
+  _cases(
+    "any_of",
+    {"anyOf": [{"type": "string"}, {"minimum": 5}]},
+    [("x", []), (7, []), (1, [""])],
+  )
+  _cases(
+    "one_of",
+    {"oneOf": [{"type": "integer"}, {"minimum": 5}]},
+    [(1, []), (5.5, []), (7, [""]), (1.5, [""])],
+  )
+  errors = sv.validate(7, {"oneOf": [{"type": "integer"}, {"minimum": 5}]})
+  _check(
+    "one_of_more_than_one",
+    "more than one" in errors[0]["message"],
+    f"got {errors}",
+  )
+  _cases("not", {"not": {"type": "null"}}, [(1, []), (None, [""])])
+  _cases(
+    "if_then_else",
+    {
+      "if": {"properties": {"kind": {"const": "card"}}},
+      "then": {"required": ["number"]},
+      "else": {"required": ["token"]},
+    },
+    [
+      ({"kind": "card", "number": "4"}, []),
+      ({"kind": "card"}, [""]),
+      ({"kind": "wallet", "token": "t"}, []),
+      ({"kind": "wallet"}, [""]),
+    ],
+  )
+  _cases("boolean_schemas", {"properties": {"a": False}}, [({"a": 1}, ["/a"])])
+
+
+def test_discriminator() -> None:
+  """A discriminator picks the named branch, so errors point inside it."""
+  schema = {
+    "oneOf": [{"$ref": "#/$defs/card"}, {"$ref": "#/$defs/wallet"}],
+    "discriminator": {"propertyName": "type"},
+    "$defs": {
+      "card": {
+        "allOf": [{"properties": {"type": {"const": "card"}}}],
+        "properties": {"number": {"type": "string"}},
+      },
+      "wallet": {
+        "properties": {"type": {"const": "wallet"}, "id": {"type": "string"}}
+      },
+    },
+  }
+  _cases(
+    "discriminator",
+    schema,
+    [
+      ({"type": "card", "number": "4"}, []),
+      ({"type": "card", "number": 4}, ["/number"]),
+      ({"type": "wallet", "id": 1}, ["/id"]),
+      ({"type": "other"}, [""]),
+    ],
+  )
+
+
+def test_refs() -> None:
+  """Fragment refs resolve against the root and may recurse."""
+  root = {
+    "$defs": {
+      "node": {
+        "type": "object",
+        "properties": {
+          "value": {"type": "integer"},
+          "children": {"type": "array", "items": {"$ref": "#/$defs/node"}},
+        },
+      },
+      "shape": {"properties": {"root": {"$ref": "#/$defs/node"}}},
+    },
+    "$ref": "#/$defs/node",
+  }
+  tree = {"value": 1, "children": [{"value": 2, "children": [{"value": "x"}]}]}
+  _check(
+    "ref_recursive", _paths(tree, root) == ["/children/0/children/0/value"]
+  )
+  _check(
+    "ref_against_root",
+    _paths({"root": {"value": "x"}}, root["$defs"]["shape"], root)
+    == ["/root/value"],
+  )
+  for name, schema in (
+    ("ref_external", {"$ref": "types/buyer.json", "type": "integer"}),
+    ("ref_missing", {"$ref": "#/$defs/nope"}),
+    ("ref_missing_nested", {"properties": {"a": {"$ref": "#/$defs/a"}}}),
+    (
+      "ref_missing_discriminator",
+      {
+        "oneOf": [{"$ref": "#/$defs/a"}],
+        "discriminator": {"propertyName": "t"},
+      },
+    ),
+  ):
+    try:
+      sv.compile_schema(schema)
+    except sv.SchemaError:
+      _check(f"{name}_rejected", True)
+    else:
+      _check(f"{name}_rejected", False, "no SchemaError")
+
+
+def test_schema_errors() -> None:
+  """Malformed schemas fail at compile time."""
+  for name, schema in (
+    ("unknown_type", {"type": "decimal"}),
+    ("bad_pattern", {"pattern": "("}),
+    ("not_a_schema", {"items": 3}),
+    ("zero_multiple_of", {"multipleOf": 0}),
+  ):
+    try:
+      sv.compile_schema(schema)
+    except sv.SchemaError:
+      _check(f"schema_error_{name}", True)
+    else:
+      _check(f"schema_error_{name}", False, "no SchemaError")
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all schema validator tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running schema_validator tests...\n")
+  test_scalars()
+  test_objects()
+  test_arrays()
+  test_combinators()
+  test_discriminator()
+  test_refs()
+  test_schema_errors()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Tests for ucp_schema_pool.py (persistent ucp-schema workers).
+
+Runs against fake_ucp_schema.py, a stand-in for the Rust binary, so the
+batch protocol and the one-shot fallback are both exercised without
+`ucp-schema` on PATH.
+
+Run: python3 scripts/test_ucp_schema_pool.py
+Exit: 0 on all pass, 1 on any failure.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import ucp_schema_pool as p  # noqa: E402
+
+_FAKE_CLI = (sys.executable, str(Path(__file__).parent / "fake_ucp_schema.py"))
+
+# -----------------------------------------------------------
+# Test harness (minimal, no deps)
+# -----------------------------------------------------------
+
+_RESULTS: list[tuple[str, bool, str]] = []
+
+
+def _check(name: str, condition: bool, detail: str = "") -> None:
+  """Record a test result."""
+  _RESULTS.append((name, condition, detail))
+
+
+def _report() -> int:
+  """Print results and return exit code."""
+  passed = sum(1 for _, ok, _ in _RESULTS if ok)
+  failed = [(n, d) for n, ok, d in _RESULTS if not ok]
+  for name, ok, detail in _RESULTS:
+    status = "PASS" if ok else "FAIL"
+    suffix = f" — {detail}" if detail and not ok else ""
+    print(f"  {status}  {name}{suffix}")
+  print(f"\n{passed} passed, {len(failed)} failed")
+  return 0 if not failed else 1
+
+
+class _FakeEnv:
+  """Point the fake CLI at a spawn log; optionally disable `serve`."""
+
+  def __init__(self, serve: bool = True, garbage: bool = False) -> None:
+    self.serve = serve
+    self.garbage = garbage
+
+  def __enter__(self) -> "_FakeEnv":
+    self.tmp = tempfile.TemporaryDirectory()
+    root = Path(self.tmp.name)
+    self.log = root / "spawns.log"
+    self.schema = root / "buyer.json"
+    self.schema.write_text(json.dumps({"title": "Buyer"}))
+    os.environ["FAKE_UCP_SCHEMA_LOG"] = str(self.log)
+    if not self.serve:
+      os.environ["FAKE_UCP_SCHEMA_NO_SERVE"] = "1"
+    if self.garbage:
+      os.environ["FAKE_UCP_SCHEMA_SERVE_GARBAGE"] = "1"
+    return self
+
+  def __exit__(self, *exc) -> None:
+    os.environ.pop("FAKE_UCP_SCHEMA_LOG", None)
+    os.environ.pop("FAKE_UCP_SCHEMA_NO_SERVE", None)
+    os.environ.pop("FAKE_UCP_SCHEMA_SERVE_GARBAGE", None)
+    self.tmp.cleanup()
+
+  def spawns(self) -> list[str]:
+    if not self.log.exists():
+      return []
+    return self.log.read_text().split()
+
+
+# -----------------------------------------------------------
+# Batch mode
+# -----------------------------------------------------------
+
+
+def test_batch_mode_reuses_workers() -> None:
+  """Many resolves over pipes spawn at most `size` processes."""
+  with _FakeEnv() as env:
+    pool = p.SchemaWorkerPool(size=2, command=_FAKE_CLI)
+    try:
+      results = [
+        pool.resolve(env.schema, "request", "create", bundle=True)
+        for _ in range(10)
+      ]
+    finally:
+      pool.close()
+    _check(
+      "batch_result_shape",
+      all(
+        r["title"] == "Buyer"
+        and r["x-resolved"]
+        == {"direction": "request", "op": "create", "bundle": True}
+        for r in results
+      ),
+      f"got {results[0]!r}",
+    )
+    _check("batch_mode_detected", pool.batch_supported is True)
+    _check(
+      "batch_counters",
+      pool.spawned == 1 and pool.requests == 10 and pool.bytes_received > 0,
+      f"spawned {pool.spawned}, requests {pool.requests}",
+    )
+    _check(
+      "batch_no_fork_per_request",
+      env.spawns() == ["serve"],
+      f"spawns {env.spawns()!r}",
+    )
+
+
+def test_batch_mode_concurrent() -> None:
+  """Concurrent callers share the pool without exceeding its size."""
+  with _FakeEnv() as env:
+    pool = p.SchemaWorkerPool(size=3, command=_FAKE_CLI)
+    try:
+      with ThreadPoolExecutor(max_workers=8) as executor:
+        ops = ["create", "update", "complete", "read"] * 10
+        results = list(
+          executor.map(lambda op: pool.resolve(env.schema, "request", op), ops)
+        )
+    finally:
+      pool.close()
+    _check(
+      "concurrent_results_match_requests",
+      [r["x-resolved"]["op"] for r in results] == ops,
+    )
+    spawns = env.spawns()
+    _check(
+      "concurrent_spawns_bounded_by_size",
+      1 <= len(spawns) <= 3 and set(spawns) == {"serve"},
+      f"spawns {spawns!r}",
+    )
+
+
+def test_batch_mode_error() -> None:
+  """Worker-reported errors surface as SchemaResolveError."""
+  with _FakeEnv() as env:
+    pool = p.SchemaWorkerPool(size=1, command=_FAKE_CLI)
+    try:
+      try:
+        pool.resolve(env.schema.with_name("missing.json"))
+        raised = False
+      except p.SchemaResolveError:
+        raised = True
+      _check("batch_error_raises", raised)
+      # The worker survives an error response and keeps serving.
+      ok = pool.resolve(env.schema)["title"] == "Buyer"
+      _check("batch_worker_survives_error", ok)
+    finally:
+      pool.close()
+    _check(
+      "batch_error_no_respawn",
+      env.spawns() == ["serve"],
+      f"spawns {env.spawns()!r}",
+    )
+
+
+def test_batch_mode_garbage_reply() -> None:
+  """A reply that is not JSON raises and the worker is dropped."""
+  with _FakeEnv(garbage=True) as env:
+    pool = p.SchemaWorkerPool(size=1, command=_FAKE_CLI)
+    outcomes = []
+    try:
+      with ThreadPoolExecutor(max_workers=1) as executor:
+        for _ in range(2):
+          # A leaked worker would leave the size-1 pool blocked forever.
+          future = executor.submit(pool.resolve, env.schema)
+          try:
+            future.result(timeout=30)
+            outcomes.append("ok")
+          except p.SchemaResolveError:
+            outcomes.append("error")
+    finally:
+      pool.close()
+    _check(
+      "garbage_reply_raises",
+      outcomes == ["error", "error"],
+      f"got {outcomes!r}",
+    )
+    _check(
+      "garbage_reply_drops_worker",
+      env.spawns() == ["serve", "serve"] and pool._workers == [],
+      f"spawns {env.spawns()!r}",
+    )
+
+
+def test_missing_cli() -> None:
+  """A CLI that cannot be started raises SchemaResolveError."""
+  missing = (str(Path(tempfile.gettempdir()) / "no-such-ucp-schema"),)
+  for size in (1, 0):
+    pool = p.SchemaWorkerPool(size=size, command=missing)
+    try:
+      pool.resolve("buyer.json")
+      raised = False
+    except p.SchemaResolveError:
+      raised = True
+    _check(f"missing_cli_raises_size_{size}", raised)
+
+
+# -----------------------------------------------------------
+# One-shot fallback
+# -----------------------------------------------------------
+
+
+def test_fallback_without_serve() -> None:
+  """CLIs without `serve` fall back to one process per resolve."""
+  with _FakeEnv(serve=False) as env:
+    pool = p.SchemaWorkerPool(size=2, command=_FAKE_CLI)
+    try:
+      results = [pool.resolve(env.schema, "response", "read") for _ in range(3)]
+    finally:
+      pool.close()
+    _check("fallback_mode_detected", pool.batch_supported is False)
+    _check(
+      "fallback_results_correct",
+      all(r["x-resolved"]["direction"] == "response" for r in results),
+    )
+    _check(
+      "fallback_probes_serve_once",
+      env.spawns() == ["serve", "resolve", "resolve", "resolve"],
+      f"spawns {env.spawns()!r}",
+    )
+    _check(
+      "fallback_counters",
+      pool.spawned == 4 and pool.requests == 3,
+      f"spawned {pool.spawned}, requests {pool.requests}",
+    )
+
+    try:
+      pool.resolve(env.schema.with_name("missing.json"))
+      raised = False
+    except p.SchemaResolveError:
+      raised = True
+    _check("fallback_error_raises", raised)
+
+
+def test_size_zero_is_one_shot() -> None:
+  """size=0 never starts a worker."""
+  with _FakeEnv() as env:
+    pool = p.SchemaWorkerPool(size=0, command=_FAKE_CLI)
+    pool.resolve(env.schema)
+    _check(
+      "size_zero_one_shot",
+      env.spawns() == ["resolve"],
+      f"spawns {env.spawns()!r}",
+    )
+
+
+# -----------------------------------------------------------
+# Main
+# -----------------------------------------------------------
+
+
+def main() -> int:
+  """Run all pool tests and report. Exit 0 on pass, 1 on failure."""
+  print("Running ucp_schema_pool tests...\n")
+  test_batch_mode_reuses_workers()
+  test_batch_mode_concurrent()
+  test_batch_mode_error()
+  test_batch_mode_garbage_reply()
+  test_missing_cli()
+  test_fallback_without_serve()
+  test_size_zero_is_one_shot()
+  return _report()
+
+
+if __name__ == "__main__":
+  sys.exit(main())
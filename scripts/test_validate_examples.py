@@ -26,7 +26,9 @@ No external dependencies. Tests that require the `ucp-schema` binary
 are gated and skipped if the binary is missing.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
 import shutil
 import sys
 import tempfile
@@ -509,6 +511,358 @@ def test_process_block_integration() -> None:
 # -----------------------------------------------------------
 
 
+def test_validate_blocks_order() -> None:
+  """Parallel validation reports in block order, like serial validation."""
+  md = "".join(
+    f'<!-- ucp:example skip reason="r{i}" -->\n```json\n{{}}\n```\n\n'
+    if i % 3
+    else "```json\n{}\n```\n\n"
+    for i in range(12)
+  )
+  blocks = v.extract_blocks(_write_md(md))
+  serial = v.validate_blocks(blocks, _SCHEMA_BASE, _SCAFFOLDS_DIR, jobs=1)
+  parallel = v.validate_blocks(blocks, _SCHEMA_BASE, _SCAFFOLDS_DIR, jobs=4)
+  _check(
+    "validate_blocks_order",
+    [str(r) for r in parallel] == [str(r) for r in serial]
+    and [r.line for r in parallel] == sorted(r.line for r in parallel),
+    f"got {[str(r) for r in parallel]}",
+  )
+
+
+def test_validate_blocks_batched() -> None:
+  """Blocks sharing a schema validate together; errors map back per block."""
+  fake = (sys.executable, str(Path(__file__).parent / "fake_ucp_schema.py"))
+  schema = {
+    "type": "object",
+    "required": ["id"],
+    "properties": {"id": {"type": "string"}, "tags": {"type": "string"}},
+  }
+  examples = [
+    '{ "id": "a" }',
+    '{ "id": 1 }',
+    '{ "id": "c", "tags": ["..."] }',
+    '{ "id": "d", "tags": [] }',
+  ]
+  md = "".join(
+    f"<!-- ucp:example schema=thing -->\n```json\n{e}\n```\n\n"
+    for e in examples
+  )
+  blocks = v.extract_blocks(_write_md(md))
+  saved = v.UCP_SCHEMA_COMMAND, os.environ.get("UCP_SCHEMA_RESOLVER")
+  with tempfile.TemporaryDirectory() as tmp:
+    base = Path(tmp) / "schemas"
+    base.mkdir()
+    (base / "thing.json").write_text(json.dumps(schema))
+    log = Path(tmp) / "spawns.log"
+    os.environ["FAKE_UCP_SCHEMA_LOG"] = str(log)
+    os.environ["UCP_SCHEMA_RESOLVER"] = "python"
+    v.UCP_SCHEMA_COMMAND = fake
+    try:
+      # The first call runs on stdin and from files to detect stdin
+      # support; a batch that fails both ways decides nothing about stdin,
+      # so the first single call probes again.
+      for mode, flag, expected, stdin in (
+        ("batched", None, 2, True),
+        ("unbatched", ("FAKE_UCP_SCHEMA_NO_BATCH", "1"), 3 + len(blocks), True),
+        ("no_stdin", ("FAKE_UCP_SCHEMA_NO_STDIN", "1"), 2, False),
+        ("no_stdin_json", ("FAKE_UCP_SCHEMA_NO_STDIN", "json"), 2, False),
+      ):
+        for name in ("FAKE_UCP_SCHEMA_NO_BATCH", "FAKE_UCP_SCHEMA_NO_STDIN"):
+          os.environ.pop(name, None)
+        if flag:
+          os.environ[flag[0]] = flag[1]
+        v._batch_supported = None
+        v._stdin_supported = None
+        log.write_text("")
+        results = v.validate_blocks(blocks, base, Path(tmp), jobs=2)
+        _check(
+          f"validate_blocks_{mode}_per_block",
+          [r.status for r in results] == ["ok", "fail", "ok", "fail"]
+          and "/id" in results[1].message
+          and "/tags" in results[3].message,
+          f"got {[(r.status, r.message) for r in results]}",
+        )
+        calls = log.read_text().split().count("validate")
+        _check(f"validate_blocks_{mode}_calls", calls == expected, f"{calls}")
+        _check(
+          f"validate_blocks_{mode}_stdin",
+          v._stdin_supported is stdin,
+          f"got {v._stdin_supported}",
+        )
+
+      # Concurrent groups: only the first probes, the rest wait for it.
+      for name in ("FAKE_UCP_SCHEMA_NO_BATCH", "FAKE_UCP_SCHEMA_NO_STDIN"):
+        os.environ.pop(name, None)
+      v._batch_supported = None
+      v._stdin_supported = None
+      log.write_text("")
+      schema_file = str(base / "thing.json")
+      with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(
+          executor.map(
+            lambda _: v._validate_with_schema_file(
+              [{"id": "a"}, {"id": 1}], schema_file, "response", "read", base
+            ),
+            range(8),
+          )
+        )
+      calls = log.read_text().split().count("validate")
+      _check(
+        "validate_concurrent_probe_once",
+        calls == 9
+        and all([o[0] for o in r] == [True, False] for r in outcomes),
+        f"{calls} calls",
+      )
+    finally:
+      v.UCP_SCHEMA_COMMAND = saved[0]
+      v._batch_supported = None
+      v._stdin_supported = None
+      for name in (
+        "FAKE_UCP_SCHEMA_LOG",
+        "FAKE_UCP_SCHEMA_NO_BATCH",
+        "FAKE_UCP_SCHEMA_NO_STDIN",
+      ):
+        os.environ.pop(name, None)
+      if saved[1] is None:
+        os.environ.pop("UCP_SCHEMA_RESOLVER", None)
+      else:
+        os.environ["UCP_SCHEMA_RESOLVER"] = saved[1]
+
+
+def test_validate_blocks_engines() -> None:
+  """The python engine validates in-process; both flags disagreements."""
+  fake = (sys.executable, str(Path(__file__).parent / "fake_ucp_schema.py"))
+  schema = {
+    "type": "object",
+    "required": ["id"],
+    "properties": {"id": {"type": "string", "minLength": 2}},
+  }
+  examples = ['{ "id": "ab" }', '{ "id": 1 }', '{ "id": "a" }']
+  md = "".join(
+    f"<!-- ucp:example schema=engine -->\n```json\n{e}\n```\n\n"
+    for e in examples
+  )
+  blocks = v.extract_blocks(_write_md(md))
+  saved = v.UCP_SCHEMA_COMMAND, os.environ.get("UCP_SCHEMA_RESOLVER")
+  with tempfile.TemporaryDirectory() as tmp:
+    base = Path(tmp) / "schemas"
+    base.mkdir()
+    (base / "engine.json").write_text(json.dumps(schema))
+    log = Path(tmp) / "spawns.log"
+    os.environ["FAKE_UCP_SCHEMA_LOG"] = str(log)
+    os.environ["UCP_SCHEMA_RESOLVER"] = "python"
+    v.UCP_SCHEMA_COMMAND = fake
+    try:
+      log.write_text("")
+      python = v.validate_blocks(blocks, base, Path(tmp), engine="python")
+      _check(
+        "engine_python",
+        [r.status for r in python] == ["ok", "fail", "fail"]
+        and "/id" in python[1].message
+        and "shorter" in python[2].message,
+        f"got {[(r.status, r.message) for r in python]}",
+      )
+      _check("engine_python_no_spawn", log.read_text() == "")
+
+      # The fake CLI ignores minLength, so only the last block disagrees.
+      both = v.validate_blocks(blocks, base, Path(tmp), engine="both")
+      _check(
+        "engine_both",
+        [r.status for r in both] == ["ok", "fail", "fail"]
+        and "disagree" not in both[1].message
+        and "engines disagree: cli ok, python fail" in both[2].message,
+        f"got {[(r.status, r.message) for r in both]}",
+      )
+    finally:
+      v.UCP_SCHEMA_COMMAND = saved[0]
+      v._batch_supported = None
+      os.environ.pop("FAKE_UCP_SCHEMA_LOG", None)
+      if saved[1] is None:
+        os.environ.pop("UCP_SCHEMA_RESOLVER", None)
+      else:
+        os.environ["UCP_SCHEMA_RESOLVER"] = saved[1]
+
+
+def _cache_fixture(root: Path) -> tuple[Path, Path, list[dict]]:
+  """Lay out schemas, scaffolds and two pages of blocks under `root`."""
+  base = root / "schemas"
+  (base / "types").mkdir(parents=True)
+  (base / "thing.json").write_text(
+    json.dumps(
+      {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+          "id": {"type": "string"},
+          "tag": {"$ref": "types/tag.json"},
+        },
+      }
+    )
+  )
+  (base / "types" / "tag.json").write_text('{"type": "string"}')
+  (base / "other.json").write_text('{"type": "object"}')
+  scaffolds = root / "scaffolds"
+  scaffolds.mkdir()
+  (scaffolds / "thing.json").write_text("{}")
+  (root / "a.md").write_text(
+    "<!-- ucp:example schema=thing -->\n```json\n"
+    '{ "id": "a", "tag": "x" }\n```\n\n'
+    "<!-- ucp:example schema=thing -->\n```json\n"
+    '{ "id": 1 }\n```\n'
+  )
+  (root / "b.md").write_text(
+    '<!-- ucp:example schema=other -->\n```json\n{ "id": "b" }\n```\n'
+  )
+  blocks = v.extract_blocks(root / "a.md") + v.extract_blocks(root / "b.md")
+  return base, scaffolds, blocks
+
+
+def test_result_cache() -> None:
+  """OK results are reused until an input changes; failures always rerun."""
+  saved = os.environ.get("UCP_SCHEMA_RESOLVER")
+  os.environ["UCP_SCHEMA_RESOLVER"] = "python"
+  try:
+    with tempfile.TemporaryDirectory() as tmp:
+      base, scaffolds, blocks = _cache_fixture(Path(tmp))
+      store = v.schema_cache.SchemaCache(Path(tmp) / "cache", 1 << 20)
+
+      def run() -> tuple[list[str], int]:
+        v._schema_cache.clear()
+        v._compiled.clear()
+        cache = v.ResultCache(store, base, scaffolds, "python")
+        results = v.validate_blocks(
+          blocks, base, scaffolds, engine="python", cache=cache
+        )
+        return [r.status for r in results], cache.hits
+
+      _check("result_cache_cold", run() == (["ok", "fail", "ok"], 0))
+      _check("result_cache_warm", run() == (["ok", "fail", "ok"], 2))
+
+      (base / "types" / "tag.json").write_text('{"type": "integer"}')
+      statuses, hits = run()
+      _check(
+        "result_cache_closure_changed",
+        statuses == ["fail", "fail", "ok"] and hits == 1,
+        f"got {statuses}, {hits} hits",
+      )
+      (base / "types" / "tag.json").write_text('{"type": "string"}')
+      (scaffolds / "thing.json").write_text('{"tag": "y"}')
+      _check(
+        "result_cache_scaffold_changed", run() == (["ok", "fail", "ok"], 1)
+      )
+
+      keys = v.ResultCache(store, base, scaffolds, "python")
+      moved = {**blocks[0], "line": 99, "file": "elsewhere.md"}
+      _check(
+        "result_cache_key_ignores_location",
+        keys.key(moved) == keys.key(blocks[0]),
+      )
+      _check(
+        "result_cache_key_engine",
+        keys.key(blocks[0])
+        != v.ResultCache(store, base, scaffolds, "both").key(blocks[0]),
+      )
+      repo = Path(v.__file__).resolve().parent.parent
+      _check(
+        "result_cache_dir_in_repo",
+        repo / ".cache" / "ucp-examples" == v.DEFAULT_RESULT_CACHE_DIR,
+      )
+  finally:
+    v._schema_cache.clear()
+    v._compiled.clear()
+    if saved is None:
+      os.environ.pop("UCP_SCHEMA_RESOLVER", None)
+    else:
+      os.environ["UCP_SCHEMA_RESOLVER"] = saved
+
+
+def test_affected_blocks() -> None:
+  """--changed-only follows pages, schema closures and scaffolds."""
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp).resolve()
+    base, scaffolds, blocks = _cache_fixture(root)
+
+    def lines(*changed: Path) -> list[tuple[str, int]]:
+      affected = v.affected_blocks(blocks, set(changed), base, scaffolds)
+      return [(Path(b["file"]).name, b["line"]) for b in affected]
+
+    _check("affected_none", lines() == [])
+    _check("affected_page", lines(root / "b.md") == [("b.md", 2)])
+    _check(
+      "affected_closure",
+      lines(base / "types" / "tag.json") == [("a.md", 2), ("a.md", 7)],
+    )
+    _check(
+      "affected_new_scaffold",
+      lines(scaffolds / "other_response.json") == [("b.md", 2)],
+    )
+    for module in (v, v.schema_cache, v.ucp_schema_pool):
+      _check(
+        f"affected_validator_{Path(module.__file__).stem}",
+        len(lines(Path(module.__file__).resolve())) == len(blocks),
+      )
+
+
+def test_changed_files() -> None:
+  """changed_files sees committed, unstaged and untracked changes."""
+  if shutil.which("git") is None:
+    _check("changed_files", False, "SKIPPED: git not on PATH")
+    return
+  with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp).resolve()
+
+    def git(*args: str) -> None:
+      v.subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+      )
+
+    git("init", "-q", "-b", "main")
+    for name in ("kept.md", "edited.md", "committed.md"):
+      (root / name).write_text("x")
+    git("add", ".")
+    git("commit", "-q", "-m", "base")
+    git("checkout", "-q", "-b", "topic")
+    (root / "committed.md").write_text("y")
+    git("commit", "-q", "-am", "topic")
+    (root / "edited.md").write_text("y")
+    (root / "new.md").write_text("y")
+
+    changed = v.changed_files("main", root)
+    _check(
+      "changed_files",
+      changed == {root / n for n in ("committed.md", "edited.md", "new.md")},
+      f"got {sorted(p.name for p in changed)}",
+    )
+    try:
+      v.changed_files("no-such-ref", root)
+    except RuntimeError:
+      _check("changed_files_bad_ref", True)
+    else:
+      _check("changed_files_bad_ref", False, "no RuntimeError")
+
+
+def test_schema_file_by_content() -> None:
+  """Extracted schemas are written once per distinct content."""
+  first = v._schema_file({"type": "object", "required": ["id"]})
+  again = v._schema_file({"type": "object", "required": ["id"]})
+  other = v._schema_file({"type": "string"})
+  _check("schema_file_reused", first == again)
+  _check("schema_file_distinct", first != other)
+  _check(
+    "schema_file_content",
+    json.loads(Path(first).read_text())
+    == {"type": "object", "required": ["id"]},
+  )
+  _check(
+    "schema_file_one_dir",
+    Path(first).parent == Path(other).parent == v._schema_dir,
+  )
+
+
 def main() -> int:
   """Run all contract tests and report. Exit 0 on pass, 1 on failure."""
   print("Running validate_examples contract tests...\n")
@@ -518,6 +872,13 @@ def main() -> int:
   test_string_ellipsis_in_array()
   test_annotation_parsing()
   test_extract_blocks()
+  test_validate_blocks_order()
+  test_validate_blocks_batched()
+  test_validate_blocks_engines()
+  test_schema_file_by_content()
+  test_result_cache()
+  test_affected_blocks()
+  test_changed_files()
   test_process_block_integration()
   return _report()
 
@@ -0,0 +1,299 @@
+"""Long-lived ucp-schema worker pool for schema resolution.
+
+Spawning `ucp-schema resolve` once per schema variant makes process
+startup the dominant cost of a docs build and of the example validator.
+This module keeps up to N `ucp-schema serve` processes alive for the
+lifetime of the calling process and sends them resolve requests over
+their stdin/stdout pipes, one JSON object per line:
+
+  -> {"id": 7, "method": "resolve",
+      "params": {"schema": "source/schemas/shopping/checkout.json",
+                 "direction": "request", "op": "create", "bundle": false}}
+  <- {"id": 7, "result": { ...resolved schema... }}
+  <- {"id": 7, "error": {"message": "..."}}
+
+CLIs without a `serve` subcommand exit immediately when asked to start
+one; the pool detects that on the first request and falls back to the
+one-shot `ucp-schema resolve ...` invocation for the rest of the run, so
+callers never need to know which mode is active.
+
+Environment:
+  UCP_SCHEMA_WORKERS=N   pool size (default: CPU count; 0 forces one-shot)
+"""
+
+import atexit
+import contextlib
+import itertools
+import json
+import os
+import subprocess
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+
+class SchemaResolveError(RuntimeError):
+  """ucp-schema could not resolve the requested schema variant."""
+
+
+def resolve_command(
+  command: Sequence[str],
+  schema_path: str | Path,
+  direction: str,
+  op: str,
+  bundle: bool,
+) -> list[str]:
+  """Build the one-shot `ucp-schema resolve` argv."""
+  dir_flag = "--request" if direction == "request" else "--response"
+  cmd = [*command, "resolve", str(schema_path), dir_flag, "--op", op]
+  if bundle:
+    cmd.append("--bundle")
+  return cmd
+
+
+def run_once(
+  command: Sequence[str],
+  schema_path: str | Path,
+  direction: str,
+  op: str,
+  bundle: bool,
+  cwd: str | Path | None = None,
+) -> dict:
+  """Resolve a schema with a fresh `ucp-schema resolve` process."""
+  return _parse(
+    _run_once_stdout(command, schema_path, direction, op, bundle, cwd)
+  )
+
+
+def _parse(stdout: str) -> dict:
+  try:
+    return json.loads(stdout)
+  except ValueError as e:
+    raise SchemaResolveError(f"unreadable ucp-schema output: {e}") from e
+
+
+def _run_once_stdout(
+  command: Sequence[str],
+  schema_path: str | Path,
+  direction: str,
+  op: str,
+  bundle: bool,
+  cwd: str | Path | None,
+) -> str:
+  try:
+    result = subprocess.run(
+      resolve_command(command, schema_path, direction, op, bundle),
+      capture_output=True,
+      text=True,
+      check=False,
+      cwd=cwd,
+    )
+  except OSError as e:
+    raise SchemaResolveError(f"cannot run {command[0]}: {e}") from e
+  if result.returncode != 0:
+    raise SchemaResolveError(result.stderr.strip() or str(result))
+  return result.stdout
+
+
+class _Worker:
+  """One `ucp-schema serve` process speaking newline-delimited JSON."""
+
+  def __init__(self, command: Sequence[str], cwd: str | Path | None) -> None:
+    try:
+      self.proc = subprocess.Popen(
+        [*command, "serve"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+      )
+    except OSError as e:
+      raise SchemaResolveError(f"cannot run {command[0]}: {e}") from e
+    self.answered = 0
+    self.last_size = 0
+
+  def request(self, msg: dict) -> dict | None:
+    """Send one request; None if the process went away.
+
+    Raises SchemaResolveError if the reply is not a JSON object.
+    """
+    try:
+      self.proc.stdin.write(json.dumps(msg) + "\n")
+      self.proc.stdin.flush()
+      line = self.proc.stdout.readline()
+    except (BrokenPipeError, OSError, ValueError):
+      return None
+    if not line:
+      return None
+    try:
+      reply = json.loads(line)
+    except ValueError as e:
+      raise SchemaResolveError(f"unreadable ucp-schema reply: {e}") from e
+    if not isinstance(reply, dict) or not (
+      "result" in reply or "error" in reply
+    ):
+      raise SchemaResolveError(f"unexpected ucp-schema reply: {line.strip()}")
+    self.answered += 1
+    self.last_size = len(line)
+    return reply
+
+  def kill(self) -> None:
+    with contextlib.suppress(OSError):
+      self.proc.kill()
+    self.proc.wait()
+
+  def close(self) -> None:
+    with contextlib.suppress(OSError, ValueError):
+      self.proc.stdin.close()
+    try:
+      self.proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+      self.proc.kill()
+      self.proc.wait()
+
+
+class SchemaWorkerPool:
+  """Thread-safe pool of persistent ucp-schema workers."""
+
+  def __init__(
+    self,
+    size: int | None = None,
+    command: Sequence[str] = ("ucp-schema",),
+    cwd: str | Path | None = None,
+  ) -> None:
+    """Initialize a pool of at most `size` workers (spawned lazily)."""
+    self.size = (os.cpu_count() or 1) if size is None else size
+    self.command = tuple(command)
+    self.cwd = cwd
+    # None until the first worker answers (True) or dies unanswered
+    # (False). A pool of size 0 is permanently in one-shot mode.
+    self.batch_supported: bool | None = None if self.size > 0 else False
+    self._workers: list[_Worker] = []
+    self._idle: list[_Worker] = []
+    self._cond = threading.Condition()
+    self._ids = itertools.count(1)
+    # Counters for build profiling: processes started (workers plus
+    # one-shot runs), requests answered, and JSON bytes read back.
+    self.spawned = 0
+    self.requests = 0
+    self.bytes_received = 0
+
+  def _acquire(self) -> _Worker | None:
+    """Check out an idle or new worker; None once in one-shot mode."""
+    with self._cond:
+      while True:
+        if self.batch_supported is False:
+          return None
+        if self._idle:
+          return self._idle.pop()
+        if len(self._workers) < self.size:
+          worker = _Worker(self.command, self.cwd)
+          self._workers.append(worker)
+          self.spawned += 1
+          return worker
+        self._cond.wait()
+
+  def _release(self, worker: _Worker) -> None:
+    with self._cond:
+      self._idle.append(worker)
+      self._cond.notify()
+
+  def _discard(self, worker: _Worker, kill: bool = False) -> None:
+    with self._cond:
+      if worker in self._workers:
+        self._workers.remove(worker)
+      self._cond.notify()
+    if kill:
+      worker.kill()
+    else:
+      worker.close()
+
+  def _count(self, spawned: int, received: int) -> None:
+    with self._cond:
+      self.spawned += spawned
+      self.requests += 1
+      self.bytes_received += received
+
+  def _run_once(
+    self, schema_path: str | Path, direction: str, op: str, bundle: bool
+  ) -> dict:
+    stdout = _run_once_stdout(
+      self.command, schema_path, direction, op, bundle, self.cwd
+    )
+    self._count(1, len(stdout))
+    return _parse(stdout)
+
+  def _fall_back_to_one_shot(self) -> None:
+    with self._cond:
+      self.batch_supported = False
+      self._cond.notify_all()
+    self.close()
+
+  def resolve(
+    self,
+    schema_path: str | Path,
+    direction: str = "response",
+    op: str = "read",
+    bundle: bool = False,
+  ) -> dict:
+    """Resolve one schema variant, reusing a live worker when possible."""
+    worker = self._acquire()
+    if worker is None:
+      return self._run_once(schema_path, direction, op, bundle)
+
+    try:
+      response = worker.request(
+        {
+          "id": next(self._ids),
+          "method": "resolve",
+          "params": {
+            "schema": str(schema_path),
+            "direction": direction,
+            "op": op,
+            "bundle": bundle,
+          },
+        }
+      )
+    except SchemaResolveError:
+      # The worker is out of step with its pipes; never reuse it.
+      self._discard(worker, kill=True)
+      raise
+    if response is None:
+      self._discard(worker)
+      if worker.answered == 0 and self.batch_supported is None:
+        # The CLI has no `serve` subcommand: switch the whole pool over.
+        self._fall_back_to_one_shot()
+      return self._run_once(schema_path, direction, op, bundle)
+
+    self.batch_supported = True
+    self._release(worker)
+    self._count(0, worker.last_size)
+    if "error" in response:
+      error = response["error"]
+      message = error.get("message") if isinstance(error, dict) else error
+      raise SchemaResolveError(str(message))
+    return response["result"]
+
+  def close(self) -> None:
+    """Terminate every worker."""
+    with self._cond:
+      workers, self._workers, self._idle = self._workers, [], []
+    for worker in workers:
+      worker.close()
+
+
+_default_pool: SchemaWorkerPool | None = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> SchemaWorkerPool:
+  """Return the process-wide pool, creating it on first use."""
+  global _default_pool
+  with _default_lock:
+    if _default_pool is None:
+      size = os.environ.get("UCP_SCHEMA_WORKERS")
+      _default_pool = SchemaWorkerPool(int(size) if size else None)
+      atexit.register(_default_pool.close)
+    return _default_pool
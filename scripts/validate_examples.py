@@ -82,7 +82,9 @@ Layer 3 — Semantic interpretation. Operates on the parsed tree:
     fills required gaps.
   - Coverage walk: for each object in the example, verify every
     schema-required field is either present or elision-acknowledged.
-  - The merged payload is validated by `ucp-schema validate`.
+  - The merged payload is validated by `ucp-schema validate`, or
+    in-process against the resolved schema (--engine, see
+    schema_validator.py).
   - Validation errors whose path is an elided path (or descendant)
     are suppressed.
 
@@ -104,18 +106,51 @@ CLI
   validate_examples.py --schema-base source/schemas/
   validate_examples.py --schema-base source/schemas/ --file FILE
   validate_examples.py --schema-base source/schemas/ --audit
+  validate_examples.py --schema-base source/schemas/ --jobs 8
+  validate_examples.py --schema-base source/schemas/ --engine both
+  validate_examples.py --schema-base source/schemas/ --changed-only
+                       [--base REF]
+
+Blocks are validated --jobs at a time (default: CPU count); results are
+reported in file:line order regardless. --engine picks the payload
+validator: cli (`ucp-schema validate`, default), python
+(schema_validator.py) or both, which fails any block the two disagree
+on.
+
+Blocks that validated OK are remembered on disk (ResultCache) and not
+validated again until their content, annotation, schema $ref closure,
+scaffold or the validator changes. --changed-only validates just the
+blocks affected by changes since the merge base with --base (default:
+origin/main): blocks on changed pages, and blocks whose schema closure
+or scaffold includes a changed file.
+
+Environment:
+  UCP_EXAMPLES_CACHE=0           do not read or write the result cache
+  UCP_EXAMPLES_CACHE_DIR=PATH    cache location (default:
+                                 .cache/ucp-examples in the repo root)
 
 Exit codes: 0 if all pass or skip; 1 if any block fails or errors.
 """
 
 import argparse
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
+import os
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 from pathlib import Path
 
+import schema_cache
+import schema_resolver
+import schema_validator
+import ucp_schema_pool
+
 # -----------------------------------------------------------
 # Constants
 # -----------------------------------------------------------
@@ -628,6 +663,9 @@ def check_coverage(example, schema: dict, path: str = "$") -> list[str]:
 # -----------------------------------------------------------
 
 _schema_cache: dict[tuple, dict] = {}
+# One lock per key, so concurrent blocks resolve each variant once.
+_schema_locks: dict[tuple, threading.Lock] = {}
+_schema_locks_guard = threading.Lock()
 
 
 def resolve_schema(
@@ -636,35 +674,39 @@ def resolve_schema(
   op: str,
   schema_base: Path,
 ) -> dict:
-  """Resolve a schema via ucp-schema, with caching."""
+  """Resolve a schema via ucp-schema, with caching.
+
+  Resolution goes through the shared worker pool (ucp_schema_pool), which
+  keeps `ucp-schema serve` processes alive across blocks and falls back to
+  one-shot `ucp-schema resolve` for CLIs without batch support.
+  UCP_SCHEMA_RESOLVER=python resolves in-process instead (schema_resolver).
+  Safe to call from several threads; each variant is resolved once.
+  """
   key = (schema_path, direction, op)
   if key in _schema_cache:
     return _schema_cache[key]
+  with _schema_locks_guard:
+    lock = _schema_locks.setdefault(key, threading.Lock())
 
-  full_path = schema_base / f"{schema_path}.json"
-  result = subprocess.run(
-    [
-      "ucp-schema",
-      "resolve",
-      str(full_path),
-      f"--{direction}",
-      "--op",
-      op,
-      "--bundle",
-      "--pretty",
-    ],
-    capture_output=True,
-    text=True,
-    cwd=str(schema_base.parent),
-  )
-  if result.returncode != 0:
-    raise RuntimeError(
-      f"ucp-schema resolve failed for"
-      f" {schema_path} ({direction}/{op}):"
-      f" {result.stderr.strip()}"
-    )
-  schema = json.loads(result.stdout)
-  _schema_cache[key] = schema
+  with lock:
+    if key in _schema_cache:
+      return _schema_cache[key]
+    full_path = schema_base / f"{schema_path}.json"
+    try:
+      if schema_resolver.backend() == "python":
+        schema = schema_resolver.resolve(full_path, direction, op, bundle=True)
+      else:
+        schema = ucp_schema_pool.default_pool().resolve(
+          full_path, direction, op, bundle=True
+        )
+    except (
+      schema_resolver.SchemaResolveError,
+      ucp_schema_pool.SchemaResolveError,
+    ) as e:
+      raise RuntimeError(
+        f"ucp-schema resolve failed for {schema_path} ({direction}/{op}): {e}"
+      ) from e
+    _schema_cache[key] = schema
   return schema
 
 
@@ -673,53 +715,223 @@ def resolve_schema(
 # -----------------------------------------------------------
 
 
-def validate_payload(
-  payload: dict,
-  schema_path: str,
+# The validator binary. Tests point this at fake_ucp_schema.py.
+UCP_SCHEMA_COMMAND: tuple[str, ...] = ("ucp-schema",)
+
+# Instances per `ucp-schema validate` call. Payloads go to the CLI on
+# stdin (`-`), one JSON document per line; CLIs that accept several print
+# a list with one {"valid", "errors"} object per instance. None until the
+# first multi-instance call shows whether this one does.
+_BATCH_SIZE = 64
+_batch_supported: bool | None = None
+
+# Whether the CLI reads instances from stdin. None until a call shows it:
+# the first call runs both ways, on stdin and from temporary files, and
+# stdin is used only if it gives the same result for every instance. A
+# CLI that takes `-` for a file name may print nothing, or report the
+# read error as --json output; either way files are used from then on.
+_stdin_supported: bool | None = None
+
+# --jobs threads validate concurrently; each guard lets one thread probe
+# its capability while the others wait for the answer.
+_batch_guard = threading.Lock()
+_stdin_guard = threading.Lock()
+
+# Extracted def= schemas, written once per run under their content hash.
+_schema_dir: Path | None = None
+_schema_files: dict[str, str] = {}
+_schema_files_guard = threading.Lock()
+
+
+def _schema_file(schema: dict) -> str:
+  """Return the path of a file holding `schema`, written on first use."""
+  global _schema_dir
+  text = json.dumps(schema)
+  digest = hashlib.sha256(text.encode()).hexdigest()
+  with _schema_files_guard:
+    if digest not in _schema_files:
+      if _schema_dir is None:
+        _schema_dir = Path(tempfile.mkdtemp(prefix="ucp-examples-"))
+        atexit.register(shutil.rmtree, _schema_dir, ignore_errors=True)
+      path = _schema_dir / f"{digest}.json"
+      path.write_text(text, encoding="utf-8")
+      _schema_files[digest] = str(path)
+    return _schema_files[digest]
+
+
+def _parse_validate_output(result: subprocess.CompletedProcess):
+  """Return the parsed --json output, or None if there is none."""
+  if not result.stdout.strip():
+    return None
+  return json.loads(result.stdout)
+
+
+def _results(
+  result: subprocess.CompletedProcess, count: int
+) -> list[dict] | None:
+  """Return one --json result per instance, or None if there is not."""
+  try:
+    output = _parse_validate_output(result)
+  except json.JSONDecodeError:
+    return None
+  if count == 1 and isinstance(output, dict):
+    output = [output]
+  if (
+    isinstance(output, list)
+    and len(output) == count
+    and all(isinstance(item, dict) and "valid" in item for item in output)
+  ):
+    return output
+  return None
+
+
+def _run_validate(
+  payloads: list[dict],
+  schema_file: str,
   direction: str,
   op: str,
   schema_base: Path,
-) -> tuple[bool, list[dict]]:
-  """Validate a payload via ucp-schema validate."""
-  full_schema = schema_base / f"{schema_path}.json"
-  with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-    json.dump(payload, f)
-    tmp_path = f.name
+) -> subprocess.CompletedProcess:
+  """Run one `ucp-schema validate` over `payloads`, on stdin if supported."""
+  global _stdin_supported
 
-  try:
-    result = subprocess.run(
+  def run(instances: list[str], stdin: str | None):
+    return subprocess.run(
       [
-        "ucp-schema",
+        *UCP_SCHEMA_COMMAND,
         "validate",
-        tmp_path,
+        *instances,
         "--schema",
-        str(full_schema),
+        schema_file,
         f"--{direction}",
         "--op",
         op,
         "--json",
       ],
+      input=stdin,
       capture_output=True,
       text=True,
       cwd=str(schema_base.parent),
     )
-    if result.stdout.strip():
-      output = json.loads(result.stdout)
-      return (
-        output.get("valid", False),
-        output.get("errors", []),
-      )
-    # No JSON output — non-zero exit is an error
-    if result.returncode != 0:
-      return False, [
-        {
-          "path": "",
-          "message": result.stderr.strip(),
-        }
-      ]
-    return True, []
-  finally:
-    Path(tmp_path).unlink()
+
+  def from_stdin() -> subprocess.CompletedProcess:
+    return run(
+      ["-"], "".join(json.dumps(payload) + "\n" for payload in payloads)
+    )
+
+  def from_files() -> subprocess.CompletedProcess:
+    with tempfile.TemporaryDirectory(prefix="ucp-examples-") as tmp:
+      instances = []
+      for i, payload in enumerate(payloads):
+        path = Path(tmp) / f"{i}.json"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        instances.append(str(path))
+      return run(instances, None)
+
+  if _stdin_supported is None:
+    with _stdin_guard:
+      if _stdin_supported is None:
+        piped, result = from_stdin(), from_files()
+        expected = _results(result, len(payloads))
+        if expected is not None:
+          _stdin_supported = _results(piped, len(payloads)) == expected
+        return result
+  return from_stdin() if _stdin_supported else from_files()
+
+
+def _validate_one(
+  payload: dict,
+  schema_file: str,
+  direction: str,
+  op: str,
+  schema_base: Path,
+) -> tuple[bool, list[dict]]:
+  result = _run_validate([payload], schema_file, direction, op, schema_base)
+  output = _parse_validate_output(result)
+  if output is not None:
+    return output.get("valid", False), output.get("errors", [])
+  # No JSON output — non-zero exit is an error
+  if result.returncode != 0:
+    return False, [{"path": "", "message": result.stderr.strip()}]
+  return True, []
+
+
+def _validate_with_schema_file(
+  payloads: list[dict],
+  schema_file: str,
+  direction: str,
+  op: str,
+  schema_base: Path,
+) -> list[tuple[bool, list[dict]]]:
+  """Validate payloads against one schema file, batching when possible.
+
+  A CLI that does not answer the first multi-instance call with one
+  result per instance is asked one instance at a time for the rest of the
+  run.
+  """
+  global _batch_supported
+
+  def batch() -> list[dict] | None:
+    result = _run_validate(payloads, schema_file, direction, op, schema_base)
+    return _results(result, len(payloads))
+
+  output = None
+  if len(payloads) > 1 and _batch_supported is None:
+    with _batch_guard:
+      if _batch_supported is None:
+        output = batch()
+        _batch_supported = output is not None
+  if output is None and len(payloads) > 1 and _batch_supported:
+    output = batch()
+  if output is not None:
+    return [
+      (item.get("valid", False), item.get("errors", [])) for item in output
+    ]
+  return [
+    _validate_one(payload, schema_file, direction, op, schema_base)
+    for payload in payloads
+  ]
+
+
+def validate_payloads(
+  payloads: list[dict],
+  schema_path: str,
+  direction: str,
+  op: str,
+  schema_base: Path,
+) -> list[tuple[bool, list[dict]]]:
+  """Validate payloads via ucp-schema validate; one result per payload."""
+  full_schema = schema_base / f"{schema_path}.json"
+  return _validate_with_schema_file(
+    payloads, str(full_schema), direction, op, schema_base
+  )
+
+
+def validate_payloads_with_schema(
+  payloads: list[dict],
+  schema_dict: dict,
+  direction: str,
+  op: str,
+  schema_base: Path,
+) -> list[tuple[bool, list[dict]]]:
+  """Validate payloads against an extracted schema dict."""
+  return _validate_with_schema_file(
+    payloads, _schema_file(schema_dict), direction, op, schema_base
+  )
+
+
+def validate_payload(
+  payload: dict,
+  schema_path: str,
+  direction: str,
+  op: str,
+  schema_base: Path,
+) -> tuple[bool, list[dict]]:
+  """Validate a payload via ucp-schema validate."""
+  (result,) = validate_payloads(
+    [payload], schema_path, direction, op, schema_base
+  )
+  return result
 
 
 def validate_payload_with_schema(
@@ -730,49 +942,10 @@ def validate_payload_with_schema(
   schema_base: Path,
 ) -> tuple[bool, list[dict]]:
   """Validate against an extracted schema dict."""
-  tmp_schema = None
-  tmp_payload = None
-  try:
-    with tempfile.NamedTemporaryFile(
-      mode="w", suffix=".json", delete=False
-    ) as f:
-      json.dump(schema_dict, f)
-      tmp_schema = f.name
-    with tempfile.NamedTemporaryFile(
-      mode="w", suffix=".json", delete=False
-    ) as f:
-      json.dump(payload, f)
-      tmp_payload = f.name
-    result = subprocess.run(
-      [
-        "ucp-schema",
-        "validate",
-        tmp_payload,
-        "--schema",
-        tmp_schema,
-        f"--{direction}",
-        "--op",
-        op,
-        "--json",
-      ],
-      capture_output=True,
-      text=True,
-      cwd=str(schema_base.parent),
-    )
-    if result.stdout.strip():
-      output = json.loads(result.stdout)
-      return (
-        output.get("valid", False),
-        output.get("errors", []),
-      )
-    if result.returncode != 0:
-      return False, [{"path": "", "message": result.stderr.strip()}]
-    return True, []
-  finally:
-    if tmp_schema:
-      Path(tmp_schema).unlink()
-    if tmp_payload:
-      Path(tmp_payload).unlink()
+  (result,) = validate_payloads_with_schema(
+    [payload], schema_dict, direction, op, schema_base
+  )
+  return result
 
 
 # -----------------------------------------------------------
@@ -787,22 +960,40 @@ def load_scaffold(
   scaffolds_dir: Path,
 ) -> dict | None:
   """Load scaffold fixture for a schema+direction+op."""
-  # Try specific: checkout_request_create.json
-  name = schema_path.replace("/", "_")
-  specific = scaffolds_dir / f"{name}_{direction}_{op}.json"
-  if specific.exists():
-    return json.loads(specific.read_text())
+  path = scaffold_path(schema_path, direction, op, scaffolds_dir)
+  if path is None:
+    return None
+  return json.loads(path.read_text())
+
 
-  # Try direction-only: checkout_response.json
-  dir_only = scaffolds_dir / f"{name}_{direction}.json"
-  if dir_only.exists():
-    return json.loads(dir_only.read_text())
+def _scaffold_candidates(
+  schema_path: str,
+  direction: str,
+  op: str,
+  scaffolds_dir: Path,
+) -> list[Path]:
+  """Scaffold files for a schema+direction+op, most specific first."""
+  name = schema_path.replace("/", "_")
+  return [
+    # Specific: checkout_request_create.json
+    scaffolds_dir / f"{name}_{direction}_{op}.json",
+    # Direction-only: checkout_response.json
+    scaffolds_dir / f"{name}_{direction}.json",
+    # Generic: checkout.json
+    scaffolds_dir / f"{name}.json",
+  ]
 
-  # Try generic: checkout.json
-  generic = scaffolds_dir / f"{name}.json"
-  if generic.exists():
-    return json.loads(generic.read_text())
 
+def scaffold_path(
+  schema_path: str,
+  direction: str,
+  op: str,
+  scaffolds_dir: Path,
+) -> Path | None:
+  """Return the scaffold file load_scaffold reads, or None."""
+  for path in _scaffold_candidates(schema_path, direction, op, scaffolds_dir):
+    if path.exists():
+      return path
   return None
 
 
@@ -872,10 +1063,145 @@ def parse_example(raw: str):
   return json.loads(canonical)
 
 
+class _Validation:
+  """A block that is ready for `ucp-schema validate`.
+
+  Blocks with the same key validate against the same schema, so
+  validate_blocks sends their payloads to the CLI together; finish()
+  turns the block's share of the outcome into its Result.
+  """
+
+  def __init__(
+    self,
+    block: dict,
+    payload: dict,
+    resolved: dict,
+    validation_schema: dict,
+    coverage_errors: list[str],
+    ellipsis_paths: set[str],
+  ) -> None:
+    """Initialize a pending validation of `payload` for `block`.
+
+    `validation_schema` is `resolved` itself or one of its $defs; refs
+    in it resolve against `resolved`.
+    """
+    self.file, self.line = block["file"], block["line"]
+    self.annotation = block["annotation"]
+    self.payload = payload
+    self.resolved = resolved
+    self.validation_schema = validation_schema
+    self.coverage_errors = coverage_errors
+    self.ellipsis_paths = ellipsis_paths
+
+  @property
+  def key(self) -> tuple:
+    """What the payload is validated against."""
+    a = self.annotation
+    return (a["schema"], a.get("def"), a["direction"], a["op"])
+
+  def finish(self, valid: bool, val_errors: list[dict]) -> Result:
+    """Combine coverage and validation errors into the block's Result."""
+    # Collect all failures
+    messages: list[str] = []
+    for ce in self.coverage_errors:
+      messages.append(f"coverage: {ce}")
+    for ve in val_errors:
+      # Suppress errors at ellipsis-acknowledged paths
+      err_path = ve.get("path", "")
+      if any(
+        err_path == ep or err_path.startswith(ep + "/")
+        for ep in self.ellipsis_paths
+      ):
+        continue
+      messages.append(f"validation: {err_path} \u2014 {ve.get('message', '')}")
+
+    if messages:
+      return Result(
+        self.file,
+        self.line,
+        "fail",
+        "\n       ".join(messages),
+        self.annotation,
+      )
+
+    return Result(self.file, self.line, "ok", annotation=self.annotation)
+
+
+# In-process validators, compiled once per _Validation.key.
+_compiled: dict[tuple, object] = {}
+_compiled_guard = threading.Lock()
+
+
+def _validate_in_process(
+  group: list[_Validation],
+) -> list[tuple[bool, list[dict]]]:
+  """Validate blocks sharing one key with schema_validator."""
+  first = group[0]
+  with _compiled_guard:
+    if first.key not in _compiled:
+      try:
+        _compiled[first.key] = schema_validator.compile_schema(
+          first.validation_schema, first.resolved
+        )
+      except schema_validator.SchemaError as e:
+        _compiled[first.key] = e
+  validate = _compiled[first.key]
+  if isinstance(validate, schema_validator.SchemaError):
+    return [(False, [{"path": "", "message": str(validate)}])] * len(group)
+  outcomes = []
+  for v in group:
+    errors = validate(v.payload)
+    outcomes.append((not errors, errors))
+  return outcomes
+
+
+def _validate_group(
+  group: list[_Validation], schema_base: Path, engine: str = "cli"
+) -> list[tuple[bool, list[dict]]]:
+  """Validate blocks sharing one key; one (valid, errors) per block."""
+  if engine == "python":
+    return _validate_in_process(group)
+  payloads = [v.payload for v in group]
+  first = group[0]
+  schema_path, schema_def, direction, op = first.key
+  # 9. Validate — use extracted $def schema if specified
+  if schema_def:
+    return validate_payloads_with_schema(
+      payloads, first.validation_schema, direction, op, schema_base
+    )
+  return validate_payloads(payloads, schema_path, direction, op, schema_base)
+
+
+def _finish_group(
+  group: list[_Validation], schema_base: Path, engine: str
+) -> list[Result]:
+  """Validate blocks sharing one key with `engine`; one Result per block."""
+  if engine != "both":
+    outcomes = _validate_group(group, schema_base, engine)
+    return [v.finish(*o) for v, o in zip(group, outcomes, strict=True)]
+  cli = _finish_group(group, schema_base, "cli")
+  python = _finish_group(group, schema_base, "python")
+  return [_compare_engines(*pair) for pair in zip(cli, python, strict=True)]
+
+
+def _compare_engines(cli: Result, python: Result) -> Result:
+  """Return the CLI's result, or a failure if the engines disagree."""
+  if cli.status == python.status:
+    return cli
+  messages = [f"engines disagree: cli {cli.status}, python {python.status}"]
+  for engine, r in (("cli", cli), ("python", python)):
+    if r.message:
+      messages.append(f"{engine}: {r.message}")
+  return Result(
+    cli.file, cli.line, "fail", "\n       ".join(messages), cli.annotation
+  )
+
+
 def process_block(
   block: dict,
   schema_base: Path,
   scaffolds_dir: Path,
+  engine: str = "cli",
 ) -> Result:
   """Run the validation pipeline on one block.
 
@@ -884,6 +1210,23 @@ def process_block(
     Layer 2→3: parse_example (JSON → tree + elided paths)
     Layer 3:    coverage + scaffold merge + schema validate
   """
+  prepared = _prepare_block(block, schema_base, scaffolds_dir)
+  if isinstance(prepared, Result):
+    return prepared
+  (result,) = _finish_group([prepared], schema_base, engine)
+  return result
+
+
+def _prepare_block(
+  block: dict,
+  schema_base: Path,
+  scaffolds_dir: Path,
+) -> "Result | _Validation":
+  """Run everything up to schema validation on one block.
+
+  Returns the block's Result if it is decided already (skip, error,
+  parse failure, empty body), otherwise its pending _Validation.
+  """
   file, line = block["file"], block["line"]
   annotation = block["annotation"]
 
@@ -1028,43 +1371,295 @@ def process_block(
   else:
     merged = deep_merge(scaffold, stripped)
 
-  # 9. Validate — use extracted $def schema if specified
-  if schema_def:
-    valid, val_errors = validate_payload_with_schema(
-      merged, validation_schema, direction, op, schema_base
-    )
-  else:
-    valid, val_errors = validate_payload(
-      merged,
-      schema_path,
-      direction,
-      op,
+  return _Validation(
+    block, merged, resolved, validation_schema, coverage_errors, ellipsis_paths
+  )
+
+
+def validate_blocks(
+  blocks: list[dict],
+  schema_base: Path,
+  scaffolds_dir: Path,
+  jobs: int = 1,
+  engine: str = "cli",
+  cache: "ResultCache | None" = None,
+) -> list[Result]:
+  """Run process_block over `blocks`, `jobs` at a time.
+
+  Blocks that validate against the same (schema, def, direction, op) go
+  to `ucp-schema validate` together, up to _BATCH_SIZE per call, and each
+  gets its own errors back. Blocks spend their time waiting on ucp-schema
+  processes, so threads are enough to overlap them. Results come back in
+  block order.
+
+  With a `cache`, blocks it remembers as OK are reported OK without
+  being validated, and blocks that newly pass are remembered.
+  """
+  if cache is None:
+    return _validate_blocks(blocks, schema_base, scaffolds_dir, jobs, engine)
+  keys = [cache.key(block) for block in blocks]
+  hits = [key is not None and cache.hit(key) for key in keys]
+  fresh = iter(
+    _validate_blocks(
+      [block for block, hit in zip(blocks, hits, strict=True) if not hit],
       schema_base,
+      scaffolds_dir,
+      jobs,
+      engine,
     )
+  )
+  results = []
+  for block, key, hit in zip(blocks, keys, hits, strict=True):
+    if hit:
+      result = Result(
+        block["file"], block["line"], "ok", "", block["annotation"]
+      )
+    else:
+      result = next(fresh)
+      if key is not None and result.status == "ok":
+        cache.record(key)
+    results.append(result)
+  return results
 
-  # Collect all failures
-  messages: list[str] = []
-  for ce in coverage_errors:
-    messages.append(f"coverage: {ce}")
-  for ve in val_errors:
-    # Suppress errors at ellipsis-acknowledged paths
-    err_path = ve.get("path", "")
-    if any(
-      err_path == ep or err_path.startswith(ep + "/") for ep in ellipsis_paths
-    ):
-      continue
-    messages.append(f"validation: {err_path} \u2014 {ve.get('message', '')}")
 
-  if messages:
-    return Result(
-      file,
-      line,
-      "fail",
-      "\n       ".join(messages),
-      annotation,
+def _validate_blocks(
+  blocks: list[dict],
+  schema_base: Path,
+  scaffolds_dir: Path,
+  jobs: int,
+  engine: str,
+) -> list[Result]:
+  pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+  run = pool.map if pool else map
+  try:
+    prepared = list(
+      run(lambda b: _prepare_block(b, schema_base, scaffolds_dir), blocks)
     )
+    groups: dict[tuple, list[_Validation]] = {}
+    for item in prepared:
+      if isinstance(item, _Validation):
+        groups.setdefault(item.key, []).append(item)
+    batches = [
+      group[i : i + _BATCH_SIZE]
+      for group in groups.values()
+      for i in range(0, len(group), _BATCH_SIZE)
+    ]
+    finished = run(
+      lambda batch: _finish_group(batch, schema_base, engine), batches
+    )
+    results = {}
+    for batch, batch_results in zip(batches, finished, strict=True):
+      for item, result in zip(batch, batch_results, strict=True):
+        results[id(item)] = result
+  finally:
+    if pool:
+      pool.shutdown()
+  return [results.get(id(item), item) for item in prepared]
 
-  return Result(file, line, "ok", annotation=annotation)
+
+# -----------------------------------------------------------
+# Result cache and --changed-only
+# -----------------------------------------------------------
+
+DEFAULT_RESULT_CACHE_DIR = (
+  Path(__file__).resolve().parent.parent / ".cache" / "ucp-examples"
+)
+DEFAULT_RESULT_CACHE_MAX_MB = 8
+
+# Bump when the key derivation or entry layout changes.
+_RESULT_KEY_SCHEMA = "validate-examples-cache/v1"
+
+
+def _validator_files() -> list[Path]:
+  """List the code that decides a block's outcome."""
+  modules = (schema_cache, schema_resolver, schema_validator, ucp_schema_pool)
+  return [Path(__file__).resolve()] + [
+    Path(module.__file__).resolve() for module in modules
+  ]
+
+
+def _file_digest(path: Path) -> str:
+  try:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+  except OSError:
+    return "<missing>"
+
+
+def _cli_version() -> str:
+  """Return `ucp-schema --version` for UCP_SCHEMA_COMMAND, if it runs."""
+  try:
+    result = subprocess.run(
+      [*UCP_SCHEMA_COMMAND, "--version"],
+      capture_output=True,
+      text=True,
+      check=False,
+    )
+  except OSError:
+    return "<unavailable>"
+  return result.stdout.strip() if result.returncode == 0 else "<unavailable>"
+
+
+def _validates(block: dict) -> bool:
+  """Whether a block's outcome depends on a schema (and scaffold)."""
+  annotation = block["annotation"]
+  return bool(
+    annotation
+    and annotation.get("schema")
+    and not annotation.get("skip")
+    and not annotation.get("_error")
+    and not block.get("error")
+  )
+
+
+class ResultCache:
+  """Blocks that validated OK, remembered on disk by what they depend on.
+
+  A block's key covers its canonical content and annotation, the
+  contents of its schema's relative-$ref closure and of its scaffold,
+  and the validator: these scripts, the engine, the resolver backend and
+  the ucp-schema version when the CLI is involved. Only OK results are
+  stored; failures always run again, so their messages stay current.
+  Entries live in a schema_cache.SchemaCache store (size-capped LRU).
+  """
+
+  def __init__(
+    self,
+    store: schema_cache.SchemaCache,
+    schema_base: Path,
+    scaffolds_dir: Path,
+    engine: str,
+  ) -> None:
+    """Initialize a cache of OK results for blocks checked by `engine`."""
+    self.store = store
+    self.schema_base = schema_base
+    self.scaffolds_dir = scaffolds_dir
+    self.hits = 0
+    self._schemas: dict[str, str] = {}
+    parts = [_RESULT_KEY_SCHEMA, engine, schema_resolver.backend()]
+    parts += [_file_digest(path) for path in _validator_files()]
+    if engine != "python" or schema_resolver.backend() == "cli":
+      parts.append(_cli_version())
+    self._validator = "\0".join(parts)
+
+  def _schema_digest(self, schema_path: str) -> str:
+    """Hash a schema's $ref closure, by path relative to schema_base."""
+    if schema_path not in self._schemas:
+      digest = hashlib.sha256()
+      schema_file = self.schema_base / f"{schema_path}.json"
+      for path in schema_cache.ref_closure(schema_file):
+        rel = os.path.relpath(path, self.schema_base.resolve())
+        digest.update(f"\0{rel}\0{_file_digest(path)}".encode())
+      self._schemas[schema_path] = digest.hexdigest()
+    return self._schemas[schema_path]
+
+  def key(self, block: dict) -> str | None:
+    """Return the cache key for `block`; None if it is not validated."""
+    if not _validates(block):
+      return None
+    annotation = block["annotation"]
+    scaffold = scaffold_path(
+      annotation["schema"],
+      annotation["direction"],
+      annotation["op"],
+      self.scaffolds_dir,
+    )
+    digest = hashlib.sha256(self._validator.encode())
+    for part in (
+      json.dumps(annotation, sort_keys=True),
+      reduce_to_canonical_json(block["content"]),
+      self._schema_digest(annotation["schema"]),
+      _file_digest(scaffold) if scaffold else "<none>",
+    ):
+      digest.update(b"\0" + part.encode())
+    return digest.hexdigest()
+
+  def hit(self, key: str) -> bool:
+    """Whether a block with `key` validated OK before."""
+    if self.store.get(key) is None:
+      return False
+    self.hits += 1
+    return True
+
+  def record(self, key: str) -> None:
+    """Remember that a block with `key` validated OK."""
+    self.store.put(key, {"status": "ok"})
+
+
+def result_cache_from_env(
+  schema_base: Path, scaffolds_dir: Path, engine: str
+) -> ResultCache | None:
+  """Build the result cache configured by UCP_EXAMPLES_CACHE_* env vars."""
+  if os.environ.get("UCP_EXAMPLES_CACHE", "1") == "0":
+    return None
+  root = os.environ.get("UCP_EXAMPLES_CACHE_DIR") or DEFAULT_RESULT_CACHE_DIR
+  store = schema_cache.SchemaCache(
+    root, DEFAULT_RESULT_CACHE_MAX_MB * 1024 * 1024
+  )
+  return ResultCache(store, schema_base, scaffolds_dir, engine)
+
+
+def changed_files(base: str, repo_root: Path) -> set[Path]:
+  """Return the files changed since `base`'s merge base with HEAD.
+
+  Covers committed, staged, unstaged and untracked changes. Raises
+  RuntimeError when git cannot answer (not a checkout, unknown ref).
+  """
+
+  def git(*args: str) -> str:
+    try:
+      result = subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=repo_root,
+      )
+    except (OSError, subprocess.CalledProcessError) as e:
+      stderr = getattr(e, "stderr", "") or str(e)
+      raise RuntimeError(f"git {' '.join(args)}: {stderr.strip()}") from e
+    return result.stdout
+
+  merge_base = git("merge-base", base, "HEAD").strip()
+  names = git("diff", "--name-only", merge_base, "--").splitlines()
+  names += git("ls-files", "--others", "--exclude-standard").splitlines()
+  return {(repo_root / name).resolve() for name in names if name}
+
+
+def affected_blocks(
+  blocks: list[dict],
+  changed: set[Path],
+  schema_base: Path,
+  scaffolds_dir: Path,
+) -> list[dict]:
+  """Return the blocks whose outcome a change to `changed` may alter.
+
+  That is every block on a changed page, every block whose schema's
+  relative-$ref closure or scaffold candidates include a changed file,
+  and every block at all if the validator itself changed.
+  """
+  if changed.intersection(_validator_files()):
+    return list(blocks)
+  closures: dict[str, set[Path]] = {}
+  affected = []
+  for block in blocks:
+    depends = {Path(block["file"]).resolve()}
+    if _validates(block):
+      annotation = block["annotation"]
+      schema_path = annotation["schema"]
+      if schema_path not in closures:
+        closures[schema_path] = set(
+          schema_cache.ref_closure(schema_base / f"{schema_path}.json")
+        )
+      depends |= closures[schema_path]
+      depends.update(
+        path.resolve()
+        for path in _scaffold_candidates(
+          schema_path, annotation["direction"], annotation["op"], scaffolds_dir
+        )
+      )
+    if depends & changed:
+      affected.append(block)
+  return affected
 
 
 # -----------------------------------------------------------
@@ -1072,6 +1667,14 @@ def process_block(
 # -----------------------------------------------------------
 
 
+def _positive_int(value: str) -> int:
+  """Argparse type for --jobs."""
+  number = int(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+  return number
+
+
 def main() -> int:
   """Run example validation across spec docs."""
   parser = argparse.ArgumentParser(
@@ -1108,6 +1711,28 @@ def main() -> int:
     action="store_true",
     help="Just list blocks without validating",
   )
+  parser.add_argument(
+    "--jobs",
+    type=_positive_int,
+    default=os.cpu_count() or 1,
+    help="Blocks to validate concurrently (default: CPU count)",
+  )
+  parser.add_argument(
+    "--engine",
+    choices=schema_validator.ENGINES,
+    default="cli",
+    help="Payload validator: ucp-schema, in-process, or both (default: cli)",
+  )
+  parser.add_argument(
+    "--changed-only",
+    action="store_true",
+    help="Only validate blocks affected by changes since --base",
+  )
+  parser.add_argument(
+    "--base",
+    default="origin/main",
+    help="Git ref --changed-only diffs against (default: origin/main)",
+  )
   args = parser.parse_args()
 
   # Resolve paths relative to script location
@@ -1147,11 +1772,26 @@ def main() -> int:
           print(f"  {b['file']}:{b['line']}")
     return 1 if unannotated else 0
 
+  if args.changed_only:
+    try:
+      changed = changed_files(args.base, repo_root)
+    except RuntimeError as e:
+      print(f"--changed-only: {e}; validating every block", file=sys.stderr)
+    else:
+      total = len(all_blocks)
+      all_blocks = affected_blocks(
+        all_blocks, changed, schema_base, scaffolds_dir
+      )
+      print(
+        f"{len(all_blocks)} of {total} blocks affected by changes since "
+        f"{args.base}\n"
+      )
+
   # Validate
-  results: list[Result] = []
-  for block in all_blocks:
-    result = process_block(block, schema_base, scaffolds_dir)
-    results.append(result)
+  cache = result_cache_from_env(schema_base, scaffolds_dir, args.engine)
+  results = validate_blocks(
+    all_blocks, schema_base, scaffolds_dir, args.jobs, args.engine, cache
+  )
 
   # Report
   passed = sum(1 for r in results if r.status == "ok")
@@ -1170,6 +1810,8 @@ def main() -> int:
   print(
     f"\n{passed} passed, {failed} failed, {errors} errors, {skipped} skipped"
   )
+  if cache and cache.hits:
+    print(f"({cache.hits} OK results reused from {cache.store.root})")
 
   return 0 if (failed == 0 and errors == 0) else 1
 